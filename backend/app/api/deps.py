@@ -1,35 +1,39 @@
 """
 Dependency injection functions
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
 
 from app.db.database import get_db
 from app.db.models import User
-from app.core.config import settings
+from app.core.tokens import JWTError, request_claims
+from app.services.principal_cache import Principal, principal_cache
+from app.services.s3_service import S3Service, s3_service
+from app.services.session_service import session_denylist
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Get current authenticated user from JWT token
+    
+    Returns a cached, detached Principal (id, email, KHC identity, role,
+    is_active) rather than a session-bound User.
     """
     token = credentials.credentials
     
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = request_claims(request, token)
         user_id: str = payload.get("sub")
+        session_id: str = payload.get("sid")
         
-        if user_id is None:
+        if user_id is None or session_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials"
@@ -40,7 +44,14 @@ def get_current_user(
             detail="Could not validate credentials"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # In-memory revocation check; no database lookup
+    if session_denylist.is_revoked(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked"
+        )
+    
+    user = principal_cache.get(db, user_id)
     
     if user is None:
         raise HTTPException(
@@ -54,4 +65,54 @@ def get_current_user(
             detail="Inactive user"
         )
     
-    return user
\ No newline at end of file
+    return user
+
+
+def get_current_user_record(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Full User row for endpoints that need the whole profile
+    """
+    user = db.query(User).filter(User.id == current_user.id).first()
+    
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    return user
+
+
+def verify_sync_token(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """
+    Verify sync token (used during case/document sync).
+    """
+    try:
+        payload = request_claims(request, credentials.credentials)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid sync token"
+        )
+    
+    if session_denylist.is_revoked(payload.get("sid")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked"
+        )
+    
+    return payload
+
+
+def get_s3_service() -> S3Service:
+    """
+    The per-process S3Service (shared client). Override in tests with
+    app.dependency_overrides[get_s3_service].
+    """
+    return s3_service
\ No newline at end of file
@@ -13,6 +13,7 @@ from app.api.v1.endpoints import (
     sync,
     analysis,
     ocr,
+    audit,
 )
 
 # Import new endpoints (create these if they don't exist)
@@ -33,6 +34,7 @@ api_router.include_router(documents.router, prefix="/documents", tags=["Document
 api_router.include_router(upload.router, prefix="/upload", tags=["Upload"])
 api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
 api_router.include_router(analysis.router, prefix="/analysis", tags=["AI Analysis"])
+api_router.include_router(audit.router, prefix="/audit", tags=["Audit"])
 
 # Include new endpoints if available
 if HAS_NEW_ENDPOINTS:
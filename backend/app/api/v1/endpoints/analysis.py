@@ -1,8 +1,9 @@
 """
 AI Analysis endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
 from sqlalchemy.orm import Session
+from typing import Optional
 from uuid import UUID
 
 from app.db.database import get_db
@@ -10,6 +11,9 @@ from app.db.models import AIAnalysis, Case, User
 from app.db.schemas import AIAnalysisResponse
 from app.api.deps import get_current_user
 from app.services.ai_service import ai_service
+from app.services import case_service
+from app.utils.http_cache import make_etag, etag_matches, not_modified, set_etag
+from app.services.quota_service import quota_service, AI_ANALYSES
 
 router = APIRouter()
 
@@ -17,12 +21,22 @@ router = APIRouter()
 @router.get("/{case_id}", response_model=AIAnalysisResponse)
 def get_analysis(
     case_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get AI analysis for a case
     """
+    # Conditional GET before anything is hydrated
+    if if_none_match:
+        validator = case_service.analysis_validator(db, case_id, current_user.id)
+        if validator is not None:
+            etag = make_etag(*validator)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
     # Verify case ownership
     case = db.query(Case).filter(Case.id == case_id).first()
     
@@ -49,6 +63,7 @@ def get_analysis(
             detail="Analysis not found. Trigger analysis first."
         )
     
+    set_etag(response, make_etag(analysis.id, analysis.updated_at))
     return analysis
 
 
@@ -76,6 +91,10 @@ def trigger_analysis(
             detail="Not authorized"
         )
     
+    # Counted up front so concurrent triggers cannot overrun the plan;
+    # refunded below unless the analysis completes
+    quota_service.consume(db, current_user.id, {AI_ANALYSES: 1})
+    
     # Trigger analysis (synchronous for now, can be made async with Celery)
     try:
         analysis = ai_service.analyze_case(
@@ -84,6 +103,9 @@ def trigger_analysis(
             db
         )
         
+        if not (analysis and analysis.status == "completed"):
+            quota_service.release(current_user.id, {AI_ANALYSES: 1})
+        
         if analysis and analysis.status == "completed":
             return {
                 "message": "Analysis completed",
@@ -97,6 +119,7 @@ def trigger_analysis(
             }
             
     except Exception as e:
+        quota_service.release(current_user.id, {AI_ANALYSES: 1})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analysis failed: {str(e)}"
@@ -0,0 +1,156 @@
+"""
+Audit trail read API (DPDPA compliance reviews)
+
+Advocates can read their own trail; admins can read anyone's.
+"""
+import csv
+import io
+import itertools
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_user
+from app.core.logger import logger
+from app.db import models, schemas
+from app.services.audit_service import audit_service
+from app.services.principal_cache import Principal
+from app.utils.pagination import cursor_page, decode_key_cursor, encode_key_cursor
+
+router = APIRouter()
+
+CSV_COLUMNS = ["user_id", "timestamp", "occurred_at", "action_type", "severity", "resource_type", "resource_id", "metadata"]
+
+
+def _trail_owner(user_id: Optional[str], current_user: Principal) -> str:
+    """The user whose trail is read; only admins may read someone else's"""
+    if user_id is None or user_id == str(current_user.id):
+        return str(current_user.id)
+    if current_user.role != models.UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return user_id
+
+
+def _check_range(start: Optional[datetime], end: Optional[datetime]):
+    if start and end and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+
+
+def _unavailable(e: Exception) -> HTTPException:
+    logger.error(f"Audit trail query failed: {str(e)}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Audit trail is temporarily unavailable"
+    )
+
+
+@router.get("/events", response_model=schemas.AuditEventListResponse)
+def list_audit_events(
+    user_id: Optional[str] = Query(None, description="Whose trail (admins only; default: your own)"),
+    start: Optional[datetime] = Query(None, description="Earliest event time"),
+    end: Optional[datetime] = Query(None, description="Latest event time"),
+    action_type: Optional[str] = Query(None, description="e.g. DOCUMENT_DELETION"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    One page of audit events, newest first by default. Follow
+    `next_cursor` until it is null (the last page may be empty).
+    
+    Filtering by `action_type` reads the user_action index, which only
+    holds events recorded since that attribute was added; older events
+    appear only in unfiltered results.
+    """
+    owner = _trail_owner(user_id, current_user)
+    _check_range(start, end)
+
+    # A cursor only resumes the query it came from
+    scope = f"{owner}|{action_type or ''}|{order}"
+    start_key = decode_key_cursor(cursor, scope) if cursor else None
+
+    try:
+        items, last_key = audit_service.query_events(
+            owner, start, end, action_type,
+            newest_first=order == "desc",
+            limit=limit,
+            start_key=start_key
+        )
+    except (BotoCoreError, ClientError) as e:
+        raise _unavailable(e)
+
+    return cursor_page(items, limit, encode_key_cursor(scope, last_key) if last_key else None)
+
+
+def _ndjson_lines(events: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for event in events:
+        yield json.dumps(schemas.AuditEvent(**event).model_dump(mode="json"), separators=(",", ":")) + "\n"
+
+
+def _csv_lines(events: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    for event in events:
+        row = schemas.AuditEvent(**event).model_dump(mode="json")
+        row["metadata"] = json.dumps(row["metadata"], separators=(",", ":"))
+        writer.writerow([row[column] for column in CSV_COLUMNS])
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+@router.get("/events/export")
+def export_audit_events(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    user_id: Optional[str] = Query(None, description="Whose trail (admins only; default: your own)"),
+    start: Optional[datetime] = Query(None, description="Earliest event time"),
+    end: Optional[datetime] = Query(None, description="Latest event time"),
+    action_type: Optional[str] = Query(None, description="e.g. DOCUMENT_DELETION"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream every matching event, oldest first, as NDJSON or CSV. Pages are
+    fetched from DynamoDB as the client reads, so memory use stays at one page.
+    
+    As with /events, an `action_type` export only covers events recorded
+    since the user_action index attribute was added.
+    """
+    owner = _trail_owner(user_id, current_user)
+    _check_range(start, end)
+
+    events = audit_service.iter_events(owner, start, end, action_type, newest_first=False)
+
+    # Fetch the first page now: an error after streaming starts can't change the status
+    try:
+        first = list(itertools.islice(events, 1))
+    except (BotoCoreError, ClientError) as e:
+        raise _unavailable(e)
+    events = itertools.chain(first, events)
+
+    if format == "csv":
+        body, media_type = _csv_lines(events), "text/csv"
+    else:
+        body, media_type = _ndjson_lines(events), "application/x-ndjson"
+
+    filename = f"audit-{owner}-{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from datetime import timedelta, datetime
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
 
 from app.db.database import get_db
 from app.db import models, schemas
-from app.core.security import get_password_hash, verify_password, create_access_token
 from app.core.config import settings
-from app.api.deps import get_current_user
+from app.core.tokens import JWTError, request_claims
+from app.api.deps import get_current_user, get_current_user_record, optional_security
+from app.services import session_service
+from app.services.principal_cache import Principal, principal_cache
+from app.services.password_service import password_hasher, login_throttle
 
 router = APIRouter()
 
@@ -54,18 +61,50 @@ router = APIRouter()
     
 #     return db_user
 
+def _get_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(
+        models.User.email == email
+    ).first()
+
+
+def _record_login(db: Session, user: models.User, new_hash: Optional[str]) -> Tuple[UUID, str]:
+    """Start a session and update last login; returns (session id, refresh token)"""
+    if new_hash:
+        # Stored hash used an outdated cost factor
+        user.password_hash = new_hash
+    user.last_login_at = datetime.utcnow()
+    session, refresh_token = session_service.create_session(db, user.id)
+    db.commit()
+    return session.id, refresh_token
+
+
+def _token_response(access_token: str, refresh_token: str) -> dict:
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
 @router.post("/login")
-def login(form_data: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(form_data: schemas.UserLogin, db: Session = Depends(get_db)):
     """Login endpoint"""
-    user = db.query(models.User).filter(
-        models.User.email == form_data.email
-    ).first()
-    
-    if not user or not verify_password(form_data.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password"
-        )
+    # Per-account limits are enforced before any hash is computed
+    with login_throttle.attempt(form_data.email) as attempt:
+        user = await run_in_threadpool(_get_user_by_email, db, form_data.email)
+        
+        valid, new_hash = False, None
+        if user:
+            valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.password_hash)
+        
+        if not valid:
+            attempt.failed()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password"
+            )
+        attempt.succeeded()
     
     if not user.is_active:
         raise HTTPException(
@@ -73,21 +112,12 @@ def login(form_data: schemas.UserLogin, db: Session = Depends(get_db)):
             detail="Account is inactive"
         )
     
-    # Create token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
-    
-    # Update last login
-    user.last_login_at = datetime.utcnow()
-    db.commit()
+    # Start a session, update last login (and upgrade the hash if needed)
+    session_id, refresh_token = await run_in_threadpool(_record_login, db, user, new_hash)
+    access_token = session_service.issue_access_token(user.id, session_id)
     
     return {
-        "access_token": access_token,
-        "refresh_token": access_token,  # ← Make sure this line exists
-        "token_type": "bearer",
+        **_token_response(access_token, refresh_token),
         "user": {
             "id": str(user.id),
             "email": user.email,
@@ -98,19 +128,49 @@ def login(form_data: schemas.UserLogin, db: Session = Depends(get_db)):
     
 @router.get("/me", response_model=schemas.UserOut)
 def get_current_user_info(
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_record)
 ):
     """Get current user profile"""
     return current_user
 
+@router.post("/refresh")
+def refresh(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh
+    token (the old one stops working)
+    """
+    session, refresh_token = session_service.rotate_session(db, body.refresh_token)
+    
+    user = principal_cache.get(db, session.user_id)
+    if user is None or not user.is_active:
+        session_service.revoke_session(db, session.id)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive"
+        )
+    
+    access_token = session_service.issue_access_token(user.id, session.id)
+    return _token_response(access_token, refresh_token)
+
 @router.post("/logout")
-def logout():
-    """Logout endpoint (stateless JWT - client deletes token)"""
+def logout(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+):
+    """Logout endpoint (revokes the session of the presented access token)"""
+    if credentials:
+        try:
+            session_id = request_claims(request, credentials.credentials).get("sid")
+        except JWTError:
+            session_id = None
+        
+        if session_id:
+            session_service.revoke_session(db, session_id)
+    
     return {"message": "Logged out successfully"}
 
-@router.post("/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    """Register new user"""
+def _check_registration(db: Session, user: schemas.UserCreate):
     # Check if user exists
     existing_user = db.query(models.User).filter(
         models.User.email == user.email
@@ -132,11 +192,12 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
             status_code=400,
             detail="KHC Advocate ID already registered"
         )
-    
-    # Create user
+
+
+def _create_user(db: Session, user: schemas.UserCreate, password_hash: str) -> models.User:
     db_user = models.User(
         email=user.email,
-        password_hash=get_password_hash(user.password),
+        password_hash=password_hash,
         khc_advocate_id=user.khc_advocate_id,
         khc_advocate_name=user.khc_advocate_name,
         mobile=user.mobile,
@@ -150,4 +211,30 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(db_user)
     
-    return db_user
\ No newline at end of file
+    return db_user
+
+
+@router.post("/register", response_model=schemas.UserOut)
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    """Register new user"""
+    await run_in_threadpool(_check_registration, db, user)
+    
+    password_hash = await password_hasher.hash(user.password)
+    
+    return await run_in_threadpool(_create_user, db, user, password_hash)
+
+
+@router.get("/password-hasher/metrics")
+def get_password_hasher_metrics(
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Password hash queue depth and timings for this worker (admin only)
+    """
+    if current_user.role != models.UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return password_hasher.metrics()
\ No newline at end of file
@@ -1,15 +1,15 @@
 """
 Case management endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, extract
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from datetime import date, datetime, timedelta
 from uuid import UUID
 
+from app.core.config import settings
 from app.db.database import get_db
-from app.db.models import Case, User, Document, AIAnalysis, CaseHistory
+from app.db.models import Case, User
 from app.db.schemas import (
     CaseResponse,
     CaseCreate,
@@ -17,34 +17,90 @@ from app.db.schemas import (
     CaseDetailResponse,
     DocumentResponse,
     CaseHistoryResponse,
-    AIAnalysisResponse
+    AIAnalysisResponse,
+    CaseListResponse,
+    CalendarResponse
 )
 from app.api.deps import get_current_user
+from app.utils.pagination import cursor_page, paginate_keyset
+from app.utils.http_cache import make_etag, etag_matches, not_modified, set_etag, etag_headers
+from app.utils.responses import ORJSONResponse, columns_for, rows_to_dicts
+from app.services import stats_service, search_service, case_service, calendar_service
+from app.services.quota_service import quota_service, CASES
 
 router = APIRouter()
 
+# Sortable fields. Each is backed by an (advocate_id, is_visible, <field>, id)
+# index, so a page is read in index order instead of sorting all of the
+# advocate's cases.
+SORT_FIELDS = {
+    "updated_at": Case.updated_at,
+    "created_at": Case.created_at,
+    "efiling_date": Case.efiling_date,
+    "petitioner_name": Case.petitioner_name,
+    "case_number": Case.case_number,
+    "next_hearing_date": Case.next_hearing_date
+}
+
+# Sort fields usable with cursor pagination: NOT NULL, so (field, id) is a
+# total order
+CURSOR_SORT_FIELDS = {
+    name: SORT_FIELDS[name]
+    for name in ("updated_at", "created_at", "efiling_date", "petitioner_name")
+}
+
+# List rows are selected as plain columns, never hydrated into ORM objects
+CASE_LIST_COLUMNS = columns_for(Case, CaseResponse)
+
 # ============================================================================
 # List & Filter Endpoints
 # ============================================================================
 
-@router.get("/", response_model=List[CaseResponse])
+@router.get("/", response_model=Union[CaseListResponse, List[CaseResponse]])
 def get_cases(
     status: Optional[str] = Query(None, description="Filter by status"),
     case_type: Optional[str] = Query(None, description="Filter by case type"),
     case_year: Optional[int] = Query(None, description="Filter by year"),
     search: Optional[str] = Query(None, description="Search query"),
-    sort: str = Query("updated_at", description="Sort field"),
+    sort: str = Query("updated_at", description="Sort field (see SORT_FIELDS)"),
     order: str = Query("desc", description="Sort order (asc/desc)"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor pagination: empty for the first page, then next_cursor"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all cases for the authenticated user with filters
+    
+    With `cursor` set, returns a CaseListResponse page with `next_cursor`
+    (keyset pagination, sort limited to CURSOR_SORT_FIELDS). Without it,
+    returns a plain list paged by `page`/`per_page`.
+    
+    Supports If-None-Match: unchanged lists get a 304 after one
+    aggregate query. Without it, the validator is selected with the
+    page, so the ETag costs no extra query.
     """
+    if sort not in SORT_FIELDS or order not in ("asc", "desc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort must be one of {sorted(SORT_FIELDS)} and order asc/desc"
+        )
+    
+    params = (status, case_type, case_year, search, sort, order, page, per_page, cursor)
+    
+    etag = None
+    if if_none_match:
+        etag = make_etag(current_user.id, *case_service.case_list_validator(db, current_user.id), *params)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
     # Build base query
-    query = db.query(Case).filter(
+    query = db.query(
+        *CASE_LIST_COLUMNS,
+        *case_service.case_list_validator_columns(current_user.id)
+    ).filter(
         Case.advocate_id == current_user.id,
         Case.is_visible == True
     )
@@ -60,29 +116,46 @@ def get_cases(
         query = query.filter(Case.case_year == case_year)
     
     # Search
+    relevance = None
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Case.case_number.ilike(search_term),
-                Case.efiling_number.ilike(search_term),
-                Case.petitioner_name.ilike(search_term),
-                Case.respondent_name.ilike(search_term)
+        query, relevance = search_service.search_cases(query, search)
+    
+    # Cursor pagination
+    if cursor is not None:
+        if sort not in CURSOR_SORT_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cursor pagination supports sort in {sorted(CURSOR_SORT_FIELDS)}"
             )
+        
+        cases, next_cursor = paginate_keyset(
+            query, CURSOR_SORT_FIELDS[sort], Case.id, sort, order, per_page, cursor
         )
+        etag = etag or make_etag(current_user.id, *case_service.case_list_validator_of(db, current_user.id, cases), *params)
+        body = cursor_page(rows_to_dicts(cases, exclude=case_service.LIST_VALIDATOR_COLUMNS), per_page, next_cursor)
+        body["per_page"] = per_page  # Deprecated alias of limit (CaseListResponse)
+        return ORJSONResponse(body, headers=etag_headers(etag))
+    
+    # Sorting (search results by relevance first)
+    if relevance is not None:
+        query = query.order_by(relevance.desc())
     
-    # Sorting
-    sort_column = getattr(Case, sort, Case.updated_at)
+    # id breaks ties so pages are stable and match the index order
+    sort_column = SORT_FIELDS[sort]
     if order == "desc":
-        query = query.order_by(sort_column.desc())
+        query = query.order_by(sort_column.desc(), Case.id.desc())
     else:
-        query = query.order_by(sort_column.asc())
+        query = query.order_by(sort_column.asc(), Case.id.asc())
     
     # Pagination
     skip = (page - 1) * per_page
     cases = query.offset(skip).limit(per_page).all()
     
-    return cases
+    etag = etag or make_etag(current_user.id, *case_service.case_list_validator_of(db, current_user.id, cases), *params)
+    return ORJSONResponse(
+        rows_to_dicts(cases, exclude=case_service.LIST_VALIDATOR_COLUMNS),
+        headers=etag_headers(etag)
+    )
 
 
 @router.get("/search")
@@ -94,20 +167,131 @@ def search_cases(
     """
     Full-text search cases by case number, party names
     """
-    search_term = f"%{q}%"
+    query = db.query(Case).filter(
+        Case.advocate_id == current_user.id,
+        Case.is_visible == True
+    )
+    query, relevance = search_service.search_cases(query, q)
+    
+    cases = query.order_by(relevance.desc(), Case.updated_at.desc()).limit(50).all()
+    
+    return {"cases": cases}
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+# Declared before /{case_id} so "stats" is not parsed as a case id
+@router.get("/stats")
+def get_case_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get case statistics (for dashboard)
+    """
+    return stats_service.get_case_stats(db, current_user.id)
+
+
+# ============================================================================
+# Hearing Calendar
+# ============================================================================
+
+# Declared before /{case_id} so these paths are not parsed as case ids
+@router.get("/upcoming-hearings")
+def get_upcoming_hearings(
+    days: int = Query(7, ge=1, le=90, description="Days to look ahead"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get cases with upcoming hearings in next N days
+    """
+    now = datetime.now()
+    future = now + timedelta(days=days)
     
+    # Same predicate as the idx_case_hearing_calendar partial index
     cases = db.query(Case).filter(
         Case.advocate_id == current_user.id,
         Case.is_visible == True,
-        or_(
-            Case.case_number.ilike(search_term),
-            Case.efiling_number.ilike(search_term),
-            Case.petitioner_name.ilike(search_term),
-            Case.respondent_name.ilike(search_term)
+        Case.next_hearing_date.isnot(None),
+        Case.next_hearing_date.between(now, future)
+    ).order_by(Case.next_hearing_date.asc()).all()
+    
+    return cases
+
+
+@router.get("/calendar", response_model=CalendarResponse)
+def get_hearing_calendar(
+    start: Optional[date] = Query(None, description="First day (default: today)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: start + 30 days)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get hearings in a date range, grouped by day
+    """
+    start = start or date.today()
+    end = end or start + timedelta(days=30)
+    
+    if end < start or (end - start).days >= settings.CALENDAR_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be on or after start and at most {settings.CALENDAR_MAX_RANGE_DAYS} days later"
         )
-    ).limit(50).all()
     
-    return {"cases": cases}
+    range_start, range_end = calendar_service.day_bounds(start, end)
+    hearings = calendar_service.get_hearings(db, current_user.id, range_start, range_end)
+    
+    return {
+        "start": start,
+        "end": end,
+        "total": len(hearings),
+        "days": calendar_service.group_by_day(hearings)
+    }
+
+
+@router.get("/calendar/feed-url")
+def get_calendar_feed_url(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the iCalendar subscription URL for the advocate's hearings
+    """
+    url = request.url_for("get_calendar_feed").include_query_params(
+        token=calendar_service.feed_token(current_user.id)
+    )
+    return {"url": str(url)}
+
+
+@router.get("/calendar.ics", name="get_calendar_feed")
+def get_calendar_feed(
+    token: str = Query(..., description="Feed token from /cases/calendar/feed-url"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db)
+):
+    """
+    iCalendar feed of upcoming hearings (authenticated by the URL token,
+    since calendar clients cannot send a bearer token)
+    """
+    advocate_id = calendar_service.verify_feed_token(token)
+    if advocate_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar not found"
+        )
+    
+    body, etag = calendar_service.hearing_feed.render(db, advocate_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    return Response(
+        content=body,
+        media_type="text/calendar; charset=utf-8",
+        headers=etag_headers(etag)
+    )
 
 
 # ============================================================================
@@ -117,49 +301,54 @@ def search_cases(
 @router.get("/{case_id}", response_model=CaseDetailResponse)
 def get_case(
     case_id: UUID,
+    response: Response,
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated relationships to load: documents,history,analysis (default: all)"
+    ),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get case details with documents, history, and AI analysis
     """
-    case = db.query(Case).filter(Case.id == case_id).first()
-    
-    if not case:
+    try:
+        includes = case_service.parse_includes(include)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Case not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     
-    # Verify ownership
-    if case.advocate_id != current_user.id:
+    # Conditional GET before anything is hydrated
+    if if_none_match:
+        validator = case_service.case_detail_validator(db, case_id, current_user.id, includes)
+        if validator is not None:
+            etag = make_etag(case_id, *validator, *sorted(includes))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
+    case = case_service.load_case_detail(db, case_id, current_user.id, includes)
+    
+    if not case:
+        # Only the error path pays for telling "missing" from "not yours"
+        exists = db.query(Case.id).filter(Case.id == case_id).first()
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Case not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this case"
         )
     
-    # Get related data
-    documents = db.query(Document).filter(
-        Document.case_id == case_id
-    ).all()
-    
-    history = db.query(CaseHistory).filter(
-        CaseHistory.case_id == case_id
-    ).order_by(CaseHistory.event_date.desc()).all()
-    
-    ai_analysis = db.query(AIAnalysis).filter(
-        AIAnalysis.case_id == case_id
-    ).first()
-    
-    # Build response
-    case_dict = {
-        **case.__dict__,
-        "documents": documents,
-        "history": history,
-        "ai_analysis": ai_analysis
-    }
+    # Same validator, taken from what was just loaded
+    validator = case_service.case_detail_validator_of(case, includes)
+    set_etag(response, make_etag(case_id, *validator, *sorted(includes)))
     
-    return case_dict
+    return CaseDetailResponse.model_validate(case)
 
 
 @router.patch("/{case_id}", response_model=CaseResponse)
@@ -186,11 +375,18 @@ def update_case(
             detail="Not authorized to modify this case"
         )
     
+    counters_before = stats_service.case_counters(case)
+    
     # Update fields
     for field, value in update_data.dict(exclude_unset=True).items():
         setattr(case, field, value)
     
     case.updated_at = datetime.utcnow()
+    stats_service.record_change(
+        db, current_user.id,
+        before=counters_before,
+        after=stats_service.case_counters(case)
+    )
     db.commit()
     db.refresh(case)
     
@@ -220,121 +416,23 @@ def delete_case(
             detail="Not authorized to delete this case"
         )
     
+    counters_before = stats_service.case_counters(case)
+    was_visible = case.is_visible
+    
     # Soft delete
     case.is_visible = False
     case.updated_at = datetime.utcnow()
+    stats_service.record_change(
+        db, current_user.id,
+        before=counters_before,
+        after=stats_service.case_counters(case)
+    )
     db.commit()
     
+    if was_visible:
+        quota_service.release(current_user.id, {CASES: 1})
+    
     return {
         "message": "Case deleted successfully",
         "case_id": str(case_id)
     }
-
-
-# ============================================================================
-# Upcoming Hearings
-# ============================================================================
-
-@router.get("/upcoming-hearings")
-def get_upcoming_hearings(
-    days: int = Query(7, ge=1, le=90, description="Days to look ahead"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get cases with upcoming hearings in next N days
-    """
-    now = datetime.now()
-    future = now + timedelta(days=days)
-    
-    cases = db.query(Case).filter(
-        Case.advocate_id == current_user.id,
-        Case.is_visible == True,
-        Case.next_hearing_date.isnot(None),
-        Case.next_hearing_date.between(now, future)
-    ).order_by(Case.next_hearing_date.asc()).all()
-    
-    return cases
-
-
-# ============================================================================
-# Statistics
-# ============================================================================
-
-@router.get("/stats")
-def get_case_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get case statistics (for dashboard)
-    """
-    # Total cases
-    total_cases = db.query(Case).filter(
-        Case.advocate_id == current_user.id,
-        Case.is_visible == True
-    ).count()
-    
-    # By status
-    pending_cases = db.query(Case).filter(
-        Case.advocate_id == current_user.id,
-        Case.status == 'pending',
-        Case.is_visible == True
-    ).count()
-    
-    disposed_cases = db.query(Case).filter(
-        Case.advocate_id == current_user.id,
-        Case.status == 'disposed',
-        Case.is_visible == True
-    ).count()
-    
-    # Upcoming hearings (7 days)
-    now = datetime.now()
-    upcoming = db.query(Case).filter(
-        Case.advocate_id == current_user.id,
-        Case.next_hearing_date.between(now, now + timedelta(days=7))
-    ).count()
-    
-    # Cases by status
-    cases_by_status = db.query(
-        Case.status,
-        func.count(Case.id)
-    ).filter(
-        Case.advocate_id == current_user.id,
-        Case.is_visible == True
-    ).group_by(Case.status).all()
-    
-    # Cases by type
-    cases_by_type = db.query(
-        Case.case_type,
-        func.count(Case.id)
-    ).filter(
-        Case.advocate_id == current_user.id,
-        Case.is_visible == True
-    ).group_by(Case.case_type).all()
-    
-    # Monthly trend (last 6 months)
-    six_months_ago = now - timedelta(days=180)
-    monthly = db.query(
-        extract('year', Case.created_at).label('year'),
-        extract('month', Case.created_at).label('month'),
-        func.count(Case.id).label('count')
-    ).filter(
-        Case.advocate_id == current_user.id,
-        Case.created_at >= six_months_ago
-    ).group_by('year', 'month').order_by('year', 'month').all()
-    
-    monthly_trend = []
-    for year, month, count in monthly:
-        month_name = datetime(int(year), int(month), 1).strftime('%b')
-        monthly_trend.append({"month": month_name, "count": count})
-    
-    return {
-        "total_cases": total_cases,
-        "pending_cases": pending_cases,
-        "disposed_cases": disposed_cases,
-        "upcoming_hearings": upcoming,
-        "cases_by_status": {s: c for s, c in cases_by_status},
-        "cases_by_type": {t: c for t, c in cases_by_type},
-        "monthly_trend": monthly_trend
-    }
\ No newline at end of file
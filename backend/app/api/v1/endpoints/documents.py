@@ -1,37 +1,54 @@
 """
 Document management endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 from datetime import datetime
 
 from app.db.database import get_db
 from app.db.models import Document, Case, User
-from app.db.schemas import DocumentResponse, DocumentUpdate
+from app.db.schemas import DocumentResponse, DocumentUpdate, DocumentListResponse, DocumentSearchResponse
 from app.api.deps import get_current_user  # Fixed import path
+from app.services.event_broker import event_broker
+from app.services import stats_service, search_service
+from app.utils.pagination import cursor_page, paginate_keyset
+from app.utils.http_cache import make_etag, etag_matches, not_modified, set_etag
+from app.utils.responses import ORJSONResponse, columns_for, rows_to_dicts
+from app.services.quota_service import quota_service, DOCUMENTS, STORAGE_BYTES
+from app.services.usage_service import usage_meter
 
 router = APIRouter()
 
+# List rows are selected as plain columns, never hydrated into ORM objects
+DOCUMENT_LIST_COLUMNS = columns_for(Document, DocumentResponse)
+
 # ============================================================================
 # Endpoints
 # ============================================================================
 
-@router.get("/", response_model=List[DocumentResponse])
+@router.get("/", response_model=Union[DocumentListResponse, List[DocumentResponse]])
 def get_documents(
     case_id: Optional[UUID] = Query(None, description="Filter by case ID"),
     category: Optional[str] = Query(None, description="Filter by category"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor pagination: empty for the first page, then next_cursor"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all documents for the authenticated user"""
+    """
+    Get all documents for the authenticated user, newest first
+    
+    With `cursor` set, returns a DocumentListResponse page with
+    `next_cursor`; otherwise a plain list paged by `skip`/`limit`.
+    """
     
     # Build query
-    query = db.query(Document).join(Case).filter(
+    query = db.query(*DOCUMENT_LIST_COLUMNS).join(
+        Case, Document.case_id == Case.id
+    ).filter(
         Case.advocate_id == current_user.id
     )
     
@@ -42,22 +59,83 @@ def get_documents(
     if category:
         query = query.filter(Document.category == category)
     
+    if cursor is not None:
+        documents, next_cursor = paginate_keyset(
+            query, Document.created_at, Document.id, "created_at", "desc", limit, cursor
+        )
+        return ORJSONResponse(cursor_page(rows_to_dicts(documents), limit, next_cursor))
+    
     # Get documents
     documents = query.order_by(
         Document.created_at.desc()
     ).offset(skip).limit(limit).all()
     
-    return documents
+    return ORJSONResponse(rows_to_dicts(documents))
+
+
+@router.get("/search", response_model=DocumentSearchResponse)
+def search_documents(
+    q: str = Query(..., min_length=2, description="Search query, e.g. \"section 482\" or a quoted phrase"),
+    case_id: Optional[UUID] = Query(None, description="Filter by case ID"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search across the extracted text of the user's documents.
+    Returns ranked ids with highlighted snippets, not document bodies.
+    """
+    
+    hits, next_cursor = search_service.search_documents(
+        db,
+        current_user.id,
+        q,
+        case_id=case_id,
+        category=category,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    return cursor_page(hits, limit, next_cursor)
+
+
+# Declared before /{document_id} so "search" and "stats" are not parsed as a document id
+@router.get("/stats")
+def get_document_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get document statistics for the user"""
+    
+    return stats_service.get_document_stats(db, current_user.id)
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 def get_document(
     document_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get document details by ID"""
     
+    # Conditional GET before the document is hydrated
+    updated_at = db.query(Document.updated_at).join(
+        Case, Document.case_id == Case.id
+    ).filter(
+        Document.id == document_id,
+        Case.advocate_id == current_user.id
+    ).scalar()
+    
+    if updated_at is not None:
+        etag = make_etag(document_id, updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    
     document = db.query(Document).filter(Document.id == document_id).first()
     
     if not document:
@@ -141,11 +219,18 @@ def update_document(
             detail="Not authorized to modify this document"
         )
     
+    counters_before = stats_service.document_counters(document)
+    
     # Update document
     for field, value in update_data.dict(exclude_unset=True).items():
         setattr(document, field, value)
     
     document.updated_at = datetime.utcnow()
+    stats_service.record_change(
+        db, current_user.id,
+        before=counters_before,
+        after=stats_service.document_counters(document)
+    )
     db.commit()
     db.refresh(document)
     
@@ -184,9 +269,16 @@ def delete_document(
         )
     
     # Delete from database
+    stats_service.record_change(
+        db, current_user.id,
+        before=stats_service.document_counters(document)
+    )
     db.delete(document)
     db.commit()
     
+    quota_service.release(current_user.id, {DOCUMENTS: 1, STORAGE_BYTES: document.file_size or 0})
+    usage_meter.invalidate(current_user.id)
+    
     return {
         "message": "Document deleted successfully",
         "document_id": str(document_id)
@@ -220,10 +312,24 @@ def confirm_document_upload(
             detail="Not authorized"
         )
     
+    counters_before = stats_service.document_counters(document)
+    
     # Update status
     document.upload_status = "completed"
     document.uploaded_at = datetime.utcnow()
     
+    stats_service.record_change(
+        db, current_user.id,
+        before=counters_before,
+        after=stats_service.document_counters(document)
+    )
+    
+    event_broker.publish(db, current_user.id, "document_uploaded", {
+        "document_id": str(document.id),
+        "case_id": str(document.case_id),
+        "title": document.title
+    })
+    
     db.commit()
     db.refresh(document)
     
@@ -254,70 +360,8 @@ def get_documents_by_case(
         )
     
     # Get documents
-    documents = db.query(Document).filter(
+    documents = db.query(*DOCUMENT_LIST_COLUMNS).filter(
         Document.case_id == case_id
     ).order_by(Document.created_at.desc()).all()
     
-    return documents
-
-
-@router.get("/stats")
-def get_document_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get document statistics for the user"""
-    
-    # Get all user's cases
-    case_ids = db.query(Case.id).filter(
-        Case.advocate_id == current_user.id
-    ).all()
-    case_ids = [c[0] for c in case_ids]
-    
-    if not case_ids:
-        return {
-            "by_category": {},
-            "by_status": {},
-            "total_documents": 0,
-            "total_storage_bytes": 0,
-            "total_storage_mb": 0
-        }
-    
-    # Get document counts by category
-    stats = db.query(
-        Document.category,
-        func.count(Document.id).label('count'),
-        func.sum(Document.file_size).label('total_size')
-    ).filter(
-        Document.case_id.in_(case_ids)
-    ).group_by(Document.category).all()
-    
-    # Get upload status counts
-    status_counts = db.query(
-        Document.upload_status,
-        func.count(Document.id).label('count')
-    ).filter(
-        Document.case_id.in_(case_ids)
-    ).group_by(Document.upload_status).all()
-    
-    # Calculate total storage
-    total_storage = db.query(
-        func.sum(Document.file_size)
-    ).filter(
-        Document.case_id.in_(case_ids)
-    ).scalar() or 0
-    
-    return {
-        "by_category": {
-            stat.category: {
-                "count": stat.count,
-                "size": stat.total_size or 0
-            } for stat in stats
-        },
-        "by_status": {
-            stat.upload_status: stat.count for stat in status_counts
-        },
-        "total_documents": sum(stat.count for stat in stats),
-        "total_storage_bytes": total_storage,
-        "total_storage_mb": round(total_storage / (1024 * 1024), 2)
-    }
\ No newline at end of file
+    return ORJSONResponse(rows_to_dicts(documents))
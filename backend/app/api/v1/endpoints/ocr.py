@@ -5,6 +5,8 @@ from app.api.deps import get_current_user
 from app.db.models import User, Document, Case
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.services import stats_service
+from app.services.quota_service import quota_service, DOCUMENTS, STORAGE_BYTES
 import pypdf
 from pypdf import PdfWriter, PdfReader
 from reportlab.pdfgen import canvas
@@ -76,7 +78,7 @@ async def create_searchable_pdf(
 
 
 @router.post("/save-to-case")
-async def save_to_case(
+def save_to_case(
     file: UploadFile = File(...),
     text: str = Form(...),
     case_id: str = Form(...),
@@ -106,17 +108,23 @@ async def save_to_case(
         # Save as txt to S3
         pass  # TODO: S3 upload
     
-    # Save metadata
-    doc = Document(
-        case_id=case_id,
-        khc_document_id=f"OCR_{datetime.utcnow().timestamp()}",
-        category="misc",
-        title=f"OCR - {file.filename}",
-        s3_key=s3_key,
-        file_size=len(text.encode()),
-        upload_status="completed"
-    )
-    db.add(doc)
-    db.commit()
+    # Refunded if saving fails
+    with quota_service.reserve(db, current_user.id, {DOCUMENTS: 1, STORAGE_BYTES: len(text.encode())}):
+        # Save metadata
+        doc = Document(
+            case_id=case_id,
+            khc_document_id=f"OCR_{datetime.utcnow().timestamp()}",
+            category="misc",
+            title=f"OCR - {file.filename}",
+            s3_key=s3_key,
+            file_size=len(text.encode()),
+            upload_status="completed"
+        )
+        db.add(doc)
+        stats_service.record_change(
+            db, current_user.id,
+            after=stats_service.document_counters(doc)
+        )
+        db.commit()
     
     return {"message": "Saved successfully", "document_id": str(doc.id)}
@@ -1,16 +1,18 @@
 """
 Server-Sent Events for real-time updates
 """
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from sse_starlette.sse import EventSourceResponse
-import asyncio
 import json
 from datetime import datetime
+from typing import Optional
 
 from app.api.deps import get_db, get_current_user
-from app.db.models import User, Case, Document
-
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.models import User, UserRole
+from app.services.sse_manager import sse_manager
 
 
 router = APIRouter()
@@ -18,7 +20,7 @@ router = APIRouter()
 
 @router.get("/updates")
 async def subscribe_to_updates(
-    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -27,88 +29,75 @@ async def subscribe_to_updates(
     
     Events:
     - case_synced: New case added
-    - document_uploaded: Document upload complete
+    - document_uploaded: Document upload complete (bursts per case are
+      batched into one event with `count` and `document_ids`)
+    - analysis_completed: AI analysis finished
+    - resync: Missed events are no longer available, refetch once
+    - close: Stream replaced by a newer tab, do not reconnect
     - ping: Keepalive
+    
+    Events are pushed by the event broker; an idle stream runs no queries.
+    On reconnect, events after `Last-Event-ID` are replayed.
     """
+    user_id = str(current_user.id)
+    user_email = current_user.email
+    
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+    
+    # Release the pooled connection used for authentication before streaming
+    db.close()
+    
     async def event_generator():
-        last_check = datetime.now()
-        retry_count = 0
-        max_retries = 3
+        connection = sse_manager.connect(user_id, resume_from)
         
-        while retry_count < max_retries:
-            # Check if client disconnected
-            if await request.is_disconnected():
-                print(f"Client {current_user.email} disconnected")
-                break
-            
-            try:
-                # Check for new cases
-                new_cases = db.query(Case).filter(
-                    Case.advocate_id == current_user.id,
-                    Case.created_at > last_check
-                ).all()
-                
-                for case in new_cases:
-                    yield {
-                        "event": "case_synced",
-                        "data": json.dumps({
-                            "case_id": str(case.id),
-                            "case_number": case.case_number or case.efiling_number,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    }
-                
-                # Check for new documents
-                new_documents = db.query(Document).join(Case).filter(
-                    Case.advocate_id == current_user.id,
-                    Document.created_at > last_check,
-                    Document.upload_status == 'completed'
-                ).all()
+        try:
+            while not connection.finished:
+                item = await connection.get(timeout=settings.SSE_KEEPALIVE_SECONDS)
                 
-                for doc in new_documents:
+                if item is None:
+                    # Send keepalive ping when idle
                     yield {
-                        "event": "document_uploaded",
+                        "event": "ping",
                         "data": json.dumps({
-                            "document_id": str(doc.id),
-                            "case_id": str(doc.case_id),
-                            "title": doc.title,
                             "timestamp": datetime.now().isoformat()
                         })
                     }
+                    continue
                 
-                last_check = datetime.now()
-                
-                # Send keepalive ping every 15 seconds
-                yield {
-                    "event": "ping",
-                    "data": json.dumps({
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
-                
-                retry_count = 0  # Reset on success
-                
-            except Exception as e:
-                print(f"SSE Error for user {current_user.email}: {e}")
-                retry_count += 1
-                
-                # Send error event
-                yield {
-                    "event": "error",
-                    "data": json.dumps({
-                        "message": "Temporary error, retrying...",
-                        "retry": retry_count
-                    })
+                event = {
+                    "event": item["event"],
+                    "data": json.dumps(item["data"])
                 }
-            
-            # Check every 5 seconds
-            await asyncio.sleep(5)
+                if item.get("id") is not None:
+                    event["id"] = str(item["id"])
+                yield event
         
-        print(f"SSE stream ended for user {current_user.email}")
+        finally:
+            sse_manager.disconnect(connection)
+            logger.info(f"SSE stream ended for user {user_email}")
     
     return EventSourceResponse(event_generator())
 
 
+@router.get("/metrics")
+def get_sse_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    SSE connection counts and queue depths for this worker (admin only)
+    """
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return sse_manager.metrics()
+
+
 # router = APIRouter()
 
 
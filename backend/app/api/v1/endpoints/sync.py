@@ -11,6 +11,10 @@ from app.db.database import get_db
 from app.db.models import Case, Document, User
 from app.db.schemas import CaseSyncRequest, DocumentSyncRequest, CaseResponse
 from app.api.deps import get_current_user
+from app.services.event_broker import event_broker
+from app.services import stats_service
+from app.services.quota_service import quota_service, CASES, DOCUMENTS, STORAGE_BYTES
+from app.services.usage_service import usage_meter
 
 router = APIRouter()
 
@@ -40,6 +44,8 @@ def sync_case(
     
     if existing_case:
         # Update existing case
+        counters_before = stats_service.case_counters(existing_case)
+        
         for field, value in sync_data.dict(exclude={'pdf_links', 'khc_id'}).items():
             if value is not None:
                 setattr(existing_case, field, value)
@@ -48,6 +54,18 @@ def sync_case(
         existing_case.sync_status = "completed"
         existing_case.updated_at = datetime.utcnow()
         
+        stats_service.record_change(
+            db, current_user.id,
+            before=counters_before,
+            after=stats_service.case_counters(existing_case)
+        )
+        
+        event_broker.publish(db, current_user.id, "case_synced", {
+            "case_id": str(existing_case.id),
+            "case_number": existing_case.case_number or existing_case.efiling_number,
+            "action": "updated"
+        })
+        
         db.commit()
         db.refresh(existing_case)
         
@@ -55,29 +73,43 @@ def sync_case(
     
     else:
         # Create new case
-        new_case = Case(
-            advocate_id=current_user.id,
-            efiling_number=sync_data.efiling_number,
-            case_number=sync_data.case_number,
-            case_type=sync_data.case_type,
-            case_year=sync_data.case_year,
-            party_role=sync_data.party_role,
-            petitioner_name=sync_data.petitioner_name,
-            respondent_name=sync_data.respondent_name,
-            efiling_date=sync_data.efiling_date,
-            efiling_details=sync_data.efiling_details,
-            next_hearing_date=sync_data.next_hearing_date,
-            status=sync_data.status,
-            bench_type=sync_data.bench_type,
-            judge_name=sync_data.judge_name,
-            khc_source_url=sync_data.khc_source_url,
-            last_synced_at=datetime.utcnow(),
-            sync_status="completed"
-        )
-        
-        db.add(new_case)
-        db.commit()
-        db.refresh(new_case)
+        with quota_service.reserve(db, current_user.id, {CASES: 1}):
+            new_case = Case(
+                advocate_id=current_user.id,
+                efiling_number=sync_data.efiling_number,
+                case_number=sync_data.case_number,
+                case_type=sync_data.case_type,
+                case_year=sync_data.case_year,
+                party_role=sync_data.party_role,
+                petitioner_name=sync_data.petitioner_name,
+                respondent_name=sync_data.respondent_name,
+                efiling_date=sync_data.efiling_date,
+                efiling_details=sync_data.efiling_details,
+                next_hearing_date=sync_data.next_hearing_date,
+                status=sync_data.status,
+                bench_type=sync_data.bench_type,
+                judge_name=sync_data.judge_name,
+                khc_source_url=sync_data.khc_source_url,
+                last_synced_at=datetime.utcnow(),
+                sync_status="completed"
+            )
+            
+            db.add(new_case)
+            db.flush()
+            
+            stats_service.record_change(
+                db, current_user.id,
+                after=stats_service.case_counters(new_case)
+            )
+            
+            event_broker.publish(db, current_user.id, "case_synced", {
+                "case_id": str(new_case.id),
+                "case_number": new_case.case_number or new_case.efiling_number,
+                "action": "created"
+            })
+            
+            db.commit()
+            db.refresh(new_case)
         
         return new_case
 
@@ -117,15 +149,36 @@ def sync_document(
         Document.khc_document_id == sync_data.khc_document_id
     ).first()
     
+    # Registering the upload counts it; drop the hold taken for its URL
+    quota_service.settle(current_user.id, sync_data.s3_key)
+    
     if existing_doc:
         # Update existing
-        existing_doc.s3_key = sync_data.s3_key
-        existing_doc.file_size = sync_data.file_size
-        existing_doc.upload_status = "completed"
-        existing_doc.uploaded_at = datetime.utcnow()
+        counters_before = stats_service.document_counters(existing_doc)
+        size_delta = (sync_data.file_size or 0) - (existing_doc.file_size or 0)
         
-        db.commit()
-        db.refresh(existing_doc)
+        with quota_service.reserve(db, current_user.id, {STORAGE_BYTES: size_delta}):
+            existing_doc.s3_key = sync_data.s3_key
+            existing_doc.file_size = sync_data.file_size
+            existing_doc.upload_status = "completed"
+            existing_doc.uploaded_at = datetime.utcnow()
+            
+            stats_service.record_change(
+                db, current_user.id,
+                before=counters_before,
+                after=stats_service.document_counters(existing_doc)
+            )
+            
+            event_broker.publish(db, current_user.id, "document_uploaded", {
+                "document_id": str(existing_doc.id),
+                "case_id": str(existing_doc.case_id),
+                "title": existing_doc.title
+            })
+            
+            db.commit()
+            db.refresh(existing_doc)
+        
+        usage_meter.invalidate(current_user.id)
         
         return {
             "message": "Document updated",
@@ -134,22 +187,38 @@ def sync_document(
     
     else:
         # Create new document
-        new_doc = Document(
-            case_id=case.id,
-            khc_document_id=sync_data.khc_document_id,
-            category=sync_data.category,
-            title=sync_data.title,
-            s3_key=sync_data.s3_key,
-            s3_bucket="lawmate-case-pdfs",
-            file_size=sync_data.file_size,
-            source_url=sync_data.source_url,
-            upload_status="completed",
-            uploaded_at=datetime.utcnow()
-        )
+        with quota_service.reserve(db, current_user.id, {DOCUMENTS: 1, STORAGE_BYTES: sync_data.file_size or 0}):
+            new_doc = Document(
+                case_id=case.id,
+                khc_document_id=sync_data.khc_document_id,
+                category=sync_data.category,
+                title=sync_data.title,
+                s3_key=sync_data.s3_key,
+                s3_bucket="lawmate-case-pdfs",
+                file_size=sync_data.file_size,
+                source_url=sync_data.source_url,
+                upload_status="completed",
+                uploaded_at=datetime.utcnow()
+            )
+            
+            db.add(new_doc)
+            db.flush()
+            
+            stats_service.record_change(
+                db, current_user.id,
+                after=stats_service.document_counters(new_doc)
+            )
+            
+            event_broker.publish(db, current_user.id, "document_uploaded", {
+                "document_id": str(new_doc.id),
+                "case_id": str(new_doc.case_id),
+                "title": new_doc.title
+            })
+            
+            db.commit()
+            db.refresh(new_doc)
         
-        db.add(new_doc)
-        db.commit()
-        db.refresh(new_doc)
+        usage_meter.invalidate(current_user.id)
         
         return {
             "message": "Document created",
@@ -11,9 +11,13 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 
-from app.api.v1.deps import get_current_user
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user, get_s3_service
+from app.db.database import get_db
 from app.db.models import User
 from app.services.s3_service import S3Service
+from app.services.quota_service import quota_service, DOCUMENTS, STORAGE_BYTES
 from app.core.logger import logger
 
 router = APIRouter(prefix="/upload", tags=["upload"])
@@ -146,9 +150,11 @@ class UploadProgressUpdate(BaseModel):
 # ============================================================================
 
 @router.post("/presigned-url", response_model=StandardUploadResponse)
-async def get_presigned_url(
+def get_presigned_url(
     request: StandardUploadRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    s3_service: S3Service = Depends(get_s3_service)
 ):
     """
     Generate pre-signed URL for direct S3 upload (files < 15MB).
@@ -200,18 +206,19 @@ async def get_presigned_url(
     });
     ```
     """
+    # Generate S3 key
+    s3_key = f"{current_user.khc_advocate_id}/{request.case_number}/{request.document_id}.pdf"
+    
+    # Plan limits: held now so parallel uploads can't all pass, counted
+    # for good when the upload is registered via /sync/documents
+    quota_service.hold(db, current_user.id, s3_key, {DOCUMENTS: 1, STORAGE_BYTES: request.file_size})
+    
     try:
         logger.info(f"Generating pre-signed URL for user {current_user.id}", extra={
             "case_number": request.case_number,
             "file_size": request.file_size
         })
         
-        # Generate S3 key
-        s3_key = f"{current_user.khc_advocate_id}/{request.case_number}/{request.document_id}.pdf"
-        
-        # Initialize S3 service
-        s3_service = S3Service()
-        
         # Generate pre-signed URL (15 minutes expiry)
         presigned_url = s3_service.generate_presigned_url(
             s3_key=s3_key,
@@ -235,6 +242,7 @@ async def get_presigned_url(
         )
         
     except Exception as e:
+        quota_service.settle(current_user.id, s3_key)
         logger.error(f"Failed to generate pre-signed URL", extra={
             "error": str(e),
             "user_id": str(current_user.id)
@@ -245,9 +253,11 @@ async def get_presigned_url(
         )
 
 @router.post("/multipart/init", response_model=MultipartInitResponse)
-async def initiate_multipart_upload(
+def initiate_multipart_upload(
     request: MultipartInitRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    s3_service: S3Service = Depends(get_s3_service)
 ):
     """
     Initiate multipart upload for large files (>= 15MB).
@@ -265,6 +275,12 @@ async def initiate_multipart_upload(
     - Better for unreliable networks
     - Handles files up to 5TB
     """
+    # Generate S3 key
+    s3_key = f"{current_user.khc_advocate_id}/{request.case_number}/{request.document_id}.pdf"
+    
+    # Plan limits (held until the upload is registered on /sync/documents)
+    quota_service.hold(db, current_user.id, s3_key, {DOCUMENTS: 1, STORAGE_BYTES: request.file_size})
+    
     try:
         logger.info(f"Initiating multipart upload", extra={
             "case_number": request.case_number,
@@ -279,12 +295,6 @@ async def initiate_multipart_upload(
                 detail="File size must be >= 15MB for multipart upload. Use standard upload instead."
             )
         
-        # Generate S3 key
-        s3_key = f"{current_user.khc_advocate_id}/{request.case_number}/{request.document_id}.pdf"
-        
-        # Initialize S3 service
-        s3_service = S3Service()
-        
         # Initiate multipart upload
         upload_id = s3_service.initiate_multipart_upload(
             s3_key=s3_key,
@@ -321,8 +331,10 @@ async def initiate_multipart_upload(
         )
         
     except HTTPException:
+        quota_service.settle(current_user.id, s3_key)
         raise
     except Exception as e:
+        quota_service.settle(current_user.id, s3_key)
         logger.error(f"Failed to initiate multipart upload", extra={
             "error": str(e),
             "user_id": str(current_user.id)
@@ -335,7 +347,8 @@ async def initiate_multipart_upload(
 @router.post("/multipart/complete", response_model=MultipartCompleteResponse)
 async def complete_multipart_upload(
     request: MultipartCompleteRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    s3_service: S3Service = Depends(get_s3_service)
 ):
     """
     Complete multipart upload after all chunks are uploaded.
@@ -370,9 +383,6 @@ async def complete_multipart_upload(
                     detail="Parts must be sorted by PartNumber in ascending order"
                 )
         
-        # Initialize S3 service
-        s3_service = S3Service()
-        
         # Format parts for S3 API
         parts = [
             {
@@ -412,7 +422,6 @@ async def complete_multipart_upload(
         
         # Attempt to abort the upload
         try:
-            s3_service = S3Service()
             s3_service.abort_multipart_upload(request.s3_key, request.upload_id)
             logger.info(f"Aborted failed multipart upload", extra={
                 "upload_id": request.upload_id
@@ -431,7 +440,8 @@ async def complete_multipart_upload(
 async def abort_multipart_upload(
     upload_id: str,
     s3_key: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    s3_service: S3Service = Depends(get_s3_service)
 ):
     """
     Abort a multipart upload.
@@ -446,8 +456,8 @@ async def abort_multipart_upload(
             "user_id": str(current_user.id)
         })
         
-        s3_service = S3Service()
         s3_service.abort_multipart_upload(s3_key, upload_id)
+        quota_service.settle(current_user.id, s3_key)
         
         logger.info(f"Multipart upload aborted successfully", extra={
             "upload_id": upload_id
@@ -0,0 +1,99 @@
+"""
+Shared boto3 clients, one per service per process
+
+Building a boto3 client resolves credentials, loads the service model
+and sets up a new connection pool, which takes milliseconds. Services
+get their clients from `aws_clients` instead of calling boto3.client()
+themselves. Each client is built on first use and reused after that.
+
+boto3 clients are thread-safe, so one client serves every request
+thread. Sessions are not, so clients are built under a lock. Pool size
+and retry behaviour come from AWS_MAX_POOL_CONNECTIONS,
+AWS_RETRY_MODE and AWS_MAX_ATTEMPTS. Per-service overrides are in
+SERVICE_CONFIG, e.g. the long read timeout Bedrock needs.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import boto3
+from botocore.config import Config
+
+from app.core.config import settings
+
+__all__ = ["AWSClientRegistry", "aws_clients"]
+
+SERVICE_CONFIG: Dict[str, Config] = {
+    # Model invocations stream for a long time
+    "bedrock-runtime": Config(read_timeout=settings.AWS_BEDROCK_READ_TIMEOUT_SECONDS),
+}
+
+
+class AWSClientRegistry:
+    """
+    Lazily built, process-wide boto3 clients (and resources) keyed by
+    service name.
+    """
+
+    def __init__(self, session: Optional[boto3.session.Session] = None):
+        self._session = session
+        self._clients: Dict[str, Any] = {}
+        self._resources: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.config = Config(
+            region_name=settings.AWS_REGION,
+            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.AWS_READ_TIMEOUT_SECONDS,
+            retries={"mode": settings.AWS_RETRY_MODE, "max_attempts": settings.AWS_MAX_ATTEMPTS}
+        )
+
+    def client(self, service_name: str):
+        """The shared client for a service"""
+        client = self._clients.get(service_name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(service_name)
+                if client is None:
+                    client = self._get_session().client(service_name, config=self._config_for(service_name))
+                    self._clients[service_name] = client
+        return client
+
+    def resource(self, service_name: str):
+        """
+        The shared resource for a service. Unlike clients, resources are
+        not documented as thread-safe: share them only for calls that
+        don't mutate resource objects (e.g. Table.query).
+        """
+        resource = self._resources.get(service_name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(service_name)
+                if resource is None:
+                    resource = self._get_session().resource(service_name, config=self._config_for(service_name))
+                    self._resources[service_name] = resource
+        return resource
+
+    def reset(self):
+        """Drop every client, e.g. after credentials change or in a forked child"""
+        with self._lock:
+            self._clients.clear()
+            self._resources.clear()
+            self._session = None
+
+    def _config_for(self, service_name: str) -> Config:
+        override = SERVICE_CONFIG.get(service_name)
+        return self.config.merge(override) if override else self.config
+
+    def _get_session(self) -> boto3.session.Session:
+        # Called with self._lock held
+        if self._session is None:
+            self._session = boto3.session.Session(
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION
+            )
+        return self._session
+
+
+# Singleton instance
+aws_clients = AWSClientRegistry()
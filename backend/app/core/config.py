@@ -22,18 +22,84 @@ class Settings(BaseSettings):
     # JWT Authentication
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # Short-lived; clients renew via /auth/refresh
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10  # A just-rotated token still gets the same new token (retries, parallel tabs)
+    SESSION_DENYLIST_REFRESH_SECONDS: int = 10  # How long other workers may accept a revoked session
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # How long another worker may serve a deactivated user
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Hashes below this cost are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64  # Waiting hash jobs before logins get a 503
+    LOGIN_MAX_FAILURES: int = 5
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 300
+    LOGIN_MAX_CONCURRENT_ATTEMPTS: int = 2
+    LOGIN_THROTTLE_MAX_ACCOUNTS: int = 100000
     
     # AWS Configuration
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str = "ap-south-1"
+    AWS_MAX_POOL_CONNECTIONS: int = 50  # Per shared client; at least the request threadpool size
+    AWS_RETRY_MODE: str = "standard"  # legacy | standard | adaptive
+    AWS_MAX_ATTEMPTS: int = 3
+    AWS_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AWS_READ_TIMEOUT_SECONDS: float = 60.0
+    AWS_BEDROCK_READ_TIMEOUT_SECONDS: float = 300.0
     
     # S3
     S3_BUCKET_NAME: str = "lawmate-case-pdfs"
     
     # DynamoDB (optional)
     DYNAMODB_TABLE_NAME: str = "lawmate-activity-trail"
+    DYNAMODB_ACTION_INDEX_NAME: str = "user_action-timestamp-index"  # GSI: user_action (S) + timestamp (N)
+    AUDIT_EXPORT_PAGE_SIZE: int = 500
+    AUDIT_BATCH_SIZE: int = 25  # Items per BatchWriteItem (max 25)
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0  # Max age of a spool segment before it is shipped
+    AUDIT_SPOOL_DIR: str = "audit_spool"
+    AUDIT_SPOOL_SEGMENT_BYTES: int = 1024 * 1024
+    AUDIT_SPOOL_FSYNC_INTERVAL_MS: int = 20
+    AUDIT_SPOOL_MAX_BYTES: int = 512 * 1024 * 1024  # Beyond this only compliance events are spooled
+    AUDIT_SEGMENT_MAX_ATTEMPTS: int = 5  # Failed shipments before a segment is quarantined
+    
+    # Real-time events (SSE)
+    EVENTS_CHANNEL: str = "lawmate_events"  # PostgreSQL LISTEN/NOTIFY channel
+    SSE_QUEUE_SIZE: int = 100  # Per-connection backlog before compacting to resync
+    SSE_KEEPALIVE_SECONDS: int = 15
+    SSE_REPLAY_BUFFER_SIZE: int = 200  # Recent events kept per advocate for Last-Event-ID
+    SSE_REPLAY_MAX_ADVOCATES: int = 10000
+    SSE_MAX_CONNECTIONS_PER_USER: int = 5
+    SSE_COALESCE_WINDOW_SECONDS: float = 1.0
+    
+    # Dashboard stats rollup
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 3600  # 0 disables the in-process reconciler
+    
+    # Usage metering
+    USAGE_CACHE_TTL_SECONDS: int = 30
+    USAGE_CACHE_MAX_ENTRIES: int = 10000
+    QUOTA_REFRESH_SECONDS: int = 300  # Re-sync in-memory quota counters from the database
+    QUOTA_CACHE_MAX_ENTRIES: int = 10000
+    QUOTA_UPLOAD_HOLD_SECONDS: int = 3600  # Quota held for an issued upload URL until the document is registered
+    
+    # Hearing calendar
+    CALENDAR_MAX_RANGE_DAYS: int = 366
+    CALENDAR_FEED_MAX_ADVOCATES: int = 1000  # In-memory iCalendar feeds kept per process
+    
+    # Rate limiting (token buckets per advocate, or per IP when unauthenticated)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_SYNC_PER_MINUTE: int = 120
+    RATE_LIMIT_SYNC_BURST: int = 60
+    RATE_LIMIT_AI_PER_MINUTE: int = 10
+    RATE_LIMIT_AI_BURST: int = 5
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 20
+    RATE_LIMIT_AUTH_BURST: int = 10
+    RATE_LIMIT_READ_PER_MINUTE: int = 600
+    RATE_LIMIT_READ_BURST: int = 120
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_REDIS_URL: str = ""  # Optional: share buckets across workers (needs `redis`)
+    RATE_LIMIT_TRUST_PROXY: bool = False  # Key by the first X-Forwarded-For address
     
     # CORS
     CORS_ORIGINS: str = '["http://localhost:3000"]'
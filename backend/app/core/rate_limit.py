@@ -0,0 +1,225 @@
+"""
+Token-bucket rate limiting middleware
+
+Requests are classified into route groups, each with its own policy:
+
+- sync:  /sync/* (extension case/document sync)
+- ai:    POST /analysis/*, POST /ocr/*
+- auth:  POST /auth/* (always keyed by client IP)
+- read:  every other GET
+
+Buckets are keyed per advocate: the `sub` of a valid bearer token,
+verified once and memoized for the request (app.core.tokens). Without
+a valid token they are keyed by client IP. The check runs before
+routing and dependencies, so a rejected request never checks out a
+database connection. It gets a 429 with Retry-After.
+
+State is kept in process. If RATE_LIMIT_REDIS_URL is set and the
+`redis` package is installed, buckets are shared across workers
+instead. On a Redis error the limiter falls back to the local buckets.
+"""
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.tokens import JWTError, request_claims
+
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    per_minute: int
+    burst: int
+    per_ip: bool = False  # Key by client IP even for authenticated requests
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second"""
+        return self.per_minute / 60
+
+
+SYNC = RateLimitPolicy("sync", settings.RATE_LIMIT_SYNC_PER_MINUTE, settings.RATE_LIMIT_SYNC_BURST)
+AI = RateLimitPolicy("ai", settings.RATE_LIMIT_AI_PER_MINUTE, settings.RATE_LIMIT_AI_BURST)
+AUTH = RateLimitPolicy("auth", settings.RATE_LIMIT_AUTH_PER_MINUTE, settings.RATE_LIMIT_AUTH_BURST, per_ip=True)
+READ = RateLimitPolicy("read", settings.RATE_LIMIT_READ_PER_MINUTE, settings.RATE_LIMIT_READ_BURST)
+
+
+def policy_for(method: str, path: str) -> Optional[RateLimitPolicy]:
+    """Route group of a request, or None if it is not limited"""
+    if not path.startswith(API_PREFIX + "/"):
+        return None
+    path = path[len(API_PREFIX):]
+
+    if path.startswith("/sync/"):
+        return SYNC
+    if method == "POST" and (path.startswith("/analysis/") or path.startswith("/ocr/")):
+        return AI
+    if method == "POST" and path.startswith("/auth/"):
+        return AUTH
+    if method in ("GET", "HEAD"):
+        return READ
+    return None
+
+
+# ============================================================================
+# Bucket stores
+# ============================================================================
+
+class MemoryBucketStore:
+    """
+    Token buckets in this process, bounded to RATE_LIMIT_MAX_KEYS (least
+    recently used evicted; an evicted bucket simply starts full again).
+    Only touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, max_keys: int = settings.RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, policy: RateLimitPolicy) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (policy.burst, now))
+        tokens = min(policy.burst, tokens + (now - updated) * policy.rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / policy.rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+
+# Same algorithm as MemoryBucketStore.take, atomic in Redis
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers through Redis"""
+
+    def __init__(self, url: str, fallback: MemoryBucketStore):
+        self._client = aioredis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+        self._fallback = fallback
+
+    async def take(self, key: str, policy: RateLimitPolicy) -> float:
+        try:
+            result = await self._take(
+                keys=[f"ratelimit:{key}"],
+                args=[policy.burst, policy.rate, time.time()]
+            )
+            return float(result)
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, using local buckets: {str(e)}")
+            return await self._fallback.take(key, policy)
+
+
+def create_bucket_store():
+    local = MemoryBucketStore()
+    if settings.RATE_LIMIT_REDIS_URL:
+        if HAS_REDIS:
+            return RedisBucketStore(settings.RATE_LIMIT_REDIS_URL, local)
+        logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed; rate limits are per process")
+    return local
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_key(request: Request, policy: RateLimitPolicy) -> str:
+    """Advocate id from a valid bearer token, else the client IP"""
+    if not policy.per_ip:
+        authorization = request.headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                subject = request_claims(request, token).get("sub")
+                if subject:
+                    return f"{policy.name}:user:{subject}"
+            except JWTError:
+                pass
+    return f"{policy.name}:ip:{client_ip(request)}"
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware (streaming SSE responses pass through untouched)
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or create_bucket_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        policy = policy_for(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Shares scope["state"] with the endpoint's Request, so claims
+        # verified here are reused by get_current_user
+        request = Request(scope)
+        retry_after = await self.store.take(rate_limit_key(request, policy), policy)
+
+        if retry_after > 0:
+            seconds = max(1, math.ceil(retry_after))
+            response = ORJSONResponse(
+                status_code=429,
+                content={"detail": f"Too many {policy.name} requests. Retry in {seconds} seconds."},
+                headers={"Retry-After": str(seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
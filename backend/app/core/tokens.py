@@ -0,0 +1,49 @@
+"""
+JWT verification shared by every authenticated route
+
+Tokens are minted by app.core.security.create_access_token (python-jose,
+user id in `sub`). Verification builds the HMAC key once per process and
+decodes each bearer token at most once per request. Later dependencies
+and middleware reuse the claims memoized on `request.state`.
+"""
+from functools import lru_cache
+from typing import Any, Dict
+
+from fastapi import Request
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+__all__ = ["JWTError", "verify_token", "request_claims"]
+
+
+@lru_cache(maxsize=4)
+def _verification_key(secret: str, algorithm: str) -> Key:
+    """Key object for the signing secret, built once instead of per decode"""
+    return jwk.construct(secret, algorithm)
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verify signature and expiry and return the claims.
+    Raises JWTError (including ExpiredSignatureError).
+    """
+    return jwt.decode(
+        token,
+        _verification_key(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM),
+        algorithms=[settings.JWT_ALGORITHM]
+    )
+
+
+def request_claims(request: Request, token: str) -> Dict[str, Any]:
+    """
+    Verified claims of the request's bearer token, decoded once per request
+    """
+    memo = getattr(request.state, "token_claims", None)
+    if memo is not None and memo[0] == token:
+        return memo[1]
+
+    claims = verify_token(token)
+    request.state.token_claims = (token, claims)
+    return claims
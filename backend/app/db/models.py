@@ -4,11 +4,11 @@ SQLAlchemy ORM Models
 """
 from sqlalchemy import (
     Column, String, Integer, Boolean, DateTime, Text, BigInteger, 
-    ForeignKey, Enum as SQLEnum, Index, TIMESTAMP
+    ForeignKey, Enum as SQLEnum, Index, TIMESTAMP, text
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 import enum
@@ -163,7 +163,7 @@ class Case(Base):
     sync_status = Column(String(50), nullable=False, default="pending")
     
     # Search
-    search_vector = Column(Text, nullable=True)  # TSVECTOR in PostgreSQL
+    search_vector = Column(TSVECTOR, nullable=True)  # Maintained by trigger (database/case_search.sql)
     
     # Soft Delete
     is_visible = Column(Boolean, nullable=False, default=True)
@@ -177,8 +177,28 @@ class Case(Base):
     # Relationships
     advocate = relationship("User", back_populates="cases")
     documents = relationship("Document", back_populates="case", cascade="all, delete-orphan")
-    history = relationship("CaseHistory", back_populates="case", cascade="all, delete-orphan")
+    history = relationship(
+        "CaseHistory", back_populates="case", cascade="all, delete-orphan",
+        order_by="CaseHistory.event_date.desc()"  # Newest first
+    )
     ai_analysis = relationship("AIAnalysis", back_populates="case", uselist=False, cascade="all, delete-orphan")
+    
+    # Indexes
+    __table_args__ = (
+        # Hearing calendar / upcoming hearings (database/hearing_calendar.sql)
+        Index(
+            'idx_case_hearing_calendar', 'advocate_id', 'next_hearing_date',
+            postgresql_where=text('is_visible AND next_hearing_date IS NOT NULL')
+        ),
+        # Cursor pagination and sorting of GET /cases: (sort field, id) per
+        # advocate (database/keyset_pagination.sql, database/case_sort_indexes.sql)
+        Index('idx_case_keyset_updated', 'advocate_id', 'is_visible', 'updated_at', 'id'),
+        Index('idx_case_keyset_created', 'advocate_id', 'is_visible', 'created_at', 'id'),
+        Index('idx_case_sort_efiling', 'advocate_id', 'is_visible', 'efiling_date', 'id'),
+        Index('idx_case_sort_petitioner', 'advocate_id', 'is_visible', 'petitioner_name', 'id'),
+        Index('idx_case_sort_case_number', 'advocate_id', 'is_visible', 'case_number', 'id'),
+        Index('idx_case_sort_hearing', 'advocate_id', 'is_visible', 'next_hearing_date', 'id'),
+    )
 
 
 class Document(Base):
@@ -224,12 +244,21 @@ class Document(Base):
     lock_reason = Column(String(255), nullable=True)
     locked_at = Column(TIMESTAMP, nullable=True)
     
+    # Extracted PDF text (can be megabytes; only loaded when accessed)
+    extracted_text = deferred(Column(Text, nullable=True))
+    
     # Timestamps
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
     updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     case = relationship("Case", back_populates="documents")
+    
+    # Indexes
+    __table_args__ = (
+        # Cursor pagination, newest first (database/keyset_pagination.sql)
+        Index('idx_doc_keyset_created', 'case_id', 'created_at', 'id'),
+    )
 
 
 class CaseHistory(Base):
@@ -303,6 +332,59 @@ class AIAnalysis(Base):
     advocate = relationship("User", back_populates="ai_analyses")
 
 
+class AdvocateStats(Base):
+    """
+    Per-advocate statistics rollup.
+
+    One row per (dimension, key), e.g. ("case_status", "pending") or
+    ("document_category", "order"). Write paths apply counter deltas in
+    their own transaction; a periodic reconciliation repairs any drift.
+    """
+    __tablename__ = "advocate_stats"
+
+    advocate_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dimension = Column(String(50), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    
+    # Counters
+    count = Column(BigInteger, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    
+    # Timestamp
+    updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AuthSession(Base):
+    """
+    Login session backing a rotating refresh token.
+
+    Only a SHA-256 of the current refresh token secret is stored. Access
+    tokens carry the session id (`sid`); revoked sessions reach request
+    workers through an in-memory denylist, never a per-request lookup.
+    """
+    __tablename__ = "auth_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    
+    # Current refresh token (rotated on every use), and the one it
+    # replaced, accepted again for REFRESH_TOKEN_REUSE_GRACE_SECONDS
+    token_hash = Column(String(64), nullable=False)
+    previous_token_hash = Column(String(64), nullable=True)
+    
+    # Lifecycle
+    created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    rotated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    expires_at = Column(TIMESTAMP, nullable=False)
+    revoked_at = Column(TIMESTAMP, nullable=True)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_auth_session_user', 'user_id'),
+        Index('idx_auth_session_revoked', 'revoked_at', postgresql_where=text('revoked_at IS NOT NULL')),
+    )
+
+
 # ============================================================================
 # Indexes (already created in schema.sql, these are for reference)
 # ============================================================================
@@ -3,7 +3,7 @@ Pydantic validation schemas
 """
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, date
 from uuid import UUID
 
 # ============================================================================
@@ -74,6 +74,9 @@ class UserOut(UserBase):
     class Config:
         from_attributes = True
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -351,13 +354,81 @@ class PaginationMeta(BaseModel):
     per_page: int
     total_pages: int
 
-class CaseListResponse(BaseModel):
-    """Paginated case list response"""
+class CursorPage(BaseModel):
+    """Envelope of every cursor-paginated list (utils.pagination.cursor_page)"""
+    limit: int
+    next_cursor: Optional[str] = None
+
+class CaseListResponse(CursorPage):
+    """
+    Paginated case list response. Cursor pages fill limit/next_cursor;
+    the page-number fields are kept for existing offset clients
+    (deprecated, per_page mirrors limit).
+    """
     items: List[CaseResponse]
+    total: Optional[int] = None
+    page: Optional[int] = None
+    per_page: Optional[int] = None
+    total_pages: Optional[int] = None
+
+class DocumentListResponse(CursorPage):
+    """Cursor-paginated document list response"""
+    items: List[DocumentResponse]
+
+class DocumentSearchHit(BaseModel):
+    """Full-text search match (no document body, just a snippet)"""
+    id: UUID
+    case_id: UUID
+    title: str
+    category: str
+    rank: float
+    snippet: str
+
+class DocumentSearchResponse(CursorPage):
+    """Cursor-paginated document search results"""
+    items: List[DocumentSearchHit]
+
+class CalendarHearing(BaseModel):
+    """One case listed for hearing"""
+    case_id: UUID
+    case_number: Optional[str]
+    efiling_number: str
+    case_type: str
+    petitioner_name: str
+    respondent_name: str
+    court_number: Optional[str]
+    judge_name: Optional[str]
+    status: str
+    next_hearing_date: datetime
+
+class CalendarDay(BaseModel):
+    date: date
+    count: int
+    hearings: List[CalendarHearing]
+
+class CalendarResponse(BaseModel):
+    """Hearings in a date range, grouped by day (days without hearings omitted)"""
+    start: date
+    end: date
     total: int
-    page: int
-    per_page: int
-    total_pages: int
+    days: List[CalendarDay]
+
+
+class AuditEvent(BaseModel):
+    """One audit trail entry"""
+    user_id: str
+    timestamp: str  # Sort key: Unix seconds, fraction unique per event
+    occurred_at: datetime
+    action_type: str
+    severity: Optional[str] = None
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+
+class AuditEventListResponse(CursorPage):
+    """Cursor-paginated audit trail"""
+    items: List[AuditEvent]
+
 # ============================================================================
 # Rebuild models to resolve forward references
 # ============================================================================
@@ -1,24 +1,40 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
 from app.api.v1.api import api_router  # Import the aggregated router
 from app.core.logger import logger
+from app.db.database import engine
+from app.services.audit_service import audit_service
+from app.services.event_broker import event_broker
+from app.services.quota_service import QuotaExceeded
+from app.services.password_service import password_hasher
+from app.services.session_service import refresh_denylist_periodically
+from app.workers.stats_reconciler import reconcile_periodically
 
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Include API router with /api/v1 prefix
 app.include_router(api_router, prefix="/api/v1")
 
+# Rate limiting runs before routing, so rejected requests never touch the
+# database. Added before CORS so 429s still carry CORS headers.
+app.add_middleware(RateLimitMiddleware)
+
 # CORS Configuration - IMPORTANT for SSE
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +46,21 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(QuotaExceeded)
+async def quota_exceeded_handler(request: Request, exc: QuotaExceeded):
+    """Plan limit reached: 402 with the quota details"""
+    return JSONResponse(
+        status_code=status.HTTP_402_PAYMENT_REQUIRED,
+        content={
+            "detail": f"Plan limit reached for {exc.resource}. Upgrade your plan to continue.",
+            "resource": exc.resource,
+            "limit": exc.limit,
+            "used": exc.used,
+            "plan": exc.plan
+        }
+    )
+
+
 @app.get("/")
 def read_root():
     """Root endpoint"""
@@ -46,6 +77,67 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.on_event("startup")
+async def start_event_broker():
+    """Start the LISTEN/NOTIFY feed for SSE subscribers"""
+    event_broker.start(engine)
+
+
+@app.on_event("shutdown")
+async def stop_event_broker():
+    """Stop the LISTEN/NOTIFY feed"""
+    event_broker.stop()
+
+
+@app.on_event("startup")
+async def start_stats_reconciler():
+    """Periodically repair drift in the dashboard stats rollup"""
+    app.state.stats_reconciler = None
+    if settings.STATS_RECONCILE_INTERVAL_SECONDS > 0:
+        app.state.stats_reconciler = asyncio.create_task(
+            reconcile_periodically(settings.STATS_RECONCILE_INTERVAL_SECONDS)
+        )
+
+
+@app.on_event("shutdown")
+async def stop_stats_reconciler():
+    """Stop the stats reconciler"""
+    if app.state.stats_reconciler is not None:
+        app.state.stats_reconciler.cancel()
+
+
+@app.on_event("startup")
+async def start_session_denylist():
+    """Keep the revoked-session denylist current for access-token checks"""
+    app.state.session_denylist = asyncio.create_task(
+        refresh_denylist_periodically(settings.SESSION_DENYLIST_REFRESH_SECONDS)
+    )
+
+
+@app.on_event("shutdown")
+async def stop_session_denylist():
+    """Stop the denylist refresher"""
+    app.state.session_denylist.cancel()
+
+
+@app.on_event("startup")
+async def start_audit_writer():
+    """Open the audit spool and start shipping it to DynamoDB"""
+    audit_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_audit_writer():
+    """Seal the audit spool and ship what is pending"""
+    await asyncio.to_thread(audit_service.stop)
+
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    """Stop the password hashing executor"""
+    password_hasher.shutdown()
+
+
 # @app.on_event("startup")
 # async def startup_event():
 #     """Run on application startup"""
@@ -1,7 +1,6 @@
 """
 AI Service using AWS Bedrock (Claude)
 """
-import boto3
 import json
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
@@ -11,7 +10,9 @@ import pypdf
 from io import BytesIO
 
 from app.db.models import AIAnalysis, Document, Case
-from app.core.config import settings
+from app.core.aws import aws_clients
+from app.services.event_broker import event_broker
+from app.services.usage_service import usage_meter
 
 # Simple logger (replace with app.core.logger if it exists)
 import logging
@@ -24,18 +25,8 @@ class AIService:
     """
     
     def __init__(self):
-        self.bedrock_client = boto3.client(
-            'bedrock-runtime',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
-        self.s3_client = boto3.client(
-            's3',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
+        self.bedrock_client = aws_clients.client('bedrock-runtime')
+        self.s3_client = aws_clients.client('s3')
         self.model_id = "anthropic.claude-3-5-sonnet-20241022-v2:0"
     
     def analyze_case(self, case_id: str, advocate_id: str, db: Session):
@@ -101,8 +92,17 @@ class AIService:
             analysis.processing_time_seconds = int((end_time - start_time).total_seconds())
             analysis.token_count = analysis_result.get("_meta", {}).get("token_count", 0)
             
+            event_broker.publish(db, advocate_id, "analysis_completed", {
+                "case_id": str(case_id),
+                "analysis_id": str(analysis.id),
+                "urgency_level": analysis.urgency_level
+            })
+            
             db.commit()
             
+            # Billing usage counts completed analyses
+            usage_meter.invalidate(advocate_id)
+            
             logger.info(f"AI analysis completed for case {case_id}")
             return analysis
             
@@ -0,0 +1,226 @@
+# app/services/audit_events.py
+"""
+Typed audit events.
+
+Sort key: the table's range key stays `timestamp` (Number, Unix
+seconds) so existing items and queries keep working. New events add a
+fractional part that makes the key unique and monotonic:
+
+    <seconds>.<milliseconds:3><node:5><sequence:6>
+
+`node` is random per process and `sequence` counts events within a
+millisecond. Two events from the same user in the same second no longer
+overwrite each other. The wall clock is read once per event;
+`timestamp_iso` and `ttl` are derived from the same reading.
+
+Retention, severity and durability are per action, in AUDIT_POLICIES.
+
+An event is encoded once, straight to DynamoDB's wire format (JSON
+attribute values). That line goes into the spool unchanged and
+AuditWriter sends it in BatchWriteItem as is, with no re-serialization.
+"""
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+DAY_SECONDS = 24 * 3600
+
+
+class AuditAction(str, Enum):
+    IDENTITY_MISMATCH = "IDENTITY_MISMATCH"
+    IDENTITY_VERIFIED = "IDENTITY_VERIFIED"
+    CASE_SYNC = "CASE_SYNC"
+    DOCUMENT_SYNC = "DOCUMENT_SYNC"
+    DOCUMENT_ACCESS = "DOCUMENT_ACCESS"
+    ANALYSIS_ACCESS = "ANALYSIS_ACCESS"
+    BATCH_SYNC = "BATCH_SYNC"
+    DOCUMENT_DELETION = "DOCUMENT_DELETION"
+    CASE_TRANSFER = "CASE_TRANSFER"
+    ANALYSIS_FEEDBACK = "ANALYSIS_FEEDBACK"
+
+
+@dataclass(frozen=True)
+class AuditPolicy:
+    retention_days: int
+    severity: Optional[str] = None
+    durable: bool = False  # log_* waits for the spool fsync (compliance events)
+
+
+AUDIT_POLICIES: Dict[AuditAction, AuditPolicy] = {
+    AuditAction.IDENTITY_MISMATCH: AuditPolicy(3 * 365, severity="CRITICAL", durable=True),
+    AuditAction.IDENTITY_VERIFIED: AuditPolicy(90, severity="INFO"),
+    AuditAction.CASE_SYNC: AuditPolicy(365),
+    AuditAction.DOCUMENT_SYNC: AuditPolicy(365),
+    AuditAction.DOCUMENT_ACCESS: AuditPolicy(365),
+    AuditAction.ANALYSIS_ACCESS: AuditPolicy(365),
+    AuditAction.BATCH_SYNC: AuditPolicy(365),
+    AuditAction.DOCUMENT_DELETION: AuditPolicy(3 * 365, severity="HIGH", durable=True),
+    AuditAction.CASE_TRANSFER: AuditPolicy(3 * 365, durable=True),
+    AuditAction.ANALYSIS_FEEDBACK: AuditPolicy(365),
+}
+
+
+# ============================================================================
+# Sort keys
+# ============================================================================
+
+# Digits after the milliseconds: node + sequence
+_NODE_DIGITS = 5
+_SEQUENCE_DIGITS = 6
+_MAX_SEQUENCE = 10 ** _SEQUENCE_DIGITS - 1
+
+
+class SortKeyGenerator:
+    """
+    Monotonic, collision-free `timestamp` values for this process. If the
+    clock steps back, or a millisecond runs out of sequence numbers, keys
+    continue from the last millisecond used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._node = 0
+        self._last_ms = 0
+        self._sequence = 0
+
+    def next(self) -> Tuple[Decimal, int]:
+        """A new sort key and the epoch milliseconds it encodes"""
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if self._pid != os.getpid():
+                # New process (including a fork): new node id
+                self._pid = os.getpid()
+                self._node = random.randrange(10 ** _NODE_DIGITS)
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            elif self._sequence < _MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_ms += 1
+                self._sequence = 0
+            ms, node, sequence = self._last_ms, self._node, self._sequence
+
+        key = Decimal(f"{ms // 1000}.{ms % 1000:03d}{node:0{_NODE_DIGITS}d}{sequence:0{_SEQUENCE_DIGITS}d}")
+        return key, ms
+
+
+sort_keys = SortKeyGenerator()
+
+
+def sort_key_bound(moment: datetime, upper: bool = False) -> Decimal:
+    """
+    `timestamp` bound for a query range at millisecond precision. Upper
+    bounds include every key in that millisecond.
+    """
+    ms = int(moment.timestamp() * 1000)
+    suffix = "9" * (_NODE_DIGITS + _SEQUENCE_DIGITS) if upper else ""
+    return Decimal(f"{ms // 1000}.{ms % 1000:03d}{suffix}")
+
+
+def sort_key_time(key: Decimal) -> datetime:
+    """When the event with this `timestamp` happened (UTC)"""
+    return datetime.fromtimestamp(float(key), tz=timezone.utc)
+
+
+# ============================================================================
+# Events
+# ============================================================================
+
+@dataclass(frozen=True)
+class AuditEvent:
+    user_id: str
+    action: AuditAction
+    timestamp: Decimal
+    occurred_ms: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        user_id,
+        action: AuditAction,
+        metadata: Optional[Dict[str, Any]] = None,
+        resource_type: Optional[str] = None,
+        resource_id=None
+    ) -> "AuditEvent":
+        timestamp, occurred_ms = sort_keys.next()
+        return cls(
+            user_id=str(user_id),
+            action=action,
+            timestamp=timestamp,
+            occurred_ms=occurred_ms,
+            metadata=metadata or {},
+            resource_type=resource_type,
+            resource_id=str(resource_id) if resource_id is not None else None
+        )
+
+    @property
+    def policy(self) -> AuditPolicy:
+        return AUDIT_POLICIES[self.action]
+
+    def to_attributes(self) -> Dict[str, Dict[str, Any]]:
+        """The DynamoDB item, as AttributeValues"""
+        occurred_at = datetime.fromtimestamp(self.occurred_ms / 1000, tz=timezone.utc)
+        expires = self.occurred_ms // 1000 + self.policy.retention_days * DAY_SECONDS
+        item = {
+            "user_id": {"S": self.user_id},
+            "timestamp": {"N": str(self.timestamp)},
+            "action_type": {"S": self.action.value},
+            "user_action": {"S": f"{self.user_id}#{self.action.value}"},
+            "metadata": to_attribute({
+                **self.metadata,
+                "timestamp_iso": occurred_at.replace(tzinfo=None).isoformat()
+            }),
+            "ttl": {"N": str(expires)}
+        }
+        if self.policy.severity:
+            item["severity"] = {"S": self.policy.severity}
+        if self.resource_type:
+            item["resource_type"] = {"S": self.resource_type}
+            item["resource_id"] = {"S": self.resource_id}
+        return item
+
+    def encode(self) -> bytes:
+        """One spool line; shipped to DynamoDB without re-encoding"""
+        return (json.dumps(self.to_attributes(), separators=(",", ":")) + "\n").encode()
+
+
+def to_attribute(value: Any) -> Dict[str, Any]:
+    """A Python value as a DynamoDB AttributeValue"""
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, float):
+        return {"N": repr(value)}
+    if isinstance(value, dict):
+        return {"M": {str(key): to_attribute(inner) for key, inner in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attribute(inner) for inner in value]}
+    return {"S": str(value)}
+
+
+def decode_line(line: bytes) -> Dict[str, Dict[str, Any]]:
+    """
+    AttributeValues from a spool line. Lines spooled before events were
+    encoded to wire format (plain items) are converted.
+    """
+    item = json.loads(line)
+    if not isinstance(item, dict):
+        raise ValueError("Not an audit item")
+    if not isinstance(item.get("user_id"), dict):
+        item = {name: to_attribute(value) for name, value in item.items()}
+    return item
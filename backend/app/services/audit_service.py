@@ -1,27 +1,137 @@
 # app/services/audit_service.py
 
-import boto3
+import asyncio
+from boto3.dynamodb.conditions import Key
 from datetime import datetime
-from typing import Dict, Any
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from app.core.aws import aws_clients
 from app.core.config import settings
 from app.core.logger import logger
+from app.services.audit_events import AuditAction, AuditEvent, sort_key_bound, sort_key_time
+from app.services.audit_spool import AuditSpool
+from app.services.audit_writer import AuditWriter
 
 class AuditService:
     """
     Service for audit trail logging (DPDPA compliance).
     Uses DynamoDB for high-velocity audit logs.
+    
+    log_* calls append the event to a local spool file (AuditSpool) and
+    never wait on DynamoDB; AuditWriter ships the spool in batches in
+    the background (start()/stop() with the app).
+    
+    Reads query the (user_id, timestamp) key; with an action_type they
+    go through the DYNAMODB_ACTION_INDEX_NAME GSI, keyed on
+    (user_action, timestamp) where user_action is "<user_id>#<action_type>".
+    Items written before user_action was added are not in that index, so
+    filtered reads start at the first event that carries it; unfiltered
+    reads see everything.
     """
     
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table('lawmate-activity-trail')
+        self.dynamodb = aws_clients.resource('dynamodb')
+        self.table = self.dynamodb.Table(settings.DYNAMODB_TABLE_NAME)
+        self.spool = AuditSpool()
+        self.writer = AuditWriter(self.table, self.spool)
+    
+    def start(self):
+        self.spool.open()
+        self.writer.start()
+    
+    def stop(self):
+        # Seal the active segment first so the writer's last pass ships it,
+        # then release the spool directory (removed if nothing is left)
+        self.spool.seal()
+        self.writer.stop()
+        self.spool.close()
+    
+    async def _record(self, event: AuditEvent):
+        """
+        Spool an event. Durable actions (see AUDIT_POLICIES) wait for the
+        spool fsync (local disk only); the rest return after a buffered write.
+        """
+        try:
+            seq = self.spool.append(event)
+            if event.policy.durable and seq and not await asyncio.to_thread(self.spool.wait_durable, seq):
+                logger.error(f"Audit spool fsync timed out for {event.action.value} event of user {event.user_id}")
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Error spooling {event.action.value} audit event: {str(e)}")
+    
+    # ============================================================================
+    # Queries
+    # ============================================================================
+    
+    def query_events(
+        self,
+        user_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        action_type: Optional[str] = None,
+        newest_first: bool = True,
+        limit: int = 50,
+        start_key: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        One page of a user's events in [start, end], optionally of one
+        action type. Returns the items and the LastEvaluatedKey to resume
+        from (None when the range is exhausted).
+        """
+        params = {
+            'KeyConditionExpression': self._key_condition(user_id, action_type, start, end),
+            'ScanIndexForward': not newest_first,
+            'Limit': limit
+        }
+        if action_type:
+            params['IndexName'] = settings.DYNAMODB_ACTION_INDEX_NAME
+        if start_key:
+            params['ExclusiveStartKey'] = start_key
+        
+        response = self.table.query(**params)
+        items = [_event_view(item) for item in response.get('Items', [])]
+        return items, response.get('LastEvaluatedKey')
+    
+    def iter_events(
+        self,
+        user_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        action_type: Optional[str] = None,
+        newest_first: bool = True,
+        page_size: int = settings.AUDIT_EXPORT_PAGE_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """Every matching event, fetched one page at a time"""
+        start_key = None
+        while True:
+            items, start_key = self.query_events(
+                user_id, start, end, action_type, newest_first, page_size, start_key
+            )
+            yield from items
+            if not start_key:
+                return
+    
+    @staticmethod
+    def _key_condition(
+        user_id: str,
+        action_type: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ):
+        if action_type:
+            condition = Key('user_action').eq(f"{user_id}#{action_type}")
+        else:
+            condition = Key('user_id').eq(user_id)
+        
+        timestamp = Key('timestamp')
+        if start and end:
+            return condition & timestamp.between(sort_key_bound(start), sort_key_bound(end, upper=True))
+        if start:
+            return condition & timestamp.gte(sort_key_bound(start))
+        if end:
+            return condition & timestamp.lte(sort_key_bound(end, upper=True))
+        return condition
     
     async def log_identity_mismatch(
         self,
@@ -33,24 +143,11 @@ class AuditService:
         """
         Log identity mismatch event (CRITICAL security event).
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'IDENTITY_MISMATCH',
-                'severity': 'CRITICAL',
-                'metadata': {
-                    'scraped_khc_id': scraped_khc_id,
-                    'registered_khc_id': registered_khc_id,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
-            logger.warning(f"Identity mismatch logged for user {user_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to log identity mismatch: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.IDENTITY_MISMATCH,
+            {'scraped_khc_id': scraped_khc_id, 'registered_khc_id': registered_khc_id}
+        ))
+        logger.warning(f"Identity mismatch logged for user {user_id}")
     
     async def log_identity_verified(
         self,
@@ -61,21 +158,7 @@ class AuditService:
         """
         Log successful identity verification.
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'IDENTITY_VERIFIED',
-                'severity': 'INFO',
-                'metadata': {
-                    'khc_id': khc_id,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (90 * 24 * 3600)  # 90 days
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log identity verification: {str(e)}")
+        await self._record(AuditEvent.create(user_id, AuditAction.IDENTITY_VERIFIED, {'khc_id': khc_id}))
     
     async def log_case_sync(
         self,
@@ -87,22 +170,10 @@ class AuditService:
         """
         Log case sync activity.
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'CASE_SYNC',
-                'resource_type': 'Case',
-                'resource_id': case_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)  # 1 year
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log case sync: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.CASE_SYNC, {'action': action},
+            resource_type='Case', resource_id=case_id
+        ))
     
     async def log_document_sync(
         self,
@@ -114,22 +185,10 @@ class AuditService:
         """
         Log document sync activity.
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_SYNC',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log document sync: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.DOCUMENT_SYNC, {'action': action},
+            resource_type='Document', resource_id=document_id
+        ))
     
     async def log_document_access(
         self,
@@ -141,22 +200,10 @@ class AuditService:
         """
         Log document access (viewed/downloaded).
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_ACCESS',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log document access: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.DOCUMENT_ACCESS, {'action': action},
+            resource_type='Document', resource_id=document_id
+        ))
     
     async def log_analysis_access(
         self,
@@ -167,21 +214,10 @@ class AuditService:
         """
         Log AI analysis access.
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'ANALYSIS_ACCESS',
-                'resource_type': 'AIAnalysis',
-                'resource_id': analysis_id,
-                'metadata': {
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log analysis access: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.ANALYSIS_ACCESS,
+            resource_type='AIAnalysis', resource_id=analysis_id
+        ))
     
     async def log_batch_sync(
         self,
@@ -194,22 +230,10 @@ class AuditService:
         """
         Log batch sync operation.
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'BATCH_SYNC',
-                'metadata': {
-                    'sync_id': sync_id,
-                    'synced_cases': synced_cases,
-                    'failed_cases': failed_cases,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log batch sync: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.BATCH_SYNC,
+            {'sync_id': sync_id, 'synced_cases': synced_cases, 'failed_cases': failed_cases}
+        ))
 
     async def log_document_deletion(
         self,
@@ -221,23 +245,10 @@ class AuditService:
         """
         Log document deletion (critical for compliance).
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_DELETION',
-                'severity': 'HIGH',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'permanent': permanent,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log document deletion: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.DOCUMENT_DELETION, {'permanent': permanent},
+            resource_type='Document', resource_id=document_id
+        ))
     
     async def log_case_transfer(
         self,
@@ -249,22 +260,10 @@ class AuditService:
         """
         Log case transfer (vakalath change).
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'CASE_TRANSFER',
-                'resource_type': 'Case',
-                'resource_id': case_id,
-                'metadata': {
-                    'reason': reason,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log case transfer: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.CASE_TRANSFER, {'reason': reason},
+            resource_type='Case', resource_id=case_id
+        ))
     
     async def log_analysis_feedback(
         self,
@@ -276,22 +275,27 @@ class AuditService:
         """
         Log AI analysis feedback (for quality improvement).
         """
-        try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'ANALYSIS_FEEDBACK',
-                'resource_type': 'AIAnalysis',
-                'resource_id': analysis_id,
-                'metadata': {
-                    'rating': rating,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to log analysis feedback: {str(e)}")
+        await self._record(AuditEvent.create(
+            user_id, AuditAction.ANALYSIS_FEEDBACK, {'rating': rating},
+            resource_type='AIAnalysis', resource_id=analysis_id
+        ))
+
+def _event_view(item: Dict[str, Any]) -> Dict[str, Any]:
+    """A queried item for the API: the sort key as a string (JS-safe) plus its time"""
+    view = _plain(item)
+    view['timestamp'] = str(item['timestamp'])
+    view['occurred_at'] = sort_key_time(item['timestamp'])
+    return view
+
+def _plain(value):
+    """DynamoDB item with Decimal numbers turned into int/float"""
+    if isinstance(value, Decimal):
+        return int(value) if value % 1 == 0 else float(value)
+    if isinstance(value, dict):
+        return {key: _plain(inner) for key, inner in value.items()}
+    if isinstance(value, list):
+        return [_plain(inner) for inner in value]
+    return value
 
 # Singleton instance
 audit_service = AuditService()
\ No newline at end of file
@@ -0,0 +1,372 @@
+# app/services/audit_spool.py
+"""
+Append-only local spool for audit events.
+
+Every audit event is appended to the active segment file, as the JSON
+line from `AuditEvent.encode`, before `log_*` returns. Writes are
+buffered. A sync thread fsyncs the active segment every
+AUDIT_SPOOL_FSYNC_INTERVAL_MS (group commit). The fsyncs run outside
+the lock that `append` takes, so an append never waits for the disk.
+Compliance-critical events wait for that fsync, which is local disk,
+never a remote call. Other events return straight after the buffered
+write.
+
+A segment is sealed (fsynced, closed and renamed *.active -> *.sealed)
+when it reaches AUDIT_SPOOL_SEGMENT_BYTES or AUDIT_FLUSH_INTERVAL_SECONDS
+of age. AuditWriter ships sealed segments to DynamoDB and deletes them
+once every item is written.
+
+Each process spools into its own directory under AUDIT_SPOOL_DIR and
+holds an flock on it. The directory is created and locked under a
+hidden temporary name and only then renamed into place, so it is never
+visible unlocked. A directory whose lock can be taken belongs to a
+process that died. It is adopted: its active segment is sealed (a torn
+last line is skipped when read) and drained like any other, so events
+survive crashes as well as DynamoDB outages. Directories without
+segments are removed, both on a clean close and on adoption.
+
+Segments that DynamoDB keeps rejecting are moved to QUARANTINE_DIR
+under the root. They are kept for inspection and replay, not shipped.
+"""
+import fcntl
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.audit_events import AuditEvent, decode_line
+
+ACTIVE_SUFFIX = ".active"
+SEALED_SUFFIX = ".sealed"
+LOCK_FILE = "lock"
+QUARANTINE_DIR = "quarantine"
+
+
+class AuditSpool:
+    """
+    Segmented, fsync-batched audit log on local disk.
+    """
+
+    def __init__(
+        self,
+        root: str = settings.AUDIT_SPOOL_DIR,
+        segment_bytes: int = settings.AUDIT_SPOOL_SEGMENT_BYTES,
+        segment_seconds: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        fsync_interval: float = settings.AUDIT_SPOOL_FSYNC_INTERVAL_MS / 1000,
+        max_bytes: int = settings.AUDIT_SPOOL_MAX_BYTES
+    ):
+        self.root = Path(root)
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+
+        self._dir: Optional[Path] = None
+        self._lock_fd: Optional[int] = None
+        self._adopted: Dict[Path, int] = {}  # Directory -> its lock fd
+        self._file = None
+        self._segment_path: Optional[Path] = None
+        self._segment_size = 0
+        self._segment_opened = 0.0
+        self._segment_number = 0
+        self._sealed_bytes = 0
+
+        # Segments rotated out by `append`, waiting for the sync thread to
+        # fsync, close and seal them
+        self._retiring: List[Tuple[BinaryIO, Path]] = []
+
+        self._lock = threading.Lock()  # Append state; never held across an fsync
+        self._sync_lock = threading.Lock()  # One sync pass at a time
+        self._synced = threading.Condition(self._lock)
+        self._written_seq = 0
+        self._synced_seq = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def open(self):
+        """Claim a spool directory, adopt orphaned ones, start the sync thread"""
+        if self._dir is not None:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._adopt_orphans()
+
+        name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        staging = self.root / f".{name}"
+        staging.mkdir()
+        self._lock_fd = os.open(staging / LOCK_FILE, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._dir = self.root / name
+        os.rename(staging, self._dir)
+        self._fsync_directory(self.root)
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-spool-sync", daemon=True)
+        self._thread.start()
+
+    def seal(self):
+        """Seal the active segment now, so a final drain can ship it"""
+        self._sync(seal_active=True)
+
+    def close(self):
+        """
+        Stop syncing, seal the active segment and release the directory.
+        A directory with unshipped segments is left for the next process
+        to adopt; an empty one is removed.
+        """
+        if self._dir is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._sync(seal_active=True)
+        with self._lock:
+            directory, lock_fd = self._dir, self._lock_fd
+            self._dir = self._lock_fd = None
+
+        if self._has_segments(directory):
+            os.close(lock_fd)
+        else:
+            self._remove_directory(directory, lock_fd)
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def append(self, event: AuditEvent) -> int:
+        """
+        Append one event (buffered, not yet fsynced). Returns its sequence
+        number for `wait_durable`, or 0 if it was not spooled.
+        """
+        line = event.encode()
+
+        with self._lock:
+            if self._dir is None:
+                raise RuntimeError("Audit spool is not open")
+            if not event.policy.durable and self._sealed_bytes + self._segment_size >= self.max_bytes:
+                logger.error(f"Audit spool full, dropping {event.action.value} event")
+                return 0
+
+            if self._file is None:
+                self._open_segment()
+            self._file.write(line)
+            self._segment_size += len(line)
+            self._written_seq += 1
+            seq = self._written_seq
+
+            if self._segment_size >= self.segment_bytes:
+                self._rotate()
+            return seq
+
+    def wait_durable(self, seq: int, timeout: float = 5.0) -> bool:
+        """Block until event `seq` is fsynced (group commit)"""
+        deadline = time.monotonic() + timeout
+        with self._synced:
+            while self._synced_seq < seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._synced.wait(remaining)
+        return True
+
+    # ------------------------------------------------------------------
+    # Drain side
+    # ------------------------------------------------------------------
+
+    def sealed_segments(self) -> List[Path]:
+        """Sealed segments of this process and adopted ones, oldest first"""
+        directories = list(self._adopted)
+        if self._dir is not None:
+            directories.append(self._dir)
+        segments = [
+            path
+            for directory in directories
+            for path in directory.glob(f"*{SEALED_SUFFIX}")
+        ]
+        return sorted(segments, key=lambda path: path.name)
+
+    @staticmethod
+    def read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Items (as AttributeValues) in a segment; a torn or corrupt line is
+        logged and skipped
+        """
+        with open(path, "rb") as segment:
+            for number, line in enumerate(segment, 1):
+                try:
+                    yield decode_line(line)
+                except ValueError:
+                    logger.error(f"Skipping unreadable audit spool line {path.name}:{number}")
+
+    def remove_segment(self, path: Path):
+        """Delete a fully shipped segment"""
+        size = path.stat().st_size
+        path.unlink()
+        self._segment_gone(path, size)
+
+    def quarantine_segment(self, path: Path) -> Path:
+        """Move a segment that can't be shipped out of the drain; returns its new path"""
+        quarantine = self.root / QUARANTINE_DIR
+        quarantine.mkdir(exist_ok=True)
+        size = path.stat().st_size
+        # Segment names are only unique within their directory
+        target = quarantine / f"{path.parent.name}-{path.name}"
+        os.rename(path, target)
+        self._fsync_directory(quarantine)
+        self._segment_gone(path, size)
+        return target
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending_bytes": self._sealed_bytes + self._segment_size,
+                "spooled": self._written_seq,
+                "synced": self._synced_seq,
+                "adopted_directories": len(self._adopted)
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (called with self._lock held unless noted)
+    # ------------------------------------------------------------------
+
+    def _open_segment(self):
+        self._segment_number += 1
+        # Time-ordered names so segments drain in write order
+        name = f"{time.time_ns():020d}-{self._segment_number:06d}"
+        self._segment_path = self._dir / f"{name}{ACTIVE_SUFFIX}"
+        self._file = open(self._segment_path, "ab")
+        self._segment_size = 0
+        self._segment_opened = time.monotonic()
+
+    def _rotate(self):
+        """Hand the active segment to the sync thread; the next append opens a new one"""
+        if self._file is None:
+            return
+        self._retiring.append((self._file, self._segment_path))
+        self._sealed_bytes += self._segment_size
+        self._file = None
+        self._segment_path = None
+        self._segment_size = 0
+
+    def _sync(self, seal_active: bool = False):
+        """
+        One group commit (not called with self._lock held): fsync what was
+        written so far and seal rotated segments. The append lock is held
+        only to take the work; fsync and rename run without it.
+        """
+        with self._sync_lock:
+            with self._lock:
+                if self._file is not None and (
+                    seal_active or time.monotonic() - self._segment_opened >= self.segment_seconds
+                ):
+                    self._rotate()
+                retiring, self._retiring = self._retiring, []
+                active = self._file
+                if active is not None:
+                    active.flush()  # To the page cache only
+                target = self._written_seq
+
+            try:
+                while retiring:
+                    segment, path = retiring[0]
+                    segment.flush()
+                    os.fsync(segment.fileno())
+                    segment.close()
+                    os.rename(path, path.with_suffix(SEALED_SUFFIX))
+                    self._fsync_directory(path.parent)
+                    retiring.pop(0)
+                if active is not None:
+                    os.fsync(active.fileno())
+            except OSError:
+                with self._lock:
+                    # Retry the unsealed segments on the next pass
+                    self._retiring[:0] = [entry for entry in retiring if not entry[0].closed]
+                raise
+
+            with self._lock:
+                self._synced_seq = max(self._synced_seq, target)
+                self._synced.notify_all()
+
+    def _segment_gone(self, path: Path, size: int):
+        """Account for a sealed segment leaving the drain (not called with self._lock held)"""
+        with self._lock:
+            self._sealed_bytes = max(0, self._sealed_bytes - size)
+
+        # An adopted directory is done once its last segment is gone
+        directory = path.parent
+        if directory in self._adopted and not self._has_segments(directory):
+            self._remove_directory(directory, self._adopted.pop(directory))
+
+    @staticmethod
+    def _has_segments(directory: Path) -> bool:
+        return any(
+            path.suffix in (ACTIVE_SUFFIX, SEALED_SUFFIX)
+            for path in directory.iterdir()
+        )
+
+    @staticmethod
+    def _remove_directory(directory: Path, lock_fd: int):
+        """Delete an empty spool directory, then drop its lock"""
+        try:
+            for leftover in directory.iterdir():
+                leftover.unlink()
+            directory.rmdir()
+        except OSError as e:
+            logger.warning(f"Could not remove audit spool {directory.name}: {str(e)}")
+        finally:
+            os.close(lock_fd)
+
+    @staticmethod
+    def _fsync_directory(directory: Path):
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _adopt_orphans(self):
+        """Take over directories left by processes that exited (not locked)"""
+        for directory in self.root.iterdir():
+            # Hidden names are directories still being created
+            if (
+                directory.name.startswith(".")
+                or directory.name == QUARANTINE_DIR
+                or not directory.is_dir()
+                or directory in self._adopted
+            ):
+                continue
+            try:
+                lock_fd = os.open(directory / LOCK_FILE, os.O_RDWR)
+            except FileNotFoundError:
+                continue  # Being removed by its owner
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(lock_fd)  # Live process
+                continue
+
+            if not self._has_segments(directory):
+                self._remove_directory(directory, lock_fd)
+                continue
+
+            # Keep the lock so no other process adopts the same directory
+            for active in directory.glob(f"*{ACTIVE_SUFFIX}"):
+                os.rename(active, active.with_suffix(SEALED_SUFFIX))
+            self._fsync_directory(directory)
+            self._sealed_bytes += sum(path.stat().st_size for path in directory.glob(f"*{SEALED_SUFFIX}"))
+            self._adopted[directory] = lock_fd
+            logger.info(f"Adopted audit spool {directory.name}")
+
+    def _run(self):
+        """Sync thread: group-commit fsyncs and age-based segment sealing"""
+        while not self._stopping.wait(self.fsync_interval):
+            try:
+                self._sync()
+            except OSError as e:
+                logger.error(f"Audit spool sync failed: {str(e)}")
@@ -0,0 +1,193 @@
+# app/services/audit_writer.py
+"""
+Ships spooled audit events to the DynamoDB audit table.
+
+Events are made durable by AuditSpool (app/services/audit_spool.py);
+this is the drainer. A background thread picks up sealed segments,
+oldest first, and sends them with BatchWriteItem in groups of up to 25
+items (its limit). Spooled items are already DynamoDB AttributeValues
+(AuditEvent.encode), so they go to the low-level client unchanged.
+UnprocessedItems are re-sent with backoff. A segment is deleted only
+after every item in it is written. If a group fails, the segment stays
+on disk and is retried with backoff. Later segments still ship, so one
+bad segment doesn't hold up the rest.
+
+A segment that fails AUDIT_SEGMENT_MAX_ATTEMPTS times is quarantined
+(AuditSpool.quarantine_segment), e.g. a poison item DynamoDB rejects. A
+failure only counts when the table is evidently reachable: another
+segment shipped in the same pass, or DynamoDB rejected the request
+itself. An outage therefore quarantines nothing.
+
+Delivery is at-least-once: after a crash mid-segment the whole segment
+is sent again. Re-putting an item with the same key is harmless.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.audit_spool import AuditSpool
+
+# BatchWriteItem accepts at most 25 put requests
+MAX_BATCH_ITEMS = 25
+
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+# Re-sends of UnprocessedItems within one group before it counts as failed
+MAX_UNPROCESSED_ATTEMPTS = 5
+
+# Errors about the request itself: retrying the same items can't succeed
+REJECTED_ERROR_CODES = {"ValidationException", "SerializationException"}
+
+
+class AuditWriter:
+    """
+    Background drainer from the local spool to DynamoDB.
+    """
+
+    def __init__(
+        self,
+        table,
+        spool: AuditSpool,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        poll_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        max_attempts: int = settings.AUDIT_SEGMENT_MAX_ATTEMPTS
+    ):
+        self.table = table
+        self.spool = spool
+        self.batch_size = min(batch_size, MAX_BATCH_ITEMS)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._attempts: Dict[Path, int] = {}  # Failed shipments per segment
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._written = 0
+        self._segments = 0
+        self._failures = 0
+        self._quarantined = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop draining after one last pass. Whatever is left stays in the
+        spool and is shipped by the next process.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self) -> int:
+        """
+        Ship every sealed segment now. Returns the number of items
+        written; raises the first failure once every segment was tried.
+        """
+        written = 0
+        shipped = False
+        failed = []
+        for segment in self.spool.sealed_segments():
+            try:
+                written += self._ship(segment)
+            except Exception as e:
+                failed.append((segment, e))
+                continue
+            self.spool.remove_segment(segment)
+            self._attempts.pop(segment, None)
+            shipped = True
+            with self._lock:
+                self._segments += 1
+
+        for segment, error in failed:
+            if shipped or _rejected(error):
+                self._count_failure(segment, error)
+        if failed:
+            raise failed[0][1]
+        return written
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "written": self._written,
+                "segments_shipped": self._segments,
+                "failed_batches": self._failures,
+                "segments_quarantined": self._quarantined,
+                **self.spool.metrics()
+            }
+
+    def _ship(self, segment) -> int:
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for item in self.spool.read_segment(segment):
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+            written += len(batch)
+        return written
+
+    def _count_failure(self, segment: Path, error: Exception):
+        attempts = self._attempts.get(segment, 0) + 1
+        if attempts < self.max_attempts:
+            self._attempts[segment] = attempts
+            return
+
+        self._attempts.pop(segment, None)
+        target = self.spool.quarantine_segment(segment)
+        with self._lock:
+            self._quarantined += 1
+        logger.error(f"Quarantined audit segment {target} after {attempts} failed attempts: {str(error)}")
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        client = self.table.meta.client
+        # BatchWriteItem rejects a request that puts the same key twice
+        # (a segment re-spooled after a crash); the last copy wins
+        items = {(item["user_id"]["S"], item["timestamp"]["N"]): item for item in batch}
+        requests = {self.table.name: [{"PutRequest": {"Item": item}} for item in items.values()]}
+
+        for attempt in range(MAX_UNPROCESSED_ATTEMPTS):
+            requests = client.batch_write_item(RequestItems=requests).get("UnprocessedItems")
+            if not requests:
+                break
+            time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        else:
+            raise RuntimeError(f"{len(requests[self.table.name])} audit items still unprocessed")
+
+        with self._lock:
+            self._written += len(batch)
+
+    def _run(self):
+        delay = 0.0
+        while True:
+            stopping = self._stopping.wait(timeout=delay or self.poll_interval)
+
+            try:
+                self.flush()
+                delay = 0.0
+            except Exception as e:
+                with self._lock:
+                    self._failures += 1
+                delay = min(max(delay * 2, 1.0), MAX_RETRY_DELAY_SECONDS)
+                logger.error(f"Audit drain failed, retrying in {delay:.0f}s: {str(e)}")
+
+            if stopping:
+                return
+
+
+def _rejected(error: Exception) -> bool:
+    """Whether DynamoDB refused the request itself (not throttling or an outage)"""
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in REJECTED_ERROR_CODES
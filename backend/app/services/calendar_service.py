@@ -0,0 +1,260 @@
+# app/services/calendar_service.py
+"""
+Hearing calendar: date-range queries grouped by day, and a per-advocate
+iCalendar feed.
+
+Every query here filters on `is_visible AND next_hearing_date IS NOT NULL`,
+the predicate of the partial index idx_case_hearing_calendar
+(database/hearing_calendar.sql). Without it the planner cannot use the
+index.
+
+The feed keeps one rendered VEVENT per case in memory. Each request
+first fetches the advocate's cases updated since the previous refresh
+and re-renders or drops only those events. A changed hearing date
+therefore costs one row, not a rebuild of the whole calendar.
+"""
+import hashlib
+import hmac
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Case
+from app.utils.http_cache import make_etag
+
+HEARING_COLUMNS = (
+    Case.id.label("case_id"),
+    Case.case_number,
+    Case.efiling_number,
+    Case.case_type,
+    Case.petitioner_name,
+    Case.respondent_name,
+    Case.court_number,
+    Case.judge_name,
+    Case.status,
+    Case.next_hearing_date
+)
+
+
+def _on_calendar(advocate_id) -> List[Any]:
+    """Filters matching the partial index predicate"""
+    return [
+        Case.advocate_id == advocate_id,
+        Case.is_visible == True,
+        Case.next_hearing_date.isnot(None)
+    ]
+
+
+def day_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """[start 00:00, day after end 00:00) for an inclusive date range"""
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def get_hearings(db: Session, advocate_id, start: datetime, end: datetime) -> List[Any]:
+    """Hearings in [start, end), earliest first"""
+    return db.query(*HEARING_COLUMNS).filter(
+        *_on_calendar(advocate_id),
+        Case.next_hearing_date >= start,
+        Case.next_hearing_date < end
+    ).order_by(Case.next_hearing_date.asc(), Case.id.asc()).all()
+
+
+def hearing_count(advocate_id, start: datetime, end: datetime):
+    """
+    Scalar subquery counting hearings in [start, end), answered from the
+    index alone. Select it alongside another query to save a round trip.
+    """
+    return select(func.count()).where(
+        *_on_calendar(advocate_id),
+        Case.next_hearing_date >= start,
+        Case.next_hearing_date < end
+    ).scalar_subquery()
+
+
+def group_by_day(rows: List[Any]) -> List[Dict[str, Any]]:
+    """Group hearing rows (ordered by date) into calendar days"""
+    days = []
+    for day, day_rows in groupby(rows, key=lambda row: row.next_hearing_date.date()):
+        hearings = [
+            {**row._asdict(), "status": getattr(row.status, "value", row.status)}
+            for row in day_rows
+        ]
+        days.append({"date": day, "count": len(hearings), "hearings": hearings})
+    return days
+
+
+# ============================================================================
+# iCalendar feed
+# ============================================================================
+
+# Calendar clients cannot send a bearer token, so the feed URL carries an
+# HMAC of the advocate id instead
+FEED_TOKEN_SALT = b"lawmate-hearing-feed:"
+
+# Re-read rows updated slightly before the last refresh: a transaction can
+# commit after a refresh even though its updated_at is older
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def feed_token(advocate_id) -> str:
+    """Token for an advocate's feed URL"""
+    signature = hmac.new(
+        settings.JWT_SECRET_KEY.encode(),
+        FEED_TOKEN_SALT + str(advocate_id).encode(),
+        hashlib.sha256
+    ).hexdigest()[:32]
+    return f"{advocate_id}.{signature}"
+
+
+def verify_feed_token(token: str) -> Optional[str]:
+    """Advocate id for a valid feed token, else None"""
+    advocate_id, _, _ = token.partition(".")
+    if not advocate_id or not hmac.compare_digest(token, feed_token(advocate_id)):
+        return None
+    return advocate_id
+
+
+def _escape(value: Optional[str]) -> str:
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+
+    parts, current = [], b""
+    for char in line:
+        char_bytes = char.encode()
+        if len(current) + len(char_bytes) > (75 if not parts else 74):
+            parts.append(current.decode())
+            current = b""
+        current += char_bytes
+    parts.append(current.decode())
+    return "\r\n ".join(parts)
+
+
+def render_event(row: Any) -> str:
+    """VEVENT for a case's next hearing (all-day when no time is known)"""
+    hearing = row.next_hearing_date
+    stamp = row.updated_at.strftime("%Y%m%dT%H%M%SZ")
+    case_label = row.case_number or row.efiling_number
+
+    if hearing.time() == time.min:
+        when = [f"DTSTART;VALUE=DATE:{hearing:%Y%m%d}", f"DTEND;VALUE=DATE:{hearing + timedelta(days=1):%Y%m%d}"]
+    else:
+        when = [f"DTSTART:{hearing:%Y%m%dT%H%M%S}", "DURATION:PT1H"]
+
+    summary = f"{case_label}: {row.petitioner_name} v. {row.respondent_name}"
+    description = f"{row.case_type} - {getattr(row.status, 'value', row.status)}"
+    location = ", ".join(part for part in (row.court_number and f"Court {row.court_number}", row.judge_name) if part)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{row.case_id}@lawmate",
+        f"DTSTAMP:{stamp}",
+        f"LAST-MODIFIED:{stamp}",
+        *when,
+        f"SUMMARY:{_escape(summary)}",
+        f"LOCATION:{_escape(location)}" if location else None,
+        f"DESCRIPTION:{_escape(description)}",
+        "END:VEVENT"
+    ]
+    return "\r\n".join(_fold(line) for line in lines if line)
+
+
+class _AdvocateFeed:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events: Dict[str, Tuple[datetime, str]] = {}
+        self.synced_through: Optional[datetime] = None
+        self.body: Optional[str] = None
+        self.etag: Optional[str] = None
+
+
+class HearingFeed:
+    """
+    Incrementally maintained iCalendar feeds, one per advocate, bounded
+    to CALENDAR_FEED_MAX_ADVOCATES (least recently used evicted).
+    """
+
+    def __init__(self, max_advocates: int = settings.CALENDAR_FEED_MAX_ADVOCATES):
+        self.max_advocates = max_advocates
+        self._feeds: "OrderedDict[str, _AdvocateFeed]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, db: Session, advocate_id) -> Tuple[str, str]:
+        """
+        The advocate's feed and its ETag, brought up to date first.
+        """
+        feed = self._feed(advocate_id)
+        with feed.lock:
+            self._refresh(db, advocate_id, feed)
+            if feed.body is None:
+                events = sorted(feed.events.items(), key=lambda item: (item[1][0], item[0]))
+                feed.body = "\r\n".join([
+                    "BEGIN:VCALENDAR",
+                    "VERSION:2.0",
+                    "PRODID:-//Lawmate//Hearing Calendar//EN",
+                    "CALSCALE:GREGORIAN",
+                    "X-WR-CALNAME:Lawmate Hearings",
+                    *(event for _, (_, event) in events),
+                    "END:VCALENDAR"
+                ]) + "\r\n"
+                feed.etag = make_etag(advocate_id, hashlib.sha1(feed.body.encode()).hexdigest())
+            return feed.body, feed.etag
+
+    def _feed(self, advocate_id) -> _AdvocateFeed:
+        key = str(advocate_id)
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = _AdvocateFeed()
+                while len(self._feeds) > self.max_advocates:
+                    self._feeds.popitem(last=False)
+            self._feeds.move_to_end(key)
+            return feed
+
+    def _refresh(self, db: Session, advocate_id, feed: _AdvocateFeed):
+        columns = (*HEARING_COLUMNS, Case.is_visible, Case.updated_at)
+
+        if feed.synced_through is None:
+            # First request: every visible case with a hearing date
+            rows = db.query(*columns).filter(*_on_calendar(advocate_id)).all()
+        else:
+            # Only cases written since the last refresh, including ones that
+            # lost their hearing date or were hidden
+            rows = db.query(*columns).filter(
+                Case.advocate_id == advocate_id,
+                Case.updated_at >= feed.synced_through - REFRESH_OVERLAP
+            ).all()
+
+        changed = False
+        for row in rows:
+            key = str(row.case_id)
+            if row.is_visible and row.next_hearing_date is not None:
+                event = (row.next_hearing_date, render_event(row))
+                if feed.events.get(key) != event:
+                    feed.events[key] = event
+                    changed = True
+            elif feed.events.pop(key, None) is not None:
+                changed = True
+
+            if feed.synced_through is None or row.updated_at > feed.synced_through:
+                feed.synced_through = row.updated_at
+
+        if feed.synced_through is None:
+            # No cases yet; updated_at is written with the same utcnow() clock
+            feed.synced_through = datetime.utcnow()
+        if changed:
+            feed.body = None
+
+
+# Singleton instance
+hearing_feed = HearingFeed()
@@ -1,11 +1,157 @@
 # # app/services/case_service.py
 """
-Case service - helper functions (optional)
-Direct queries in endpoints for now
+Case service - case detail loading and conditional-GET validators
+List/filter queries live in app/api/v1/endpoints/cases.py
 """
-# This file can be empty or deleted
-# All case logic is in app/api/v1/endpoints/cases.py
-pass
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, noload
+from sqlalchemy import func, select
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from app.db.models import Case, Document, CaseHistory, AIAnalysis
+
+# Relationships a case detail response can include (`include=` values)
+DETAIL_INCLUDES = {"documents", "history", "analysis"}
+
+
+def parse_includes(include: Optional[str]) -> Set[str]:
+    """
+    Parse a comma-separated `include` parameter; None means everything.
+    Unknown names raise ValueError.
+    """
+    if include is None:
+        return set(DETAIL_INCLUDES)
+
+    includes = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = includes - DETAIL_INCLUDES
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+    return includes
+
+
+def load_case_detail(db: Session, case_id, advocate_id, includes: Set[str]) -> Optional[Case]:
+    """
+    Load one of the advocate's cases with the requested relationships
+    in at most two round trips:
+
+    1. the case joined to its AI analysis (one-to-one) and documents
+    2. its history via SELECT ... IN (a second joined collection would
+       multiply rows), newest first (the relationship's order_by)
+
+    Relationships not requested are not loaded and serialize as empty.
+    """
+    options = [
+        joinedload(Case.ai_analysis) if "analysis" in includes else noload(Case.ai_analysis),
+        joinedload(Case.documents) if "documents" in includes else noload(Case.documents),
+        selectinload(Case.history) if "history" in includes else noload(Case.history)
+    ]
+
+    return db.query(Case).options(*options).filter(
+        Case.id == case_id,
+        Case.advocate_id == advocate_id
+    ).first()
+
+
+# ============================================================================
+# Validators for ETags: one cheap aggregate query each, no ORM hydration
+# ============================================================================
+
+# Labels of the validator columns selected alongside a listing page
+LIST_VALIDATOR_COLUMNS = ("validator_count", "validator_updated_at")
+
+
+def case_list_validator(db: Session, advocate_id) -> Tuple:
+    """
+    (case count, latest update) over all of the advocate's cases.
+    Soft deletes bump updated_at, so they change the validator too.
+    """
+    return tuple(db.query(
+        func.count(Case.id),
+        func.max(Case.updated_at)
+    ).filter(
+        Case.advocate_id == advocate_id
+    ).one())
+
+
+def case_list_validator_columns(advocate_id) -> List[Any]:
+    """
+    `case_list_validator` as uncorrelated scalar subqueries, selected
+    with the page itself. PostgreSQL evaluates each once (an InitPlan),
+    so a listing gets its ETag without another round trip.
+    """
+    listed = aliased(Case)
+    scope = listed.advocate_id == advocate_id
+    return [
+        select(func.count(listed.id)).where(scope).scalar_subquery().label(LIST_VALIDATOR_COLUMNS[0]),
+        select(func.max(listed.updated_at)).where(scope).scalar_subquery().label(LIST_VALIDATOR_COLUMNS[1])
+    ]
+
+
+def case_list_validator_of(db: Session, advocate_id, rows: Sequence[Any]) -> Tuple:
+    """
+    The list validator from a page selected with
+    `case_list_validator_columns`; an empty page has to query for it
+    """
+    if not rows:
+        return case_list_validator(db, advocate_id)
+    return tuple(getattr(rows[0], name) for name in LIST_VALIDATOR_COLUMNS)
+
+
+def case_detail_validator(db: Session, case_id, advocate_id, includes: Set[str]) -> Optional[Tuple]:
+    """
+    The case's updated_at plus counts/latest timestamps of the included
+    relationships, or None if the advocate has no such case. Equal to
+    `case_detail_validator_of` the loaded case.
+    """
+    def latest(column, case_column):
+        return select(func.max(column)).where(case_column == Case.id).scalar_subquery()
+
+    def count(column, case_column):
+        return select(func.count(column)).where(case_column == Case.id).scalar_subquery()
+
+    columns = [Case.updated_at]
+    if "documents" in includes:
+        columns += [count(Document.id, Document.case_id), latest(Document.updated_at, Document.case_id)]
+    if "history" in includes:
+        columns += [count(CaseHistory.id, CaseHistory.case_id), latest(CaseHistory.created_at, CaseHistory.case_id)]
+    if "analysis" in includes:
+        columns.append(latest(AIAnalysis.updated_at, AIAnalysis.case_id))
+
+    row = db.execute(
+        select(*columns).where(
+            Case.id == case_id,
+            Case.advocate_id == advocate_id
+        )
+    ).first()
+
+    return tuple(row) if row else None
+
+
+def case_detail_validator_of(case: Case, includes: Set[str]) -> Tuple:
+    """`case_detail_validator` computed from a case loaded by `load_case_detail`"""
+    parts = [case.updated_at]
+    if "documents" in includes:
+        parts += [len(case.documents), max((document.updated_at for document in case.documents), default=None)]
+    if "history" in includes:
+        parts += [len(case.history), max((event.created_at for event in case.history), default=None)]
+    if "analysis" in includes:
+        parts.append(case.ai_analysis.updated_at if case.ai_analysis is not None else None)
+    return tuple(parts)
+
+
+def analysis_validator(db: Session, case_id, advocate_id) -> Optional[Tuple]:
+    """
+    (analysis id, updated_at) for the advocate's case, or None.
+    """
+    row = db.query(AIAnalysis.id, AIAnalysis.updated_at).join(
+        Case, AIAnalysis.case_id == Case.id
+    ).filter(
+        AIAnalysis.case_id == case_id,
+        Case.advocate_id == advocate_id
+    ).first()
+
+    return tuple(row) if row else None
+
+
 # from sqlalchemy.orm import Session
 # from sqlalchemy import and_, or_, func, text
 # from typing import List, Optional, Dict, Any
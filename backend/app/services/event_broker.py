@@ -0,0 +1,235 @@
+# app/services/event_broker.py
+
+import asyncio
+import json
+import select
+import threading
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class EventBroker:
+    """
+    In-process pub/sub for real-time updates (SSE).
+
+    Write paths publish through PostgreSQL NOTIFY inside their own
+    transaction, so an event is only delivered once the change is
+    committed. Every worker runs one LISTEN connection and fans the
+    notifications out to the per-advocate subscribers (see sse_manager).
+
+    Event ids come from a database sequence (database/event_sequence.sql),
+    so they are shared by all workers. Each worker keeps a small ring
+    buffer of recent events per advocate, which lets a reconnecting
+    stream replay what it missed.
+    """
+
+    def __init__(self, channel: str = settings.EVENTS_CHANNEL):
+        self.channel = channel
+        self.sequence = f"{channel}_id_seq"
+        self._subscribers: Dict[str, Set[Callable[[str, Dict[str, Any]], None]]] = defaultdict(set)
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Publishing (called from request threads)
+    # ------------------------------------------------------------------
+
+    def publish(self, db: Session, advocate_id: Any, event: str, data: Dict[str, Any]):
+        """
+        Queue an event for delivery when `db` commits.
+        """
+        payload = json.dumps({
+            "advocate_id": str(advocate_id),
+            "event": event,
+            "data": {**data, "timestamp": datetime.utcnow().isoformat()}
+        }, default=str)
+
+        # The id is prefixed as "<id>:" so it is assigned in the same round trip
+        db.execute(
+            text("SELECT pg_notify(:channel, nextval(:sequence) || ':' || :payload)"),
+            {"channel": self.channel, "sequence": self.sequence, "payload": payload}
+        )
+
+    # ------------------------------------------------------------------
+    # Subscribing (called from SSE generators on the event loop)
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        advocate_id: Any,
+        callback: Callable[[str, Dict[str, Any]], None],
+        last_event_id: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Register `callback(advocate_id, event)` for every event of `advocate_id`.
+
+        Returns the buffered events published after `last_event_id`
+        and whether the gap is older than the buffer (in which case the
+        client must resync).
+        """
+        key = str(advocate_id)
+
+        # No await between the snapshot and registration, so nothing can
+        # slip in between the replayed events and the live ones.
+        missed, resync = self.replay(key, last_event_id)
+        self._subscribers[key].add(callback)
+
+        return missed, resync
+
+    def unsubscribe(self, advocate_id: Any, callback: Callable[[str, Dict[str, Any]], None]):
+        """
+        Remove a callback registered with `subscribe`.
+        """
+        key = str(advocate_id)
+        callbacks = self._subscribers.get(key)
+        if callbacks is None:
+            return
+        callbacks.discard(callback)
+        if not callbacks:
+            del self._subscribers[key]
+
+    def latest_event_id(self, advocate_id: Any) -> Optional[int]:
+        """
+        Id of the newest buffered event for `advocate_id`, if any.
+        """
+        history = self._history.get(str(advocate_id))
+        return history[-1]["id"] if history else None
+
+    def replay(
+        self,
+        advocate_id: Any,
+        last_event_id: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Buffered events after `last_event_id`, and whether it fell out of the buffer.
+        """
+        if last_event_id is None:
+            return [], False
+
+        history = self._history.get(str(advocate_id), ())
+
+        # Notifications reach every listener in commit order, which is
+        # not necessarily id order, so locate the position of the last
+        # seen id instead of comparing ids numerically.
+        for index, item in enumerate(history):
+            if item["id"] == last_event_id:
+                return list(history)[index + 1:], False
+
+        return [], True
+
+    def _remember(self, key: str, item: Dict[str, Any]):
+        history = self._history.get(key)
+        if history is None:
+            history = deque(maxlen=settings.SSE_REPLAY_BUFFER_SIZE)
+            self._history[key] = history
+            while len(self._history) > settings.SSE_REPLAY_MAX_ADVOCATES:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(key)
+        history.append(item)
+
+    def _dispatch(self, event_id: int, message: Dict[str, Any]):
+        """
+        Fan a decoded notification out to local subscribers.
+        Runs on the event loop thread.
+        """
+        key = message["advocate_id"]
+        item = {"id": event_id, "event": message["event"], "data": message["data"]}
+        self._remember(key, item)
+
+        for callback in list(self._subscribers.get(key, ())):
+            try:
+                callback(key, item)
+            except Exception as e:
+                logger.error(f"Event subscriber failed for advocate {key}: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # LISTEN loop
+    # ------------------------------------------------------------------
+
+    def start(self, engine):
+        """
+        Start the LISTEN thread. Must be called from the event loop.
+        """
+        if self._listener is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._listener = threading.Thread(
+            target=self._listen,
+            args=(engine,),
+            name="event-broker-listener",
+            daemon=True
+        )
+        self._listener.start()
+        logger.info(f"Event broker listening on channel '{self.channel}'")
+
+    def stop(self):
+        """
+        Stop the LISTEN thread.
+        """
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def _connect(self, engine):
+        # Raw DBAPI connection outside the pool: it is held for the
+        # lifetime of the process and must not starve request sessions.
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        conn = engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _listen(self, engine):
+        backoff = 1
+
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect(engine)
+                backoff = 1
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            event_id, _, body = notify.payload.partition(":")
+                            event_id = int(event_id)
+                            message = json.loads(body)
+                        except ValueError:
+                            logger.error(f"Invalid event payload: {notify.payload[:200]}")
+                            continue
+                        self._loop.call_soon_threadsafe(self._dispatch, event_id, message)
+
+            except Exception as e:
+                logger.error(f"Event broker listener error: {str(e)}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+# Singleton instance
+event_broker = EventBroker()
@@ -0,0 +1,195 @@
+# app/services/password_service.py
+"""
+Password hashing off the request workers.
+
+bcrypt is deliberately slow (~250 ms at cost 12). Running it in the
+shared request threadpool means a burst of logins at the start of court
+hours stalls unrelated requests. PasswordHasher runs it on its own
+bounded executor instead. When PASSWORD_HASH_WORKERS are busy and
+PASSWORD_HASH_QUEUE_SIZE jobs are waiting, further work is refused with
+a 503 rather than queued without limit.
+
+LoginThrottle refuses an account's attempts before any hash is
+computed when it has too many recent failures or too many attempts
+already in flight.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.security import pwd_context
+from app.utils.exceptions import ServiceBusyError, TooManyAttemptsError
+
+
+class PasswordHasher:
+    """
+    bcrypt on a dedicated, bounded thread pool, with queue and timing metrics.
+    """
+
+    def __init__(self, workers: int = settings.PASSWORD_HASH_WORKERS, queue_size: int = settings.PASSWORD_HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a new password"""
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password. The second value is a replacement hash when the
+        stored one uses an outdated scheme or cost factor, else None.
+        """
+        return await self._submit(pwd_context.verify_and_update, password, password_hash)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queued": self._pending - self._running,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 1),
+                "avg_hash_ms": round(self._run_seconds / completed * 1000, 1)
+            }
+
+    async def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning("Password hash queue full, rejecting request")
+            raise ServiceBusyError()
+
+        with self._lock:
+            self._pending += 1
+        submitted = time.monotonic()
+
+        def run():
+            started = time.monotonic()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._run_seconds += time.monotonic() - started
+                self._slots.release()
+
+        return await asyncio.wrap_future(self._executor.submit(run))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ============================================================================
+# Login throttling
+# ============================================================================
+
+class LoginThrottle:
+    """
+    Per-account login limits, checked before any hash is computed:
+
+    - at most LOGIN_MAX_FAILURES failures per LOGIN_FAILURE_WINDOW_SECONDS
+    - at most LOGIN_MAX_CONCURRENT_ATTEMPTS attempts in flight at once
+
+    State is per process, keyed by the normalized email and bounded to
+    LOGIN_THROTTLE_MAX_ACCOUNTS accounts with recent failures.
+    """
+
+    def __init__(
+        self,
+        max_failures: int = settings.LOGIN_MAX_FAILURES,
+        window: int = settings.LOGIN_FAILURE_WINDOW_SECONDS,
+        max_concurrent: int = settings.LOGIN_MAX_CONCURRENT_ATTEMPTS,
+        max_accounts: int = settings.LOGIN_THROTTLE_MAX_ACCOUNTS
+    ):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_concurrent = max_concurrent
+        self.max_accounts = max_accounts
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def attempt(self, email: str):
+        """
+        Guard one login attempt. Raises TooManyAttemptsError up front.
+        Report the outcome on the yielded handle with `succeeded()` or
+        `failed()`; attempts that end otherwise (e.g. a 503) don't count.
+        """
+        key = email.strip().lower()
+        now = time.monotonic()
+
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures:
+                while failures and failures[0] <= now - self.window:
+                    failures.popleft()
+                if not failures:
+                    del self._failures[key]
+                elif len(failures) >= self.max_failures:
+                    raise TooManyAttemptsError(retry_after=int(failures[0] + self.window - now) + 1)
+
+            if self._in_flight.get(key, 0) >= self.max_concurrent:
+                raise TooManyAttemptsError(retry_after=1)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+        result = _AttemptResult()
+        try:
+            yield result
+        finally:
+            with self._lock:
+                remaining = self._in_flight[key] - 1
+                if remaining:
+                    self._in_flight[key] = remaining
+                else:
+                    del self._in_flight[key]
+
+                if result.outcome is True:
+                    self._failures.pop(key, None)
+                elif result.outcome is False:
+                    failures = self._failures.get(key)
+                    if failures is None:
+                        failures = self._failures[key] = deque(maxlen=self.max_failures)
+                    failures.append(time.monotonic())
+                    self._failures.move_to_end(key)
+                    while len(self._failures) > self.max_accounts:
+                        self._failures.popitem(last=False)
+
+
+class _AttemptResult:
+    def __init__(self):
+        self.outcome: Optional[bool] = None
+
+    def succeeded(self):
+        self.outcome = True
+
+    def failed(self):
+        self.outcome = False
+
+
+# Singleton instances
+password_hasher = PasswordHasher()
+login_throttle = LoginThrottle()
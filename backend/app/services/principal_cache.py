@@ -0,0 +1,105 @@
+# app/services/principal_cache.py
+"""
+Authenticated-principal cache.
+
+get_current_user resolves a token's user id to the few fields
+authorization needs. Caching them per user for PRINCIPAL_CACHE_TTL_SECONDS
+removes the users-table lookup from every request. That lookup used to
+run once for every API call, SSE connection and sync item.
+
+Entries are dropped whenever a User row is updated or deleted through
+the ORM in this process. Other workers see the change within the TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Detached view of the authenticated user. Endpoints that need the
+    full profile depend on get_current_user_record instead.
+    """
+    id: UUID
+    email: str
+    khc_advocate_id: str
+    khc_advocate_name: str
+    role: UserRole
+    is_active: bool
+
+
+PRINCIPAL_COLUMNS = (
+    User.id,
+    User.email,
+    User.khc_advocate_id,
+    User.khc_advocate_name,
+    User.role,
+    User.is_active
+)
+
+
+class PrincipalCache:
+    """
+    Principals by user id with a short TTL, bounded to
+    PRINCIPAL_CACHE_MAX_ENTRIES (least recently used evicted).
+    """
+
+    def __init__(self, ttl: int = settings.PRINCIPAL_CACHE_TTL_SECONDS, max_entries: int = settings.PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id) -> Optional[Principal]:
+        """
+        The user's principal, or None if no such user exists.
+        """
+        key = str(user_id)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        row = db.query(*PRINCIPAL_COLUMNS).filter(User.id == user_id).first()
+        if row is None:
+            # Not cached: a user registered a moment later must not be refused
+            return None
+
+        principal = Principal(**row._asdict())
+        with self._lock:
+            self._cache[key] = (now + self.ttl, principal)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return principal
+
+    def invalidate(self, user_id):
+        """
+        Drop a user's principal, e.g. after deactivation or a profile change.
+        """
+        with self._lock:
+            self._cache.pop(str(user_id), None)
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate(target.id)
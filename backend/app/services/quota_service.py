@@ -0,0 +1,238 @@
+# app/services/quota_service.py
+"""
+Plan quota enforcement.
+
+Usage counters are kept in memory per user, loaded once from the
+database (stats rollup + AI analysis count) and refreshed every
+QUOTA_REFRESH_SECONDS. The least recently used users are dropped
+beyond QUOTA_CACHE_MAX_ENTRIES and reloaded on their next check. Checks
+and increments happen under a lock, so the common under-limit case
+costs no database round trip.
+
+    with quota_service.reserve(db, current_user.id, {CASES: 1}):
+        ...create the case and commit...
+
+A reservation is refunded if the block raises.
+
+Uploads take a hold when their URL is issued, so parallel uploads can't
+all pass the check. The hold is settled (given back) when the document
+is registered, which counts it for good, or lapses after
+QUOTA_UPLOAD_HOLD_SECONDS. Holds are per process: one settled by
+another worker lapses here.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services import stats_service, subscription_service
+from app.services.usage_service import billing_period, count_ai_analyses
+
+# Metered resources
+CASES = "cases"
+DOCUMENTS = "documents"
+STORAGE_BYTES = "storage_bytes"
+AI_ANALYSES = "ai_analyses"
+
+# Resource -> (plan feature, multiplier to resource units)
+PLAN_FEATURES = {
+    CASES: ("max_cases", 1),
+    DOCUMENTS: ("max_documents", 1),
+    STORAGE_BYTES: ("storage_gb", 1024 ** 3),
+    AI_ANALYSES: ("ai_analyses_per_month", 1),
+}
+
+
+class QuotaExceeded(Exception):
+    """
+    Raised when an operation would take a user over their plan limit.
+    """
+
+    def __init__(self, resource: str, limit: int, used: int, plan: str):
+        self.resource = resource
+        self.limit = limit
+        self.used = used
+        self.plan = plan
+        super().__init__(f"{resource} quota exceeded on {plan} plan ({used}/{limit})")
+
+
+@dataclass
+class _Usage:
+    plan: str
+    limits: Dict[str, Optional[int]]
+    used: Dict[str, int]
+    period_start: datetime
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+def plan_limits(plan_id: str) -> Dict[str, Optional[int]]:
+    """
+    Limits for a plan in resource units; None means unlimited.
+    """
+    plans = {plan["id"]: plan for plan in subscription_service.get_all_plans()}
+    features = plans.get(plan_id, plans["free"])["features"]
+
+    limits = {}
+    for resource, (feature, multiplier) in PLAN_FEATURES.items():
+        value = features.get(feature, "unlimited")
+        limits[resource] = None if value == "unlimited" else int(value * multiplier)
+    return limits
+
+
+class QuotaService:
+    """
+    In-memory, database-backed usage counters per user.
+    """
+
+    def __init__(self, refresh_seconds: int = settings.QUOTA_REFRESH_SECONDS, max_entries: int = settings.QUOTA_CACHE_MAX_ENTRIES):
+        self.refresh_seconds = refresh_seconds
+        self.max_entries = max_entries
+        self._usage: "OrderedDict[str, _Usage]" = OrderedDict()
+        self._holds: Dict[str, Tuple[str, Dict[str, int], float]] = {}  # Key -> (user, amounts, expiry)
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, user_id) -> _Usage:
+        plan = subscription_service.get_subscription(db, user_id)["plan"]
+        period_start, period_end = billing_period()
+        counts = stats_service.get_usage_counts(db, user_id)
+
+        return _Usage(
+            plan=plan,
+            limits=plan_limits(plan),
+            used={
+                CASES: counts["cases_count"],
+                DOCUMENTS: counts["documents_count"],
+                STORAGE_BYTES: counts["storage_bytes"],
+                AI_ANALYSES: count_ai_analyses(db, user_id, period_start, period_end)
+            },
+            period_start=period_start
+        )
+
+    def _get(self, db: Session, user_id) -> _Usage:
+        key = str(user_id)
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is not None:
+                self._usage.move_to_end(key)
+
+        if (
+            usage is None
+            or time.monotonic() - usage.loaded_at > self.refresh_seconds
+            or usage.period_start != billing_period()[0]
+        ):
+            # Loaded outside the lock; a concurrent load of the same user
+            # simply replaces it with equally fresh numbers.
+            usage = self._load(db, user_id)
+            with self._lock:
+                # The database doesn't know about uploads still in flight
+                for holder, amounts, _ in self._holds.values():
+                    if holder == key:
+                        for resource, amount in amounts.items():
+                            usage.used[resource] += amount
+                self._usage[key] = usage
+                self._usage.move_to_end(key)
+                while len(self._usage) > self.max_entries:
+                    self._usage.popitem(last=False)
+
+        return usage
+
+    def check(self, db: Session, user_id, amounts: Dict[str, int]):
+        """
+        Raise QuotaExceeded if `amounts` (resource -> amount) would exceed the plan.
+        """
+        usage = self._get(db, user_id)
+        for resource, amount in amounts.items():
+            limit = usage.limits[resource]
+            if limit is not None and amount > 0 and usage.used[resource] + amount > limit:
+                raise QuotaExceeded(resource, limit, usage.used[resource], usage.plan)
+
+    def consume(self, db: Session, user_id, amounts: Dict[str, int]):
+        """
+        Atomically check and count `amounts` (resource -> amount) against the plan.
+        Either every resource is counted or none is.
+        """
+        usage = self._get(db, user_id)
+
+        with self._lock:
+            for resource, amount in amounts.items():
+                limit = usage.limits[resource]
+                used = usage.used[resource]
+                if limit is not None and amount > 0 and used + amount > limit:
+                    logger.info(f"Quota exceeded for user {user_id}: {resource} {used}+{amount}/{limit}")
+                    raise QuotaExceeded(resource, limit, used, usage.plan)
+
+            for resource, amount in amounts.items():
+                usage.used[resource] += amount
+
+    def release(self, user_id, amounts: Dict[str, int]):
+        """
+        Give back `amounts` (refunds and deletions).
+        """
+        with self._lock:
+            usage = self._usage.get(str(user_id))
+            if usage is None:
+                return
+            for resource, amount in amounts.items():
+                usage.used[resource] = max(usage.used[resource] - amount, 0)
+
+    @contextmanager
+    def reserve(self, db: Session, user_id, amounts: Dict[str, int]):
+        """
+        `consume` for the duration of a block, refunded if the block raises.
+        """
+        self.consume(db, user_id, amounts)
+        try:
+            yield
+        except BaseException:
+            self.release(user_id, amounts)
+            raise
+
+    def hold(self, db: Session, user_id, key: str, amounts: Dict[str, int], seconds: int = settings.QUOTA_UPLOAD_HOLD_SECONDS):
+        """
+        `consume` for an upload that is registered later under `key`
+        (its S3 key). Replaces an earlier hold on the same key.
+        """
+        self._release_lapsed()
+        self.settle(user_id, key)
+        self.consume(db, user_id, amounts)
+        with self._lock:
+            self._holds[key] = (str(user_id), amounts, time.monotonic() + seconds)
+
+    def settle(self, user_id, key: str):
+        """
+        Give back the hold on `key`: the upload was registered (and counted
+        there) or abandoned.
+        """
+        with self._lock:
+            hold = self._holds.get(key)
+            if hold is None or hold[0] != str(user_id):
+                return
+            del self._holds[key]
+        self.release(user_id, hold[1])
+
+    def _release_lapsed(self):
+        now = time.monotonic()
+        with self._lock:
+            lapsed = [(key, hold) for key, hold in self._holds.items() if hold[2] <= now]
+            for key, _ in lapsed:
+                del self._holds[key]
+        for _, (user_id, amounts, _) in lapsed:
+            self.release(user_id, amounts)
+
+    def invalidate(self, user_id):
+        """
+        Reload a user's counters on next use, e.g. after a plan change.
+        """
+        with self._lock:
+            self._usage.pop(str(user_id), None)
+
+
+# Singleton instance
+quota_service = QuotaService()
@@ -1,10 +1,10 @@
 # app/services/s3_service.py
 
-import boto3
 from botocore.exceptions import ClientError
 from typing import Optional
 from datetime import datetime, timedelta
 
+from app.core.aws import aws_clients
 from app.core.config import settings
 from app.core.logger import logger
 
@@ -13,13 +13,9 @@ class S3Service:
     Service layer for AWS S3 operations.
     """
     
-    def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
+    def __init__(self, s3_client=None):
+        # Shared per-process client unless one is injected (tests)
+        self.s3_client = s3_client or aws_clients.client('s3')
         self.bucket = settings.S3_BUCKET_NAME
     def generate_presigned_url(
         self,
@@ -0,0 +1,159 @@
+# app/services/search_service.py
+"""
+Case and document search backed by PostgreSQL full-text search.
+
+`cases.search_vector` is a tsvector kept current by a trigger (see
+database/case_search.sql) over case/e-filing numbers and party names,
+with a GIN index. Partial case numbers such as "WP(C) 123" are matched
+with ILIKE against pg_trgm GIN indexes on the number columns.
+
+Documents are searched through the GIN index on
+to_tsvector('english', extracted_text) (database/ai_schema.sql).
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, func, or_, select, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.db.models import Case, Document
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# Text search configuration used by the search_vector trigger. "simple"
+# avoids stemming party names and case numbers.
+TS_CONFIG = "simple"
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_tsquery(q: str):
+    """
+    tsquery matching every word of `q` as a prefix ("raj kum" finds
+    "Rajesh Kumar"), or None if `q` has no searchable words.
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return None
+    return func.to_tsquery(TS_CONFIG, " & ".join(f"{word}:*" for word in words))
+
+
+def search_cases(query: Query, q: str) -> Tuple[Query, object]:
+    """
+    Restrict a Case query to matches for `q`.
+
+    Returns the filtered query and a relevance expression to order by
+    (ts_rank plus trigram similarity for case-number matches).
+    """
+    number_term = f"%{_escape_like(q.strip())}%"
+    number_match = or_(
+        Case.case_number.ilike(number_term, escape="\\"),
+        Case.efiling_number.ilike(number_term, escape="\\")
+    )
+
+    ts_query = prefix_tsquery(q)
+    if ts_query is None:
+        relevance = func.similarity(func.coalesce(Case.case_number, Case.efiling_number), q)
+        return query.filter(number_match), relevance
+
+    relevance = (
+        func.ts_rank(Case.search_vector, ts_query)
+        + func.similarity(func.coalesce(Case.case_number, Case.efiling_number), q)
+    )
+    return query.filter(or_(Case.search_vector.op("@@")(ts_query), number_match)), relevance
+
+
+# ============================================================================
+# Documents
+# ============================================================================
+
+# Must match idx_documents_text_search for the index to be used
+DOCUMENT_TS_CONFIG = "english"
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=3, "
+    "MinWords=8, MaxWords=30, FragmentDelimiter=\" … \""
+)
+
+
+def search_documents(
+    db: Session,
+    advocate_id,
+    q: str,
+    case_id=None,
+    category: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Rank an advocate's documents against `q` (web-search syntax, so
+    "section 482" and quoted phrases work) and return one page of hits.
+
+    Only ids, titles and ts_headline snippets are returned; the
+    extracted text never leaves the database. Snippets are computed for
+    the rows of the requested page only.
+    """
+    ts_query = func.websearch_to_tsquery(DOCUMENT_TS_CONFIG, q)
+    document_vector = func.to_tsvector(DOCUMENT_TS_CONFIG, Document.extracted_text)
+    # ts_rank_cd is float4; as float8 the rank survives the cursor's
+    # round trip through a Python float exactly, so ties page stably
+    rank = cast(func.ts_rank_cd(document_vector, ts_query), Float)
+
+    matches = select(
+        Document.id,
+        Document.case_id,
+        Document.title,
+        Document.category,
+        rank.label("rank")
+    ).join(
+        Case, Document.case_id == Case.id
+    ).where(
+        Case.advocate_id == advocate_id,
+        Document.extracted_text.isnot(None),
+        document_vector.op("@@")(ts_query)
+    )
+
+    if case_id:
+        matches = matches.where(Document.case_id == case_id)
+    if category:
+        matches = matches.where(Document.category == category)
+
+    matches = matches.subquery("matches")
+
+    page = select(matches)
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor, "rank", "desc")
+        page = page.where(tuple_(matches.c.rank, matches.c.id) < tuple_(last_rank, last_id))
+
+    # One extra row tells us whether another page exists
+    page = page.order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit + 1).subquery("page")
+
+    rows = db.execute(
+        select(
+            page,
+            func.ts_headline(DOCUMENT_TS_CONFIG, Document.extracted_text, ts_query, HEADLINE_OPTIONS).label("snippet")
+        ).join(
+            Document, Document.id == page.c.id
+        ).order_by(
+            page.c.rank.desc(), page.c.id.desc()
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("rank", "desc", rows[-1].rank, rows[-1].id)
+
+    hits = [
+        {
+            "id": row.id,
+            "case_id": row.case_id,
+            "title": row.title,
+            "category": getattr(row.category, "value", row.category),
+            "rank": row.rank,
+            "snippet": row.snippet
+        }
+        for row in rows
+    ]
+    return hits, next_cursor
@@ -0,0 +1,214 @@
+# app/services/session_service.py
+"""
+Login sessions: short-lived access tokens plus rotating refresh tokens.
+
+Each login creates an auth_sessions row. The refresh token is
+"<session id>.<secret>" and only a SHA-256 of the secret is stored. Each
+refresh replaces the secret. Presenting a secret that was already
+rotated away means the token was copied, so the whole session is
+revoked.
+
+Clients retry, and two tabs can refresh at once, so the token a session
+was just rotated from is still accepted for
+REFRESH_TOKEN_REUSE_GRACE_SECONDS. It gets the same new token back:
+rotated secrets are an HMAC of the replaced one, so any worker can
+derive the new token again without it being stored.
+
+Access tokens carry the session id as `sid`. Revocation reaches request
+workers through SessionDenylist, an in-memory set of sessions revoked
+within the last access-token lifetime. Every worker reloads it every
+SESSION_DENYLIST_REFRESH_SECONDS, so validating an access token never
+touches the database.
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.security import create_access_token
+from app.db.database import SessionLocal
+from app.db.models import AuthSession
+from app.utils.exceptions import InvalidRefreshTokenError
+
+
+def _hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def _new_secret() -> Tuple[str, str]:
+    secret = secrets.token_urlsafe(32)
+    return secret, _hash_secret(secret)
+
+
+def _rotated_secret(session_id, replaced_hash: str) -> Tuple[str, str]:
+    """The secret that replaces `replaced_hash`; the same on every call"""
+    secret = hmac.new(
+        settings.JWT_SECRET_KEY.encode(),
+        f"{session_id}.{replaced_hash}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+    return secret, _hash_secret(secret)
+
+
+def issue_access_token(user_id, session_id) -> str:
+    """Short-lived access token bound to a session"""
+    return create_access_token(
+        data={"sub": str(user_id), "sid": str(session_id)},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+def create_session(db: Session, user_id) -> Tuple[AuthSession, str]:
+    """
+    Start a session for a login. Returns the session and its refresh token.
+    The caller commits.
+    """
+    secret, token_hash = _new_secret()
+    now = datetime.utcnow()
+    session = AuthSession(
+        user_id=user_id,
+        token_hash=token_hash,
+        created_at=now,
+        rotated_at=now,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(session)
+    db.flush()
+    return session, f"{session.id}.{secret}"
+
+
+def rotate_session(db: Session, refresh_token: str) -> Tuple[AuthSession, str]:
+    """
+    Exchange a refresh token for the session and a new refresh token.
+    Commits. Raises InvalidRefreshTokenError.
+    """
+    session_id, _, secret = refresh_token.partition(".")
+    try:
+        session_id = UUID(session_id)
+    except ValueError:
+        raise InvalidRefreshTokenError()
+
+    # Row lock: two concurrent refreshes with the same token must not both win
+    session = db.query(AuthSession).filter(
+        AuthSession.id == session_id
+    ).with_for_update().first()
+
+    now = datetime.utcnow()
+    if session is None or session.revoked_at is not None or session.expires_at <= now:
+        db.rollback()
+        raise InvalidRefreshTokenError()
+
+    presented_hash = _hash_secret(secret)
+    if not secrets.compare_digest(session.token_hash, presented_hash):
+        if _in_grace(session, presented_hash, now):
+            # The token was rotated moments ago: hand out the same new one
+            new_secret, _ = _rotated_secret(session.id, presented_hash)
+            db.rollback()
+            return session, f"{session.id}.{new_secret}"
+
+        # An old token was replayed: whoever holds the current one is
+        # not necessarily the user, so end the session for both
+        session.revoked_at = now
+        db.commit()
+        session_denylist.add(session.id)
+        logger.warning(f"Refresh token reuse, revoked session {session.id} of user {session.user_id}")
+        raise InvalidRefreshTokenError()
+
+    new_secret, new_hash = _rotated_secret(session.id, presented_hash)
+    session.previous_token_hash = presented_hash
+    session.token_hash = new_hash
+    session.rotated_at = now
+    db.commit()
+    return session, f"{session.id}.{new_secret}"
+
+
+def _in_grace(session: AuthSession, presented_hash: str, now: datetime) -> bool:
+    """
+    Whether `presented_hash` is the token the session was last rotated
+    from, presented again within the grace window
+    """
+    if session.previous_token_hash is None:
+        return False
+    if now - session.rotated_at > timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+        return False
+    return secrets.compare_digest(session.previous_token_hash, presented_hash)
+
+
+def revoke_session(db: Session, session_id) -> bool:
+    """Revoke a session (logout). Commits. False if it was already gone."""
+    revoked = db.query(AuthSession).filter(
+        AuthSession.id == session_id,
+        AuthSession.revoked_at.is_(None)
+    ).update({AuthSession.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+    session_denylist.add(session_id)
+    return bool(revoked)
+
+
+# ============================================================================
+# Revocation denylist
+# ============================================================================
+
+class SessionDenylist:
+    """
+    Session ids revoked within the last access-token lifetime. Older
+    revocations cannot matter: every access token they issued has expired.
+    """
+
+    def __init__(self):
+        self._revoked: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def is_revoked(self, session_id: Optional[str]) -> bool:
+        return str(session_id) in self._revoked
+
+    def add(self, session_id):
+        """Revoked in this process: effective immediately, without a reload"""
+        with self._lock:
+            self._revoked = self._revoked | {str(session_id)}
+
+    def reload(self, db: Session) -> int:
+        """Replace the set from the database. Returns its size."""
+        horizon = datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES + 1)
+        rows = db.query(AuthSession.id).filter(AuthSession.revoked_at >= horizon).all()
+
+        # Swapped whole, so readers never need the lock
+        with self._lock:
+            self._revoked = {str(row.id) for row in rows}
+        return len(rows)
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+# Singleton instance
+session_denylist = SessionDenylist()
+
+
+def _reload_denylist():
+    db = SessionLocal()
+    try:
+        session_denylist.reload(db)
+    finally:
+        db.close()
+
+
+async def refresh_denylist_periodically(interval: int = settings.SESSION_DENYLIST_REFRESH_SECONDS):
+    """
+    Keep `session_denylist` current with revocations made by other workers.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(_reload_denylist)
+        except Exception as e:
+            logger.error(f"Session denylist refresh error: {str(e)}")
+        await asyncio.sleep(interval)
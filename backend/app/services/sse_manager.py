@@ -0,0 +1,296 @@
+# app/services/sse_manager.py
+
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.event_broker import EventBroker, event_broker
+
+# Consecutive events of these types for the same case are merged into
+# one batch inside the coalescing window. A batch keeps the id of its
+# last event; since only an uninterrupted run is merged, replaying from
+# that id neither repeats nor skips anything.
+COALESCED_EVENTS = {"document_uploaded"}
+
+
+def _coalesce_key(item: Dict[str, Any]) -> Optional[str]:
+    if item["event"] not in COALESCED_EVENTS:
+        return None
+    return f"{item['event']}:{item['data'].get('case_id')}"
+
+
+def _merge(batch: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold `item` into `batch`, e.g. 42 uploads for one case become one event.
+    """
+    data = batch["data"]
+
+    if "count" not in data:
+        # `title` stays (the first one) for clients that only read that
+        data = {
+            "case_id": data.get("case_id"),
+            "title": data.get("title"),
+            "count": 1,
+            "document_ids": [data.get("document_id")],
+            "titles": [data.get("title")]
+        }
+
+    data["count"] += 1
+    data["document_ids"].append(item["data"].get("document_id"))
+    if len(data["titles"]) < 5:
+        data["titles"].append(item["data"].get("title"))
+    data["timestamp"] = item["data"].get("timestamp")
+
+    return {"id": item["id"], "event": batch["event"], "data": data}
+
+
+def _resync_item(last_event_id: Optional[int], reason: str) -> Dict[str, Any]:
+    return {
+        "id": last_event_id,
+        "event": "resync",
+        "data": {
+            "reason": reason,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    }
+
+
+def coalesce(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Coalesce a list of events the same way live bursts are coalesced.
+    """
+    result: List[Dict[str, Any]] = []
+    previous_key = None
+
+    for item in items:
+        key = _coalesce_key(item)
+        if key is not None and key == previous_key:
+            result[-1] = _merge(result[-1], item)
+        else:
+            result.append(item)
+        previous_key = key
+
+    return result
+
+
+class SSEConnection:
+    """
+    One open /sse/updates stream with a bounded outbound queue.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, user_id: str, max_queue: int):
+        self.id = next(self._ids)
+        self.user_id = user_id
+        self.connected_at = datetime.utcnow()
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.closed = False
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Dict[str, Any]) -> int:
+        """
+        Queue an event. Returns the number of events dropped to make room.
+        """
+        if self.closed:
+            return 0
+
+        dropped = 0
+        if len(self._items) >= self.max_queue:
+            # Slow consumer: it can no longer catch up event by event, so
+            # compact the backlog into one resync signal.
+            dropped = len(self._items)
+            self.dropped += dropped
+            self._items.clear()
+            item = _resync_item(item.get("id"), "backlog")
+
+        self._items.append(item)
+        self._ready.set()
+        return dropped
+
+    def close(self, reason: str):
+        """
+        Send a final event and end the stream once drained.
+        """
+        if self.closed:
+            return
+        self._items.append({
+            "id": None,
+            "event": "close",
+            "data": {"reason": reason, "timestamp": datetime.utcnow().isoformat()}
+        })
+        self.closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Next queued event, or None if nothing arrived within `timeout`.
+        """
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._items.popleft()
+
+    @property
+    def finished(self) -> bool:
+        return self.closed and not self._items
+
+
+class SSEConnectionManager:
+    """
+    Tracks SSE streams per user on top of the event broker.
+
+    - One broker subscription per user, shared by all of the user's tabs
+    - At most SSE_MAX_CONNECTIONS_PER_USER streams; the oldest is closed
+    - Bursts (e.g. bulk document sync) coalesced into one event per case
+    - Bounded per-connection queues that compact into a resync signal
+    """
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self._connections: Dict[str, List[SSEConnection]] = {}
+        self._pending: Dict[str, Tuple[str, Dict[str, Any]]] = {}  # user -> (coalesce key, batch)
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+
+        # Counters for /sse/metrics
+        self.events_delivered = 0
+        self.events_coalesced = 0
+        self.events_dropped = 0
+        self.connections_evicted = 0
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle (called on the event loop)
+    # ------------------------------------------------------------------
+
+    def connect(self, user_id: str, last_event_id: Optional[int] = None) -> SSEConnection:
+        """
+        Open a stream for `user_id`, replaying anything after `last_event_id`.
+        """
+        connections = self._connections.setdefault(user_id, [])
+
+        if connections:
+            missed, resync = self.broker.replay(user_id, last_event_id)
+        else:
+            missed, resync = self.broker.subscribe(user_id, self._on_event, last_event_id)
+
+        while len(connections) >= settings.SSE_MAX_CONNECTIONS_PER_USER:
+            oldest = connections.pop(0)
+            oldest.close("superseded")
+            self.connections_evicted += 1
+            logger.info(f"Closed oldest SSE stream {oldest.id} for user {user_id}")
+
+        connection = SSEConnection(user_id, settings.SSE_QUEUE_SIZE)
+
+        if resync:
+            connection.put(_resync_item(self.broker.latest_event_id(user_id), "gap"))
+        for item in coalesce(missed):
+            connection.put(item)
+
+        connections.append(connection)
+        return connection
+
+    def disconnect(self, connection: SSEConnection):
+        """
+        Forget a stream; drop the broker subscription with the last one.
+        """
+        user_id = connection.user_id
+        connections = self._connections.get(user_id)
+        if connections is None:
+            return
+
+        if connection in connections:
+            connections.remove(connection)
+
+        if not connections:
+            del self._connections[user_id]
+            self.broker.unsubscribe(user_id, self._on_event)
+            handle = self._flush_handles.pop(user_id, None)
+            if handle is not None:
+                handle.cancel()
+            self._pending.pop(user_id, None)
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    def _on_event(self, user_id: str, item: Dict[str, Any]):
+        key = _coalesce_key(item)
+        pending = self._pending.get(user_id)
+
+        if pending is not None and pending[0] != key:
+            # Keep ordering: anything held back goes out first
+            self._flush(user_id)
+            pending = None
+
+        if key is None:
+            self._deliver(user_id, item)
+            return
+
+        if pending is not None:
+            self._pending[user_id] = (key, _merge(pending[1], item))
+            self.events_coalesced += 1
+        else:
+            self._pending[user_id] = (key, item)
+
+        if user_id not in self._flush_handles:
+            loop = asyncio.get_running_loop()
+            self._flush_handles[user_id] = loop.call_later(
+                settings.SSE_COALESCE_WINDOW_SECONDS, self._flush, user_id
+            )
+
+    def _flush(self, user_id: str):
+        handle = self._flush_handles.pop(user_id, None)
+        if handle is not None:
+            handle.cancel()
+
+        pending = self._pending.pop(user_id, None)
+        if pending is not None:
+            self._deliver(user_id, pending[1])
+
+    def _deliver(self, user_id: str, item: Dict[str, Any]):
+        for connection in self._connections.get(user_id, ()):
+            self.events_dropped += connection.put(item)
+            self.events_delivered += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Connection counts and queue depths for monitoring.
+        """
+        depths = [
+            connection.depth
+            for connections in self._connections.values()
+            for connection in connections
+        ]
+
+        return {
+            "users": len(self._connections),
+            "connections": len(depths),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "pending_batches": len(self._pending),
+            "events_delivered": self.events_delivered,
+            "events_coalesced": self.events_coalesced,
+            "events_dropped": self.events_dropped,
+            "connections_evicted": self.connections_evicted
+        }
+
+
+# Singleton instance
+sse_manager = SSEConnectionManager(event_broker)
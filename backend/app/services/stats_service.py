@@ -0,0 +1,347 @@
+"""
+Case & document statistics shared by the dashboard, case, document and
+subscription endpoints.
+
+Statistics are read from the `advocate_stats` rollup table, which write
+paths keep current with counter deltas (`record_change`) and a periodic
+job repairs (`reconcile_advocate`, see app/workers/stats_reconciler.py).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from app.db.models import AdvocateStats, Case, Document
+from app.core.logger import logger
+from app.services import calendar_service
+
+# Rollup dimensions
+CASE_STATUS = "case_status"              # visible cases by status
+CASE_TYPE = "case_type"                  # visible cases by type
+CASE_MONTH = "case_month"                # all cases by creation month (YYYY-MM)
+DOCUMENT_CATEGORY = "document_category"  # documents by category, with bytes
+DOCUMENT_STATUS = "document_status"      # documents by upload status
+META = "meta"                            # ("meta", "reconciled") marks a populated rollup
+
+Counters = Dict[Tuple[str, str], Tuple[int, int]]
+
+
+def _key(value) -> str:
+    return str(getattr(value, 'value', value))
+
+
+# ============================================================================
+# Counter deltas (write paths)
+# ============================================================================
+
+def case_counters(case: Case) -> Counters:
+    """
+    Rollup counters a case contributes to, for use with `record_change`.
+    """
+    created_at = case.created_at or datetime.utcnow()
+    counters = {(CASE_MONTH, created_at.strftime('%Y-%m')): (1, 0)}
+
+    if case.is_visible is not False:
+        counters[(CASE_STATUS, _key(case.status))] = (1, 0)
+        counters[(CASE_TYPE, _key(case.case_type))] = (1, 0)
+
+    return counters
+
+
+def document_counters(document: Document) -> Counters:
+    """
+    Rollup counters a document contributes to, for use with `record_change`.
+    """
+    return {
+        (DOCUMENT_CATEGORY, _key(document.category)): (1, document.file_size or 0),
+        (DOCUMENT_STATUS, _key(document.upload_status or 'pending')): (1, 0)
+    }
+
+
+def record_change(
+    db: Session,
+    advocate_id,
+    before: Optional[Counters] = None,
+    after: Optional[Counters] = None
+):
+    """
+    Apply the difference between two counter snapshots to the rollup.
+
+    Runs in the caller's transaction, so the deltas commit (or roll
+    back) together with the write they describe.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for key, (count, size) in (after or {}).items():
+        deltas[key][0] += count
+        deltas[key][1] += size
+    for key, (count, size) in (before or {}).items():
+        deltas[key][0] -= count
+        deltas[key][1] -= size
+
+    now = datetime.utcnow()
+    # Sorted so concurrent writers lock rollup rows in the same order
+    values = [
+        {
+            "advocate_id": advocate_id,
+            "dimension": dimension,
+            "key": key,
+            "count": count,
+            "total_bytes": size,
+            "updated_at": now
+        }
+        for (dimension, key), (count, size) in sorted(deltas.items())
+        if count or size
+    ]
+
+    if not values:
+        return
+
+    stmt = insert(AdvocateStats).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AdvocateStats.advocate_id, AdvocateStats.dimension, AdvocateStats.key],
+        set_={
+            "count": AdvocateStats.count + stmt.excluded.count,
+            "total_bytes": AdvocateStats.total_bytes + stmt.excluded.total_bytes,
+            "updated_at": stmt.excluded.updated_at
+        }
+    )
+    db.execute(stmt)
+
+
+# ============================================================================
+# Reconciliation
+# ============================================================================
+
+def compute_counters(db: Session, advocate_id) -> Counters:
+    """
+    Recompute every rollup counter for an advocate from the source tables.
+
+    Two round trips: GROUPING SETS over the advocate's cases and over
+    their documents.
+    """
+    counters: Counters = {}
+
+    month = func.to_char(Case.created_at, 'YYYY-MM')
+    case_rows = db.execute(
+        select(
+            Case.status,
+            Case.case_type,
+            month.label('month'),
+            func.grouping(Case.status).label('by_status'),
+            func.grouping(Case.case_type).label('by_type'),
+            func.count().label('all_cases'),
+            func.count().filter(Case.is_visible == True).label('visible_cases')
+        ).where(
+            Case.advocate_id == advocate_id
+        ).group_by(
+            func.grouping_sets(
+                tuple_(Case.status),
+                tuple_(Case.case_type),
+                tuple_(month)
+            )
+        )
+    ).all()
+
+    for row in case_rows:
+        if row.by_status == 0:
+            if row.visible_cases:
+                counters[(CASE_STATUS, _key(row.status))] = (row.visible_cases, 0)
+        elif row.by_type == 0:
+            if row.visible_cases:
+                counters[(CASE_TYPE, _key(row.case_type))] = (row.visible_cases, 0)
+        else:
+            counters[(CASE_MONTH, row.month)] = (row.all_cases, 0)
+
+    document_rows = db.execute(
+        select(
+            Document.category,
+            Document.upload_status,
+            func.grouping(Document.category).label('by_category'),
+            func.count().label('documents'),
+            func.coalesce(func.sum(Document.file_size), 0).label('total_bytes')
+        ).join(
+            Case, Document.case_id == Case.id
+        ).where(
+            Case.advocate_id == advocate_id
+        ).group_by(
+            func.grouping_sets(
+                tuple_(Document.category),
+                tuple_(Document.upload_status)
+            )
+        )
+    ).all()
+
+    for row in document_rows:
+        if row.by_category == 0:
+            counters[(DOCUMENT_CATEGORY, _key(row.category))] = (row.documents, int(row.total_bytes))
+        else:
+            counters[(DOCUMENT_STATUS, _key(row.upload_status))] = (row.documents, 0)
+
+    counters[(META, "reconciled")] = (1, 0)
+    return counters
+
+
+def reconcile_advocate(db: Session, advocate_id) -> int:
+    """
+    Repair drift in an advocate's rollup. Returns the number of counters fixed.
+
+    Existing rollup rows are locked first, so concurrent deltas either
+    committed before the recount (and are included in it) or wait and
+    apply on top of the repaired values. The caller commits.
+    """
+    current: Counters = {
+        (row.dimension, row.key): (row.count, row.total_bytes)
+        for row in db.query(AdvocateStats).filter(
+            AdvocateStats.advocate_id == advocate_id
+        ).with_for_update().all()
+    }
+
+    actual = compute_counters(db, advocate_id)
+
+    changed = [key for key, value in actual.items() if current.get(key) != value]
+    stale = [key for key in current if key not in actual]
+
+    if changed:
+        now = datetime.utcnow()
+        stmt = insert(AdvocateStats).values([
+            {
+                "advocate_id": advocate_id,
+                "dimension": dimension,
+                "key": key,
+                "count": actual[(dimension, key)][0],
+                "total_bytes": actual[(dimension, key)][1],
+                "updated_at": now
+            }
+            for dimension, key in sorted(changed)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AdvocateStats.advocate_id, AdvocateStats.dimension, AdvocateStats.key],
+            set_={
+                "count": stmt.excluded.count,
+                "total_bytes": stmt.excluded.total_bytes,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt)
+
+    if stale:
+        db.query(AdvocateStats).filter(
+            AdvocateStats.advocate_id == advocate_id,
+            tuple_(AdvocateStats.dimension, AdvocateStats.key).in_(stale)
+        ).delete(synchronize_session=False)
+
+    fixed = len(changed) + len(stale)
+    # The first population of a rollup is not drift
+    if fixed and (META, "reconciled") in current:
+        logger.warning(f"Reconciled {fixed} drifted stats counters for advocate {advocate_id}")
+
+    return fixed
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def _load(db: Session, advocate_id, *columns) -> Tuple[Dict[str, Dict[str, Tuple[int, int]]], Tuple[Any, ...]]:
+    """
+    Read an advocate's rollup, populating it on first use.
+
+    Extra scalar `columns` are selected in the same round trip and
+    returned alongside the rollup.
+    """
+    rows = db.query(
+        AdvocateStats.dimension,
+        AdvocateStats.key,
+        AdvocateStats.count,
+        AdvocateStats.total_bytes,
+        *columns
+    ).filter(
+        AdvocateStats.advocate_id == advocate_id
+    ).all()
+
+    if not rows:
+        reconcile_advocate(db, advocate_id)
+        db.commit()
+        return _load(db, advocate_id, *columns)
+
+    rollup = defaultdict(dict)
+    for dimension, key, count, total_bytes, *_ in rows:
+        # Counters can dip below zero until the next reconciliation
+        rollup[dimension][key] = (max(count, 0), max(total_bytes, 0))
+    return rollup, tuple(rows[0][4:])
+
+
+def get_case_stats(db: Session, advocate_id) -> Dict[str, Any]:
+    """
+    Dashboard statistics: the rollup read, with the upcoming hearing
+    count selected in the same round trip.
+    """
+    now = datetime.now()
+    rollup, (upcoming_hearings,) = _load(
+        db,
+        advocate_id,
+        calendar_service.hearing_count(advocate_id, now, now + timedelta(days=7))
+    )
+
+    cases_by_status = {k: c for k, (c, _) in rollup[CASE_STATUS].items() if c}
+    cases_by_type = {k: c for k, (c, _) in rollup[CASE_TYPE].items() if c}
+
+    # Monthly trend (last 6 months)
+    first_month = (now - timedelta(days=180)).strftime('%Y-%m')
+    monthly_trend = [
+        {"month": datetime.strptime(month, '%Y-%m').strftime('%b'), "count": count}
+        for month, (count, _) in sorted(rollup[CASE_MONTH].items())
+        if month >= first_month and count
+    ]
+
+    return {
+        "total_cases": sum(cases_by_status.values()),
+        "pending_cases": cases_by_status.get('pending', 0),
+        "disposed_cases": cases_by_status.get('disposed', 0),
+        "upcoming_hearings": upcoming_hearings,
+        "total_documents": sum(c for c, _ in rollup[DOCUMENT_CATEGORY].values()),
+        "cases_by_status": cases_by_status,
+        "cases_by_type": cases_by_type,
+        "monthly_trend": monthly_trend
+    }
+
+
+def get_document_stats(db: Session, advocate_id) -> Dict[str, Any]:
+    """
+    Document counts and storage by category and upload status.
+    """
+    rollup, _ = _load(db, advocate_id)
+
+    by_category = {
+        category: {"count": count, "size": size}
+        for category, (count, size) in rollup[DOCUMENT_CATEGORY].items()
+        if count
+    }
+    total_storage = sum(c["size"] for c in by_category.values())
+
+    return {
+        "by_category": by_category,
+        "by_status": {
+            status: count
+            for status, (count, _) in rollup[DOCUMENT_STATUS].items()
+            if count
+        },
+        "total_documents": sum(c["count"] for c in by_category.values()),
+        "total_storage_bytes": total_storage,
+        "total_storage_mb": round(total_storage / (1024 * 1024), 2)
+    }
+
+
+def get_usage_counts(db: Session, advocate_id) -> Dict[str, int]:
+    """
+    Case, document and storage totals for billing.
+    """
+    rollup, _ = _load(db, advocate_id)
+
+    return {
+        "cases_count": sum(c for c, _ in rollup[CASE_STATUS].values()),
+        "documents_count": sum(c for c, _ in rollup[DOCUMENT_CATEGORY].values()),
+        "storage_bytes": sum(b for _, b in rollup[DOCUMENT_CATEGORY].values())
+    }
@@ -6,7 +6,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import uuid
 
-from app.db.models import User, Case, Document
+from app.db.models import User
+from app.services.usage_service import usage_meter
 
 
 def get_subscription(db: Session, user_id: str):
@@ -100,39 +101,7 @@ def get_usage_stats(db: Session, user_id: str):
     """
     Calculate current usage statistics
     """
-    now = datetime.now()
-    period_start = datetime(now.year, now.month, 1)  # First day of month
-    
-    # Count cases
-    cases_count = db.query(Case).filter(
-        Case.advocate_id == user_id,
-        Case.is_visible == True
-    ).count()
-    
-    # Count documents
-    documents_count = db.query(Document).join(Case).filter(
-        Case.advocate_id == user_id
-    ).count()
-    
-    # Calculate storage (mock - sum file_size from documents)
-    storage_query = db.query(Document).join(Case).filter(
-        Case.advocate_id == user_id
-    ).all()
-    
-    storage_bytes = sum(doc.file_size for doc in storage_query)
-    storage_gb = storage_bytes / (1024 ** 3)  # Convert to GB
-    
-    # AI analyses this month (mock - would query ai_analyses table)
-    ai_analyses_used = 5  # Mock value
-    
-    return {
-        "cases_count": cases_count,
-        "documents_count": documents_count,
-        "storage_used_gb": round(storage_gb, 2),
-        "ai_analyses_used": ai_analyses_used,
-        "period_start": period_start.isoformat(),
-        "period_end": now.isoformat()
-    }
+    return usage_meter.get_usage(db, user_id)
 
 
 def get_invoices(db: Session, user_id: str):
@@ -170,7 +139,9 @@ def cancel_subscription(db: Session, user_id: str, reason: str = None):
     Cancel subscription
     """
     # In production, update subscription status in database
-    pass
+    
+    # The billing period, and so the reported usage, follows the plan
+    usage_meter.invalidate(user_id)
 
 
 def update_payment_method(db: Session, user_id: str, payment_method: str):
@@ -0,0 +1,102 @@
+# app/services/usage_service.py
+"""
+Usage metering for billing: cases, documents, storage and AI analyses
+for the current billing period.
+
+Case, document and storage totals come from the advocate_stats rollup;
+AI analyses are a single indexed COUNT over ai_analyses. Results are
+cached per user for USAGE_CACHE_TTL_SECONDS.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import AIAnalysis
+from app.services import stats_service
+
+
+def billing_period(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Current billing period: first day of the month until now.
+    """
+    now = now or datetime.now()
+    return datetime(now.year, now.month, 1), now
+
+
+def count_ai_analyses(db: Session, user_id, period_start: datetime, period_end: datetime) -> int:
+    """
+    Completed AI analyses processed within the period.
+    """
+    return db.query(func.count(AIAnalysis.id)).filter(
+        AIAnalysis.advocate_id == user_id,
+        AIAnalysis.status == "completed",
+        AIAnalysis.processed_at >= period_start,
+        AIAnalysis.processed_at <= period_end
+    ).scalar() or 0
+
+
+class UsageMeter:
+    """
+    Per-user usage with a short-lived, bounded cache.
+    """
+
+    def __init__(self, ttl: int = settings.USAGE_CACHE_TTL_SECONDS, max_entries: int = settings.USAGE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_usage(self, db: Session, user_id) -> Dict[str, Any]:
+        """
+        Usage for the current billing period (see schemas.UsageStats).
+        """
+        key = str(user_id)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        usage = self._compute(db, user_id)
+
+        with self._lock:
+            self._cache[key] = (now + self.ttl, usage)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return usage
+
+    def invalidate(self, user_id):
+        """
+        Drop a user's cached usage after a change it reports: a
+        completed analysis, a registered or deleted document, a plan
+        change.
+        """
+        with self._lock:
+            self._cache.pop(str(user_id), None)
+
+    def _compute(self, db: Session, user_id) -> Dict[str, Any]:
+        period_start, period_end = billing_period()
+        counts = stats_service.get_usage_counts(db, user_id)
+
+        return {
+            "cases_count": counts["cases_count"],
+            "documents_count": counts["documents_count"],
+            "storage_used_gb": round(counts["storage_bytes"] / (1024 ** 3), 2),
+            "ai_analyses_used": count_ai_analyses(db, user_id, period_start, period_end),
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat()
+        }
+
+
+# Singleton instance
+usage_meter = UsageMeter()
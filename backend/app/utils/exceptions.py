@@ -55,4 +55,42 @@ class AIServiceError(HTTPException):
         super().__init__(
             status_code=503,
             detail=f"AI service error: {reason}"
+        )
+
+
+class InvalidCursorError(HTTPException):
+    """Raised when a pagination cursor is malformed or doesn't match the query"""
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            detail="Invalid or expired pagination cursor"
+        )
+
+
+class TooManyAttemptsError(HTTPException):
+    """Raised when an account has too many failed or concurrent login attempts"""
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=429,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class ServiceBusyError(HTTPException):
+    """Raised when a bounded worker queue is full"""
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=503,
+            detail="Server is busy. Try again shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class InvalidRefreshTokenError(HTTPException):
+    """Raised when a refresh token is unknown, expired, revoked or reused"""
+    def __init__(self):
+        super().__init__(
+            status_code=401,
+            detail="Invalid or expired refresh token"
         )
\ No newline at end of file
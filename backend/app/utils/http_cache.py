@@ -0,0 +1,48 @@
+"""
+Conditional GET helpers (weak ETags / If-None-Match)
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+# Clients may reuse a response only after revalidating it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag from validator parts (ids, timestamps, counts, query params)"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Validator headers for a response built by hand"""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validator"""
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def set_etag(response: Response, etag: str):
+    """Attach the validator to a full response"""
+    response.headers.update(etag_headers(etag))
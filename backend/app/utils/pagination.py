@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is an opaque, URL-safe token holding the sort field, order
+and the (sort value, id) of the last row on the page. The next page
+continues strictly after that row, so deep pages cost the same as the
+first and concurrent inserts don't shift or duplicate rows.
+
+DynamoDB queries paginate the same way: `encode_key_cursor` wraps the
+LastEvaluatedKey of a page as an opaque cursor.
+
+Every cursor-paginated endpoint responds with the same envelope,
+`cursor_page` (schemas.CursorPage): items, limit and next_cursor.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.utils.exceptions import InvalidCursorError
+
+
+def encode_cursor(sort: str, order: str, value: Any, row_id: Any) -> str:
+    """Encode the position after a row as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps([sort, order, value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, UUID]:
+    """Decode a cursor produced by `encode_cursor` for the same sort and order"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        row_id = UUID(row_id)
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError()
+
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise InvalidCursorError()
+
+    return value, row_id
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    sort: str,
+    order: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (sort_column, id_column).
+
+    Returns the rows and the cursor for the next page (None on the last page).
+    `sort_column` must be NOT NULL; pair it with an index on
+    (..., sort_column, id_column) for an index-only range scan.
+    """
+    descending = order == "desc"
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort, order)
+        position = tuple_(sort_column, id_column)
+        query = query.filter(
+            position < tuple_(value, row_id) if descending else position > tuple_(value, row_id)
+        )
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, order, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
+
+
+def cursor_page(items: List[Any], limit: int, next_cursor: Optional[str]) -> Dict[str, Any]:
+    """The response body for one page; next_cursor is None on the last page"""
+    return {
+        "items": items,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
+
+
+def encode_key_cursor(scope: str, key: Dict[str, Any]) -> str:
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque cursor. `scope`
+    identifies the query it belongs to (decoding checks it).
+    """
+    key = {name: {"n": str(value)} if isinstance(value, Decimal) else value for name, value in key.items()}
+    payload = json.dumps([scope, key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_key_cursor(cursor: str, scope: str) -> Dict[str, Any]:
+    """ExclusiveStartKey from a cursor produced by `encode_key_cursor` for the same scope"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_scope, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursorError()
+
+    if cursor_scope != scope or not isinstance(key, dict):
+        raise InvalidCursorError()
+
+    try:
+        return {name: Decimal(value["n"]) if isinstance(value, dict) else value for name, value in key.items()}
+    except (ArithmeticError, KeyError, TypeError):
+        raise InvalidCursorError()
@@ -0,0 +1,31 @@
+"""
+Fast JSON path for list endpoints
+
+List endpoints select only the columns of their response schema, turn
+the rows into plain dicts and encode them with orjson, skipping ORM
+hydration, per-row Pydantic validation and jsonable_encoder. orjson
+serializes UUID, datetime and Enum values natively, matching the
+Pydantic output.
+"""
+from typing import Any, Iterable, List, Dict, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+__all__ = ["ORJSONResponse", "columns_for", "rows_to_dicts"]
+
+
+def columns_for(model, schema: Type[BaseModel]) -> List[Any]:
+    """ORM columns for every field of `schema`, in schema order"""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_to_dicts(rows: Iterable[Any], exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """Column-tuple rows (from db.query(*columns)) as plain dicts, without the `exclude` columns"""
+    exclude = set(exclude)
+    if not exclude:
+        return [row._asdict() for row in rows]
+    return [
+        {name: value for name, value in row._asdict().items() if name not in exclude}
+        for row in rows
+    ]
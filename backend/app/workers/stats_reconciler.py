@@ -0,0 +1,79 @@
+# app/workers/stats_reconciler.py
+"""
+Periodic repair of the advocate_stats rollup.
+
+Write paths keep the rollup current with counter deltas; this job
+recounts every advocate from the source tables and fixes any drift
+(e.g. rows changed outside the API). Runs in-process from app startup
+every STATS_RECONCILE_INTERVAL_SECONDS, or once from the command line:
+
+    python -m app.workers.stats_reconciler
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.database import engine
+from app.db.models import User
+from app.services import stats_service
+
+# pg advisory lock key, so only one worker process reconciles at a time
+RECONCILE_LOCK_ID = 0x7374_6174  # "stat" in ASCII
+
+
+def run_reconciliation() -> int:
+    """
+    Reconcile every advocate's rollup. Returns the number of counters fixed,
+    or -1 if another process holds the reconciliation lock.
+    """
+    with engine.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:id)"), {"id": RECONCILE_LOCK_ID}
+        ).scalar()
+        conn.commit()
+
+        if not acquired:
+            logger.info("Stats reconciliation already running elsewhere, skipping")
+            return -1
+
+        fixed = 0
+        advocates = 0
+        try:
+            with Session(bind=conn) as db:
+                user_ids = [row.id for row in db.query(User.id).all()]
+                db.commit()
+
+                for user_id in user_ids:
+                    try:
+                        fixed += stats_service.reconcile_advocate(db, user_id)
+                        db.commit()
+                        advocates += 1
+                    except Exception as e:
+                        db.rollback()
+                        logger.error(f"Stats reconciliation failed for advocate {user_id}: {str(e)}")
+
+            logger.info(f"Stats reconciliation: {advocates} advocates, {fixed} counters fixed")
+            return fixed
+
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": RECONCILE_LOCK_ID})
+            conn.commit()
+
+
+async def reconcile_periodically(interval: int = settings.STATS_RECONCILE_INTERVAL_SECONDS):
+    """
+    Run `run_reconciliation` every `interval` seconds off the event loop.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(run_reconciliation)
+        except Exception as e:
+            logger.error(f"Stats reconciliation error: {str(e)}")
+
+
+if __name__ == "__main__":
+    run_reconciliation()
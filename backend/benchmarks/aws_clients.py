@@ -0,0 +1,41 @@
+"""
+Presigned upload URL latency, boto3 client built per request vs the
+shared client from app.core.aws. Signing is local; no AWS calls are made.
+
+    cd backend && python -m benchmarks.aws_clients
+"""
+import timeit
+
+import boto3
+
+from app.core.aws import aws_clients
+from app.core.config import settings
+
+ROUNDS = 200
+
+PARAMS = {"Bucket": settings.S3_BUCKET_NAME, "Key": "KHC/WP(C) 1/2024/doc.pdf", "ContentType": "application/pdf"}
+
+
+def client_per_request():
+    client = boto3.client(
+        "s3",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+    )
+    client.generate_presigned_url("put_object", Params=PARAMS, ExpiresIn=900)
+
+
+def shared_client():
+    aws_clients.client("s3").generate_presigned_url("put_object", Params=PARAMS, ExpiresIn=900)
+
+
+def main():
+    shared_client()  # Build the shared client outside the timing
+    for name, fn in (("client per request", client_per_request), ("shared client", shared_client)):
+        seconds = timeit.timeit(fn, number=ROUNDS)
+        print(f"{name:<20} {seconds / ROUNDS * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Case listing page latency by depth on 100k seeded cases: OFFSET paging
+vs keyset (cursor) paging, both ordered by (updated_at, id) desc.
+
+Needs PostgreSQL (DATABASE_URL) with the migrations applied; the seeded
+rows are rolled back at the end.
+
+    cd backend && python -m benchmarks.case_keyset
+"""
+import timeit
+
+from app.api.v1.endpoints.cases import CASE_LIST_COLUMNS
+from app.db.models import Case
+from app.utils.pagination import encode_cursor, paginate_keyset
+from benchmarks.seed import rolled_back_session, seed_advocate
+
+CASES = 100_000
+PER_PAGE = 20
+ROUNDS = 20
+PAGES = (1, 10, 100, 1000, CASES // PER_PAGE)
+
+
+def main():
+    with rolled_back_session() as db:
+        advocate_id = seed_advocate(db, CASES)
+        query = db.query(*CASE_LIST_COLUMNS).filter(
+            Case.advocate_id == advocate_id,
+            Case.is_visible == True
+        )
+        ordered = query.order_by(Case.updated_at.desc(), Case.id.desc())
+
+        print(f"{'page':>6} {'offset':>10} {'keyset':>10}")
+        for page in PAGES:
+            skip = (page - 1) * PER_PAGE
+
+            # The cursor a client would hold after reading the previous page
+            cursor = None
+            if skip:
+                last = ordered.offset(skip - 1).limit(1).one()
+                cursor = encode_cursor("updated_at", "desc", last.updated_at, last.id)
+
+            def offset():
+                ordered.offset(skip).limit(PER_PAGE).all()
+
+            def keyset():
+                paginate_keyset(query, Case.updated_at, Case.id, "updated_at", "desc", PER_PAGE, cursor)
+
+            timings = [timeit.timeit(fn, number=ROUNDS) / ROUNDS * 1e3 for fn in (offset, keyset)]
+            print(f"{page:>6} {timings[0]:8.2f} ms {timings[1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
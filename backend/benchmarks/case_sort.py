@@ -0,0 +1,44 @@
+"""
+First-page latency of GET /cases for every sort field as an advocate's
+case count grows. With the (advocate_id, is_visible, <field>, id)
+indexes a page is read in index order, so the time should stay roughly
+flat instead of growing with the number of cases sorted.
+
+Needs PostgreSQL (DATABASE_URL) with the migrations applied; the seeded
+rows are rolled back at the end.
+
+    cd backend && python -m benchmarks.case_sort
+"""
+import timeit
+
+from app.api.v1.endpoints.cases import CASE_LIST_COLUMNS, SORT_FIELDS
+from app.db.models import Case
+from benchmarks.seed import rolled_back_session, seed_advocate
+
+VOLUMES = (1000, 10_000, 100_000)
+PER_PAGE = 20
+ROUNDS = 50
+
+
+def main():
+    with rolled_back_session() as db:
+        advocates = {cases: seed_advocate(db, cases) for cases in VOLUMES}
+
+        print(f"{'sort':<18}" + "".join(f"{cases:>12,}" for cases in VOLUMES) + f"{'growth':>9}")
+        for name, column in SORT_FIELDS.items():
+            timings = []
+            for cases in VOLUMES:
+                query = db.query(*CASE_LIST_COLUMNS).filter(
+                    Case.advocate_id == advocates[cases],
+                    Case.is_visible == True
+                ).order_by(column.desc(), Case.id.desc()).limit(PER_PAGE)
+
+                seconds = timeit.timeit(query.all, number=ROUNDS)
+                timings.append(seconds / ROUNDS * 1e3)
+
+            cells = "".join(f"{ms:9.2f} ms" for ms in timings)
+            print(f"{name:<18}{cells}{timings[-1] / timings[0]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+GET /cases page latency (query + serialization, per_page=100), p50/p99:
+ORM objects validated into CaseResponse and encoded with the standard
+JSON encoder (the old response_model path) vs column tuples encoded
+with orjson (the list endpoints now).
+
+Needs PostgreSQL (DATABASE_URL) with the migrations applied; the seeded
+rows are rolled back at the end.
+
+    cd backend && python -m benchmarks.list_serialization
+"""
+import statistics
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.v1.endpoints.cases import CASE_LIST_COLUMNS
+from app.db.models import Case
+from app.db.schemas import CaseResponse
+from app.utils.responses import ORJSONResponse, rows_to_dicts
+from benchmarks.seed import rolled_back_session, seed_advocate
+
+CASES = 5000
+PER_PAGE = 100
+ROUNDS = 500
+
+
+class OrmCaseResponse(CaseResponse):
+    # The ORM holds datetimes where CaseBase declares strings
+    efiling_date: datetime
+    next_hearing_date: Optional[datetime] = None
+
+
+def main():
+    with rolled_back_session() as db:
+        advocate_id = seed_advocate(db, CASES)
+        adapter = TypeAdapter(List[OrmCaseResponse])
+
+        def page(*entities):
+            return db.query(*entities).filter(
+                Case.advocate_id == advocate_id,
+                Case.is_visible == True
+            ).order_by(Case.updated_at.desc(), Case.id.desc()).limit(PER_PAGE).all()
+
+        def response_model():
+            db.expunge_all()  # Hydrate fresh objects, as a new request would
+            cases = adapter.validate_python(page(Case), from_attributes=True)
+            return JSONResponse(jsonable_encoder(cases)).body
+
+        def column_tuples():
+            return ORJSONResponse(rows_to_dicts(page(*CASE_LIST_COLUMNS))).body
+
+        for name, fn in (("ORM + response_model", response_model), ("columns + orjson", column_tuples)):
+            fn()  # Warm up
+            samples = []
+            for _ in range(ROUNDS):
+                started = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - started) * 1e3)
+            percentiles = statistics.quantiles(samples, n=100)
+            print(f"{name:<22} p50 {percentiles[49]:7.2f} ms   p99 {percentiles[98]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Seeded advocates for the database benchmarks (PostgreSQL, DATABASE_URL,
+migrations applied). Everything is inserted in one transaction that is
+rolled back afterwards, so the database is left as it was.
+"""
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.db.models import Case, CasePartyRole, CaseStatus, User, UserRole
+
+CHUNK = 10000
+
+STATUSES = list(CaseStatus)
+CASE_TYPES = ["WP(C)", "OP(C)", "CRL.A", "RSA", "MACA"]
+
+
+@contextmanager
+def rolled_back_session():
+    """A session whose writes are all discarded on exit"""
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        db = Session(bind=conn)
+        try:
+            yield db
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+def seed_advocate(db: Session, cases: int) -> uuid.UUID:
+    """An advocate with `cases` visible cases; returns their id"""
+    advocate_id = uuid.uuid4()
+    tag = advocate_id.hex[:12]
+    now = datetime.utcnow()
+
+    db.execute(insert(User).values(
+        id=advocate_id,
+        email=f"bench-{tag}@lawmate.invalid",
+        password_hash="!",
+        khc_advocate_id=f"BENCH/{tag}",
+        khc_advocate_name="Benchmark Advocate",
+        role=UserRole.advocate,
+        is_active=True,
+        is_verified=True,
+        preferences={},
+        created_at=now,
+        updated_at=now
+    ))
+
+    for first in range(0, cases, CHUNK):
+        db.execute(insert(Case), [
+            {
+                "id": uuid.uuid4(),
+                "advocate_id": advocate_id,
+                "case_number": f"{CASE_TYPES[n % len(CASE_TYPES)]} {n}/{2000 + n % 25}",
+                "efiling_number": f"BENCH/{tag}/{n}",
+                "case_type": CASE_TYPES[n % len(CASE_TYPES)],
+                "case_year": 2000 + n % 25,
+                "party_role": CasePartyRole.petitioner,
+                # Scrambled so name order differs from insertion order
+                "petitioner_name": f"Petitioner {n * 7919 % cases:06d}",
+                "respondent_name": "State of Kerala",
+                "efiling_date": now - timedelta(days=n % 3650),
+                "status": STATUSES[n % len(STATUSES)],
+                "next_hearing_date": now + timedelta(hours=n % 2000) if n % 3 else None,
+                "sync_status": "completed",
+                "is_visible": True,
+                "created_at": now - timedelta(minutes=n),
+                "updated_at": now - timedelta(minutes=n * 7919 % cases)
+            }
+            for n in range(first, min(first + CHUNK, cases))
+        ])
+
+    db.execute(text("ANALYZE cases"))
+    return advocate_id
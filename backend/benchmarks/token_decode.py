@@ -0,0 +1,41 @@
+"""
+Bearer token verification cost: key built per decode vs cached, and a
+request that looks its claims up three times (rate limiter,
+get_current_user, sync token check).
+
+    cd backend && python -m benchmarks.token_decode
+"""
+import timeit
+from datetime import timedelta
+from types import SimpleNamespace
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.tokens import request_claims, verify_token
+
+ROUNDS = 20000
+
+
+def main():
+    token = create_access_token({"sub": "00000000-0000-0000-0000-000000000000"}, timedelta(minutes=5))
+
+    def uncached_key():
+        jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+    def cached_key():
+        verify_token(token)
+
+    def memoized():
+        request = SimpleNamespace(state=SimpleNamespace())
+        for _ in range(3):
+            request_claims(request, token)
+
+    for name, fn in (("decode, key per call", uncached_key), ("decode, cached key", cached_key), ("request (3 lookups)", memoized)):
+        seconds = timeit.timeit(fn, number=ROUNDS)
+        print(f"{name:<22} {seconds / ROUNDS * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+-- prisma/migrations/[timestamp]_add_advocate_stats_table/migration.sql
+
+-- Per-advocate statistics rollup (dashboard, document stats, usage)
+CREATE TABLE advocate_stats (
+    advocate_id UUID NOT NULL,
+    dimension VARCHAR(50) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    total_bytes BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT advocate_stats_pkey PRIMARY KEY (advocate_id, dimension, key),
+    CONSTRAINT fk_advocate_stats_user FOREIGN KEY (advocate_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Rows are populated on first read and repaired by app/workers/stats_reconciler.py
@@ -0,0 +1,7 @@
+-- prisma/migrations/[timestamp]_add_auth_session_previous_token_hash/migration.sql
+
+-- The refresh token a session was last rotated from. Presented again
+-- within REFRESH_TOKEN_REUSE_GRACE_SECONDS (a retried request, two tabs
+-- refreshing at once) it gets the same new token instead of revoking
+-- the session.
+ALTER TABLE auth_sessions ADD COLUMN previous_token_hash VARCHAR(64);
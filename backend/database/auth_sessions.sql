@@ -0,0 +1,20 @@
+-- prisma/migrations/[timestamp]_add_auth_sessions_table/migration.sql
+
+-- One row per login; refresh tokens rotate in place (only a SHA-256 of
+-- the current secret is stored)
+CREATE TABLE auth_sessions (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL,
+    token_hash VARCHAR(64) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    rotated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP,
+    CONSTRAINT auth_sessions_pkey PRIMARY KEY (id),
+    CONSTRAINT fk_auth_session_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_auth_session_user ON auth_sessions(user_id);
+
+-- The revocation denylist reloads recent revocations every few seconds
+CREATE INDEX idx_auth_session_revoked ON auth_sessions(revoked_at) WHERE revoked_at IS NOT NULL;
@@ -0,0 +1,34 @@
+-- prisma/migrations/[timestamp]_add_case_full_text_search/migration.sql
+
+-- Trigram matching for partial case numbers ("WP(C) 123")
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- search_vector was a TEXT placeholder; make it a real tsvector
+ALTER TABLE cases
+    ALTER COLUMN search_vector TYPE tsvector USING NULL;
+
+-- Keep search_vector current on every write. "simple" config: party
+-- names and case numbers must not be stemmed.
+CREATE OR REPLACE FUNCTION cases_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.case_number, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.efiling_number, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.petitioner_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.respondent_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.judge_name, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_cases_search_vector
+    BEFORE INSERT OR UPDATE OF case_number, efiling_number, petitioner_name, respondent_name, judge_name
+    ON cases
+    FOR EACH ROW EXECUTE FUNCTION cases_search_vector_update();
+
+-- Backfill existing rows (fires the trigger)
+UPDATE cases SET case_number = case_number;
+
+CREATE INDEX idx_case_search ON cases USING gin(search_vector);
+CREATE INDEX idx_case_number_trgm ON cases USING gin(case_number gin_trgm_ops);
+CREATE INDEX idx_case_efiling_trgm ON cases USING gin(efiling_number gin_trgm_ops);
@@ -0,0 +1,10 @@
+-- prisma/migrations/[timestamp]_add_case_sort_indexes/migration.sql
+
+-- One (advocate_id, is_visible, <field>, id) index per sortable field of
+-- GET /cases (updated_at and created_at: keyset_pagination.sql), so every
+-- sort reads a page in index order instead of sorting all of an
+-- advocate's cases
+CREATE INDEX idx_case_sort_efiling ON cases(advocate_id, is_visible, efiling_date, id);
+CREATE INDEX idx_case_sort_petitioner ON cases(advocate_id, is_visible, petitioner_name, id);
+CREATE INDEX idx_case_sort_case_number ON cases(advocate_id, is_visible, case_number, id);
+CREATE INDEX idx_case_sort_hearing ON cases(advocate_id, is_visible, next_hearing_date, id);
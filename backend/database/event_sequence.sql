@@ -0,0 +1,6 @@
+-- prisma/migrations/[timestamp]_add_event_id_sequence/migration.sql
+
+-- Ids of real-time events (EventBroker.publish: nextval inside the
+-- publishing transaction), shared by every worker. Named after
+-- EVENTS_CHANNEL.
+CREATE SEQUENCE IF NOT EXISTS lawmate_events_id_seq;
@@ -0,0 +1,9 @@
+-- prisma/migrations/[timestamp]_add_hearing_calendar_index/migration.sql
+
+-- Calendar range and upcoming-hearing queries only ever look at visible
+-- cases with a hearing date, so index just those rows. Replaces the
+-- full (advocate_id, next_hearing_date) index.
+DROP INDEX IF EXISTS idx_case_advocate_hearing;
+
+CREATE INDEX idx_case_hearing_calendar ON cases(advocate_id, next_hearing_date)
+    WHERE is_visible AND next_hearing_date IS NOT NULL;
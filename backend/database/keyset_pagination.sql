@@ -0,0 +1,8 @@
+-- prisma/migrations/[timestamp]_add_keyset_pagination_indexes/migration.sql
+
+-- Cursor pagination of case listings: (sort key, id) per advocate
+CREATE INDEX idx_case_keyset_updated ON cases(advocate_id, is_visible, updated_at, id);
+CREATE INDEX idx_case_keyset_created ON cases(advocate_id, is_visible, created_at, id);
+
+-- Cursor pagination of documents within a case (newest first)
+CREATE INDEX idx_doc_keyset_created ON documents(case_id, created_at, id);
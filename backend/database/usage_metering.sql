@@ -0,0 +1,4 @@
+-- prisma/migrations/[timestamp]_add_ai_usage_index/migration.sql
+
+-- Usage metering: completed AI analyses per advocate per billing period
+CREATE INDEX idx_ai_advocate_processed ON ai_analyses(advocate_id, processed_at);
@@ -0,0 +1,176 @@
+# tests/integration/test_audit_trail.py
+
+import csv
+import io
+import json
+import pytest
+import boto3
+from datetime import datetime, timedelta
+from decimal import Decimal
+from moto import mock_dynamodb
+
+from app.core.config import settings
+from app.services.audit_events import AuditAction, AuditEvent
+from app.services.audit_service import audit_service
+
+@pytest.fixture
+def audit_table(monkeypatch):
+    """Mock audit table with the user_action index, wired into audit_service."""
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='ap-south-1')
+        table = dynamodb.create_table(
+            TableName='test-activity-trail',
+            KeySchema=[
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'user_id', 'AttributeType': 'S'},
+                {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+                {'AttributeName': 'user_action', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[{
+                'IndexName': settings.DYNAMODB_ACTION_INDEX_NAME,
+                'KeySchema': [
+                    {'AttributeName': 'user_action', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        monkeypatch.setattr(audit_service, "table", table)
+        yield table
+
+def put_event(table, user_id, action, moment, sequence=0):
+    """Write an event that happened at `moment` straight to the table."""
+    ms = int(moment.timestamp() * 1000)
+    event = AuditEvent(
+        user_id=str(user_id),
+        action=action,
+        timestamp=Decimal(f"{ms // 1000}.{ms % 1000:03d}00000{sequence:06d}"),
+        occurred_ms=ms,
+        metadata={"sequence": sequence}
+    )
+    table.meta.client.put_item(TableName=table.name, Item=event.to_attributes())
+    return event
+
+@pytest.fixture
+def trail(audit_table, test_user):
+    """Five events a day apart, alternating CASE_SYNC / DOCUMENT_ACCESS, oldest first."""
+    now = datetime.utcnow()
+    actions = [AuditAction.CASE_SYNC, AuditAction.DOCUMENT_ACCESS]
+    return [
+        put_event(audit_table, test_user.id, actions[i % 2], now - timedelta(days=5 - i), sequence=i)
+        for i in range(5)
+    ]
+
+class TestAuditQueries:
+    """AuditService reads against moto."""
+    
+    def test_query_newest_first(self, trail, test_user):
+        """Test a user's events come back newest first by default."""
+        items, last_key = audit_service.query_events(str(test_user.id))
+        
+        assert [item["metadata"]["sequence"] for item in items] == [4, 3, 2, 1, 0]
+        assert last_key is None
+    
+    def test_query_by_action_type(self, trail, test_user):
+        """Test action_type filtering reads the user_action index."""
+        items, _ = audit_service.query_events(str(test_user.id), action_type="DOCUMENT_ACCESS")
+        
+        assert [item["metadata"]["sequence"] for item in items] == [3, 1]
+        assert {item["action_type"] for item in items} == {"DOCUMENT_ACCESS"}
+    
+    def test_query_time_range(self, trail, test_user):
+        """Test start/end bound the sort key inclusively."""
+        start = datetime.utcnow() - timedelta(days=4, hours=1)
+        end = datetime.utcnow() - timedelta(days=1, hours=12)
+        
+        items, _ = audit_service.query_events(str(test_user.id), start, end, newest_first=False)
+        
+        assert [item["metadata"]["sequence"] for item in items] == [1, 2, 3]
+    
+    def test_iter_events_pages(self, trail, test_user, monkeypatch):
+        """Test iter_events follows LastEvaluatedKey across pages."""
+        pages = []
+        query = audit_service.table.query
+        
+        def record(**params):
+            response = query(**params)
+            pages.append(len(response["Items"]))
+            return response
+        
+        monkeypatch.setattr(audit_service.table, "query", record)
+        
+        events = list(audit_service.iter_events(str(test_user.id), newest_first=False, page_size=2))
+        
+        assert [event["metadata"]["sequence"] for event in events] == [0, 1, 2, 3, 4]
+        assert len(pages) >= 3
+        assert max(pages) <= 2
+
+class TestAuditEndpoints:
+    """Audit trail read API."""
+    
+    def test_events_cursor_pagination(self, client, auth_headers, trail):
+        """Test following next_cursor visits every event exactly once."""
+        sequences, cursor = [], None
+        for _ in range(10):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/v1/audit/events", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            body = response.json()
+            assert len(body["items"]) <= 2
+            sequences += [item["metadata"]["sequence"] for item in body["items"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        
+        assert sequences == [4, 3, 2, 1, 0]
+    
+    def test_cursor_bound_to_query(self, client, auth_headers, trail):
+        """Test a cursor can't resume a different query."""
+        response = client.get("/api/v1/audit/events", params={"limit": 2}, headers=auth_headers)
+        cursor = response.json()["next_cursor"]
+        
+        response = client.get(
+            "/api/v1/audit/events",
+            params={"limit": 2, "cursor": cursor, "action_type": "CASE_SYNC"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+    
+    def test_other_users_trail_forbidden(self, client, auth_headers, trail):
+        """Test advocates can only read their own trail."""
+        response = client.get(
+            "/api/v1/audit/events",
+            params={"user_id": "someone-else"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 403
+    
+    def test_export_ndjson(self, client, auth_headers, trail):
+        """Test the NDJSON export streams every event, oldest first."""
+        response = client.get("/api/v1/audit/events/export", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["metadata"]["sequence"] for event in events] == [0, 1, 2, 3, 4]
+    
+    def test_export_csv_by_action(self, client, auth_headers, trail):
+        """Test the CSV export with an action_type filter."""
+        response = client.get(
+            "/api/v1/audit/events/export",
+            params={"format": "csv", "action_type": "CASE_SYNC"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["action_type"] for row in rows] == ["CASE_SYNC"] * 3
+        assert [json.loads(row["metadata"])["sequence"] for row in rows] == [0, 2, 4]
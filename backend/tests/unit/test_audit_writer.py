@@ -0,0 +1,153 @@
+# tests/unit/test_audit_writer.py
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services import audit_writer as audit_writer_module
+from app.services.audit_events import AuditAction, AuditEvent
+from app.services.audit_spool import QUARANTINE_DIR, AuditSpool
+from app.services.audit_writer import AuditWriter
+
+class TestAuditWriter:
+    """Spool -> BatchWriteItem drain, against moto."""
+    
+    @pytest.fixture
+    def spool(self, tmp_path):
+        spool = AuditSpool(root=str(tmp_path), segment_seconds=3600)
+        spool.open()
+        yield spool
+        spool.close()
+    
+    @pytest.fixture
+    def batches(self, mock_dynamodb_table, monkeypatch):
+        """Item counts of every BatchWriteItem call"""
+        client = mock_dynamodb_table.meta.client
+        send = client.batch_write_item
+        calls = []
+        
+        def batch_write_item(RequestItems):
+            calls.append(len(RequestItems[mock_dynamodb_table.name]))
+            return send(RequestItems=RequestItems)
+        
+        monkeypatch.setattr(client, "batch_write_item", batch_write_item)
+        monkeypatch.setattr(audit_writer_module.time, "sleep", lambda seconds: None)
+        return calls
+    
+    def spool_events(self, spool, count, user_id="advocate-1"):
+        for _ in range(count):
+            spool.append(AuditEvent.create(user_id, AuditAction.CASE_SYNC, {"case_id": "c1"}))
+        spool.seal()
+    
+    def test_flush_batches_by_25(self, mock_dynamodb_table, spool, batches):
+        """Test a segment ships in BatchWriteItem groups of at most 25."""
+        self.spool_events(spool, 60)
+        writer = AuditWriter(mock_dynamodb_table, spool)
+        
+        assert writer.flush() == 60
+        
+        assert batches == [25, 25, 10]
+        assert mock_dynamodb_table.scan()["Count"] == 60
+        assert spool.sealed_segments() == []
+        assert writer.metrics()["written"] == 60
+    
+    def test_unprocessed_items_retried(self, mock_dynamodb_table, spool, batches, monkeypatch):
+        """Test UnprocessedItems are re-sent until written."""
+        self.spool_events(spool, 10)
+        client = mock_dynamodb_table.meta.client
+        send = client.batch_write_item
+        throttled = []
+        
+        def throttle_once(RequestItems):
+            requests = RequestItems[mock_dynamodb_table.name]
+            if throttled:
+                return send(RequestItems=RequestItems)
+            throttled.append(True)
+            send(RequestItems={mock_dynamodb_table.name: requests[:6]})
+            return {"UnprocessedItems": {mock_dynamodb_table.name: requests[6:]}}
+        
+        monkeypatch.setattr(client, "batch_write_item", throttle_once)
+        writer = AuditWriter(mock_dynamodb_table, spool)
+        
+        assert writer.flush() == 10
+        assert mock_dynamodb_table.scan()["Count"] == 10
+    
+    def test_unprocessed_items_keep_segment(self, mock_dynamodb_table, spool, batches, monkeypatch):
+        """Test a segment stays spooled while items remain unprocessed."""
+        self.spool_events(spool, 5)
+        client = mock_dynamodb_table.meta.client
+        monkeypatch.setattr(
+            client,
+            "batch_write_item",
+            lambda RequestItems: {"UnprocessedItems": RequestItems}
+        )
+        writer = AuditWriter(mock_dynamodb_table, spool)
+        
+        with pytest.raises(RuntimeError):
+            writer.flush()
+        
+        assert len(spool.sealed_segments()) == 1
+    
+    def test_duplicate_keys_in_segment(self, mock_dynamodb_table, spool, batches):
+        """Test a segment spooled twice (crash replay) still ships."""
+        event = AuditEvent.create("advocate-1", AuditAction.CASE_SYNC)
+        spool.append(event)
+        spool.append(event)
+        spool.seal()
+        writer = AuditWriter(mock_dynamodb_table, spool)
+        
+        writer.flush()
+        
+        assert batches == [1]
+        assert mock_dynamodb_table.scan()["Count"] == 1
+    
+    def test_poison_segment_quarantined(self, mock_dynamodb_table, spool, batches, monkeypatch, tmp_path):
+        """Test a segment DynamoDB keeps rejecting is quarantined while later ones ship."""
+        self.spool_events(spool, 3, user_id="poison")
+        self.spool_events(spool, 3, user_id="advocate-1")
+        client = mock_dynamodb_table.meta.client
+        send = client.batch_write_item
+        
+        def reject_poison(RequestItems):
+            for request in RequestItems[mock_dynamodb_table.name]:
+                if request["PutRequest"]["Item"]["user_id"]["S"] == "poison":
+                    raise ClientError(
+                        {"Error": {"Code": "ValidationException", "Message": "Item too large"}},
+                        "BatchWriteItem"
+                    )
+            return send(RequestItems=RequestItems)
+        
+        monkeypatch.setattr(client, "batch_write_item", reject_poison)
+        writer = AuditWriter(mock_dynamodb_table, spool, max_attempts=2)
+        
+        with pytest.raises(ClientError):
+            writer.flush()
+        assert mock_dynamodb_table.scan()["Count"] == 3
+        assert len(spool.sealed_segments()) == 1
+        
+        with pytest.raises(ClientError):
+            writer.flush()
+        
+        assert spool.sealed_segments() == []
+        assert len(list((tmp_path / QUARANTINE_DIR).iterdir())) == 1
+        assert writer.metrics()["segments_quarantined"] == 1
+    
+    def test_outage_quarantines_nothing(self, mock_dynamodb_table, spool, monkeypatch):
+        """Test segments survive repeated failures while the table is unreachable."""
+        self.spool_events(spool, 3)
+        self.spool_events(spool, 3)
+        
+        def unreachable(RequestItems):
+            raise ClientError(
+                {"Error": {"Code": "ServiceUnavailable", "Message": "Unavailable"}},
+                "BatchWriteItem"
+            )
+        
+        monkeypatch.setattr(mock_dynamodb_table.meta.client, "batch_write_item", unreachable)
+        writer = AuditWriter(mock_dynamodb_table, spool, max_attempts=2)
+        
+        for _ in range(4):
+            with pytest.raises(ClientError):
+                writer.flush()
+        
+        assert len(spool.sealed_segments()) == 2
+        assert writer.metrics()["segments_quarantined"] == 0
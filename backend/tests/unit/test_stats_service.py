@@ -0,0 +1,71 @@
+# tests/unit/test_stats_service.py
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.services import stats_service
+from app.db.models import AdvocateStats
+
+class TestStatsService:
+    """Unit tests for the dashboard statistics rollup."""
+    
+    @pytest.fixture
+    def rollup(self, db_session, test_user):
+        """A populated rollup, as left by reconciliation."""
+        month = datetime.utcnow().strftime('%Y-%m')
+        counters = {
+            (stats_service.CASE_STATUS, "pending"): (3, 0),
+            (stats_service.CASE_STATUS, "disposed"): (1, 0),
+            (stats_service.CASE_TYPE, "WP(C)"): (4, 0),
+            (stats_service.CASE_MONTH, month): (4, 0),
+            (stats_service.DOCUMENT_CATEGORY, "case_file"): (2, 2048),
+            (stats_service.DOCUMENT_STATUS, "completed"): (2, 0),
+            (stats_service.META, "reconciled"): (1, 0)
+        }
+        for (dimension, key), (count, total_bytes) in counters.items():
+            db_session.add(AdvocateStats(
+                advocate_id=test_user.id,
+                dimension=dimension,
+                key=key,
+                count=count,
+                total_bytes=total_bytes,
+                updated_at=datetime.utcnow()
+            ))
+        db_session.commit()
+        return counters
+    
+    def test_case_stats_from_rollup(self, db_session, test_user, test_case, rollup):
+        """Test dashboard statistics are read from the rollup."""
+        test_case.next_hearing_date = datetime.now() + timedelta(days=3)
+        db_session.commit()
+        
+        stats = stats_service.get_case_stats(db_session, test_user.id)
+        
+        assert stats["total_cases"] == 4
+        assert stats["pending_cases"] == 3
+        assert stats["disposed_cases"] == 1
+        assert stats["upcoming_hearings"] == 1
+        assert stats["total_documents"] == 2
+        assert stats["cases_by_type"] == {"WP(C)": 4}
+        assert [m["count"] for m in stats["monthly_trend"]] == [4]
+    
+    def test_case_stats_single_query(self, db_session, test_user, rollup, statements):
+        """Test dashboard statistics take one round trip."""
+        advocate_id = test_user.id  # Refreshes the expired user
+        statements.clear()
+        
+        stats_service.get_case_stats(db_session, advocate_id)
+        
+        assert len(statements) == 1
+    
+    def test_dashboard_stats_endpoint(self, client, auth_headers, test_user, rollup, statements):
+        """Test the dashboard endpoint adds no queries of its own."""
+        statements.clear()
+        response = client.get("/api/v1/dashboard/stats", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.json()["total_cases"] == 4
+        # Authentication may resolve the principal; the stats are one query
+        stats_queries = [s for s in statements if "advocate_stats" in s]
+        assert len(stats_queries) == 1
+        assert not [s for s in statements if "FROM cases" in s and "advocate_stats" not in s]
@@ -4,7 +4,8 @@ import { Sidebar } from "@/components/layout/Sidebar"
 import { Header } from "@/components/layout/Header"
 import { useRealtime } from "@/lib/hooks/useRealtime"
 //import { useRealtime } from "@/lib/hooks/useRealtime"
-import { useState } from "react"
+import { useEffect, useState } from "react"
+import { signOut, useSession } from "next-auth/react"
 import { cn } from "@/lib/utils/cn"
 
 export default function DashboardLayout({
@@ -13,6 +14,14 @@ export default function DashboardLayout({
   children: React.ReactNode
 }) {
   const [sidebarOpen, setSidebarOpen] = useState(false)
+  const { data: session } = useSession()
+
+  // The refresh token was rejected (revoked or expired): the session is over
+  useEffect(() => {
+    if (session?.error === "RefreshAccessTokenError") {
+      signOut({ callbackUrl: "/login" })
+    }
+  }, [session?.error])
   
   // Enable real-time updates
   useRealtime()
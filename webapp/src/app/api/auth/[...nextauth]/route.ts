@@ -29,6 +29,7 @@ export const authOptions: NextAuthOptions = {
             khcAdvocateId: response.user.khc_advocate_id,
             accessToken: response.access_token,
             refreshToken: response.refresh_token || response.access_token,
+            accessTokenExpires: Date.now() + response.expires_in * 1000,
           }
 
           return user
@@ -45,14 +46,33 @@ export const authOptions: NextAuthOptions = {
       if (user) {
         token.accessToken = user.accessToken
         token.refreshToken = user.refreshToken
+        token.accessTokenExpires = user.accessTokenExpires
         token.khcAdvocateId = user.khcAdvocateId
         token.id = user.id
+        return token
+      }
+
+      // Access tokens are short-lived; renew a minute before expiry
+      if (Date.now() < token.accessTokenExpires - 60 * 1000) {
+        return token
+      }
+
+      try {
+        const refreshed = await authApi.refresh(token.refreshToken)
+        token.accessToken = refreshed.access_token
+        token.refreshToken = refreshed.refresh_token
+        token.accessTokenExpires = Date.now() + refreshed.expires_in * 1000
+        delete token.error
+      } catch (error) {
+        console.error("Token refresh error:", error)
+        token.error = "RefreshAccessTokenError"
       }
       return token
     },
     async session({ session, token }) {
       // Send properties to the client
       session.accessToken = token.accessToken
+      session.error = token.error
       session.user = {
         id: token.id as string,
         email: token.email as string,
@@ -39,6 +39,7 @@ interface BackendLoginResponse {
   access_token: string
   refresh_token?: string
   token_type: string
+  expires_in?: number
   user: {
     id: string
     email: string
@@ -52,6 +53,7 @@ export interface LoginResponse {
   access_token: string
   refresh_token: string
   token_type: string
+  expires_in: number
   user: {
     id: string
     email: string
@@ -72,10 +74,19 @@ export const authApi = {
       access_token: data.access_token,
       refresh_token: data.refresh_token || data.access_token,
       token_type: data.token_type || 'bearer',
+      expires_in: data.expires_in ?? 15 * 60,
       user: data.user,
     }
   },
 
+  // Refresh tokens rotate: always keep the returned refresh_token
+  async refresh(refreshToken: string): Promise<Omit<LoginResponse, 'user'>> {
+    const { data } = await apiClient.post('/api/v1/auth/refresh', {
+      refresh_token: refreshToken,
+    })
+    return data
+  },
+
   async register(userData: RegisterRequest): Promise<User> {
     const { data } = await apiClient.post('/api/v1/auth/register', userData)
     return data
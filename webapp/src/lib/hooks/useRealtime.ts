@@ -6,10 +6,21 @@ import { useSession } from 'next-auth/react'
 import { toast } from 'sonner'
 import { fetchEventSource } from '@microsoft/fetch-event-source'
 
+// Thrown to stop fetchEventSource from retrying
+class FatalSSEError extends Error {}
+
+// Thrown from onclose so an unexpected end of stream is retried
+class RetriableSSEError extends Error {}
+
+const MAX_RETRY_DELAY_MS = 30000
+
 export function useRealtime() {
   const queryClient = useQueryClient()
   const { data: session, status } = useSession()
   const abortControllerRef = useRef<AbortController | null>(null)
+  // Survives reconnects and token refreshes so the server can replay
+  // what was missed in between
+  const lastEventIdRef = useRef<string | null>(null)
 
   useEffect(() => {
     // Check if SSE is enabled
@@ -42,32 +53,48 @@ export function useRealtime() {
     // Create abort controller for cleanup
     abortControllerRef.current = new AbortController()
 
+    // Set by a `close` event: the stream was replaced by a newer tab
+    let closedByServer = false
+    let retryDelay = 1000
+
     // Connect to SSE endpoint
     const connectSSE = async () => {
+      const headers: Record<string, string> = {
+        'Authorization': `Bearer ${session.accessToken}`,
+        'Accept': 'text/event-stream',
+      }
+      // Lowercase: fetchEventSource sets the same header itself on retries
+      if (lastEventIdRef.current) {
+        headers['last-event-id'] = lastEventIdRef.current
+      }
+
       try {
         await fetchEventSource(sseUrl, {
           method: 'GET',
-          headers: {
-            'Authorization': `Bearer ${session.accessToken}`,
-            'Accept': 'text/event-stream',
-          },
+          headers,
           signal: abortControllerRef.current?.signal,
           
           async onopen(response) {
             if (response.ok) {
               console.log('✅ SSE connection established')
+              retryDelay = 1000
               return
             }
             
             if (response.status === 401) {
+              // The session refresh re-runs this effect with a new token
               console.error('❌ SSE authentication failed')
-              throw new Error('Authentication failed')
+              throw new FatalSSEError('Authentication failed')
             }
             
             throw new Error(`SSE connection failed: ${response.status}`)
           },
           
           onmessage(event) {
+            if (event.id) {
+              lastEventIdRef.current = event.id
+            }
+
             // Handle different event types
             switch (event.event) {
               case 'case_synced':
@@ -82,6 +109,14 @@ export function useRealtime() {
                 handleAnalysisCompleted(event.data)
                 break
               
+              case 'resync':
+                handleResync(event.data)
+                break
+              
+              case 'close':
+                closedByServer = true
+                break
+              
               case 'ping':
                 // Keepalive - do nothing
                 break
@@ -96,13 +131,23 @@ export function useRealtime() {
           },
           
           onerror(err) {
-            console.error('❌ SSE connection error:', err)
-            // fetchEventSource will automatically retry with exponential backoff
-            throw err
+            if (err instanceof FatalSSEError) {
+              throw err
+            }
+            console.error('❌ SSE connection error, retrying in', retryDelay, 'ms:', err)
+            // Returning a delay makes fetchEventSource reconnect, sending
+            // the last seen id as Last-Event-ID
+            const delay = retryDelay
+            retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY_MS)
+            return delay
           },
           
           onclose() {
             console.log('🔌 SSE connection closed')
+            if (!closedByServer) {
+              // e.g. a server restart: reconnect and resume
+              throw new RetriableSSEError('Stream ended')
+            }
           },
           
           // Retry configuration
@@ -153,14 +198,16 @@ export function useRealtime() {
     function handleDocumentUploaded(data: string) {
       try {
         const parsed = JSON.parse(data)
-        console.log('📄 Document uploaded:', parsed.title)
+        // Bursts arrive as one batch with `count`, `document_ids` and `titles`
+        const count: number = parsed.count ?? 1
+        console.log('📄 Document uploaded:', count > 1 ? parsed.titles : parsed.title)
         
         // Invalidate documents cache
         queryClient.invalidateQueries({ queryKey: ['documents', parsed.case_id] })
         queryClient.invalidateQueries({ queryKey: ['case', parsed.case_id] })
         
         // Show notification
-        toast.success(`Document uploaded`, {
+        toast.success(count > 1 ? `${count} documents uploaded` : `Document uploaded`, {
           description: parsed.title,
           duration: 5000,
         })
@@ -169,6 +216,12 @@ export function useRealtime() {
       }
     }
 
+    function handleResync(data: string) {
+      // Missed events are no longer available on the server: refetch everything once
+      console.warn('🔄 SSE resync:', data)
+      queryClient.invalidateQueries()
+    }
+
     function handleAnalysisCompleted(data: string) {
       try {
         const parsed = JSON.parse(data)
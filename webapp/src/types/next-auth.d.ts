@@ -40,10 +40,12 @@ declare module "next-auth" {
     khcAdvocateId: string
     accessToken: string
     refreshToken: string
+    accessTokenExpires: number
   }
 
   interface Session {
     accessToken: string
+    error?: string
     user: {
       id: string
       email: string
@@ -57,6 +59,8 @@ declare module "next-auth/jwt" {
   interface JWT {
     accessToken: string
     refreshToken: string
+    accessTokenExpires: number
     khcAdvocateId: string
+    error?: string
   }
 }
\ No newline at end of file